@@ -1,7 +1,10 @@
-import os
+import hashlib
+import io
+import json
 import uuid
-from flask import Flask, request, jsonify, flash, redirect, url_for
-from werkzeug.utils import secure_filename
+from flask import Flask, Request, Response, request, jsonify, flash, redirect, stream_with_context, url_for
+from werkzeug.exceptions import HTTPException
+from pydantic_core import to_jsonable_python
 
 # --- NEW Authentication and Security Imports ---
 from flask_login import LoginManager, login_user, current_user, logout_user, login_required
@@ -12,12 +15,15 @@ from database.models import db, Profile, Skill, User
 from forms import LoginForm, RegistrationForm
 
 # --- Core Service Imports ---
+from unification_service.source_store import get_source_store
 from unification_service.unifier import ProfileUnifier
 from enhancement_service.enhancer import ProfileEnhancer
 # The embedding service is not used in this version, so it's not imported.
 
 # --- Extractor Module Imports ---
-from cv_extractor import extract_cv_data
+from cv_extractor import extract_cv_data, extract_cv_data_stream, warm_up_extractors
+from cv_extractor.config import EXTRACTION_TIER, EXTRACTION_TIERS, SPACY_PROFILES
+from cv_extractor.llm.client import LlmUnavailableError
 from linkedin_extractor.scraper import collect_profile_from_linkedin_url
 from github_extractor.api_client import get_profile_from_github_url
 
@@ -25,7 +31,19 @@ from github_extractor.api_client import get_profile_from_github_url
 # --- App Configuration & Initialization ---
 # ==============================================================================
 
+class InMemoryUploadRequest(Request):
+    """
+    Keeps uploaded file parts in memory. Werkzeug's default spools any part
+    over 500 KB to a temporary file on disk; MAX_CONTENT_LENGTH bounds the
+    whole body, so a buffer here never grows past it.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return io.BytesIO()
+
+
 app = Flask(__name__)
+app.request_class = InMemoryUploadRequest
 
 # CRITICAL: Set a secret key for session management and form protection (CSRF).
 # In a production environment, this MUST be a long, random string loaded from an
@@ -36,11 +54,12 @@ app.config['SECRET_KEY'] = 'a-very-secret-and-random-key-for-this-poc'
 app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///profiles.db'
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
-# Configure the folder for temporary file uploads
-UPLOAD_FOLDER = 'uploads'
+# CV uploads are kept in memory (see InMemoryUploadRequest) and never written to disk.
 ALLOWED_EXTENSIONS = {'pdf', 'docx'}
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10 MB per CV
+UPLOAD_CHUNK_BYTES = 64 * 1024
+# Reject oversized requests before Werkzeug buffers them (leaves room for the form fields).
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES + 64 * 1024
 
 # --- Initialize All Services and Extensions ---
 db.init_app(app)
@@ -52,8 +71,20 @@ login_manager = LoginManager(app)
 #login_manager.login_message_category = 'info'  # For styling flashed messages
 
 # Initialize our custom services
+# Both share the per-profile store: stored source records for unification, and the last
+# enhanced sections, so enhancement only re-polishes what a new source changed. The store
+# is opened lazily in each process (see get_source_store), never at import, so workers
+# forked from a preloaded app do not share the parent's SQLite connection.
 unifier = ProfileUnifier()
-enhancer = ProfileEnhancer()
+
+
+def get_enhancer() -> ProfileEnhancer:
+    return ProfileEnhancer(get_source_store())
+
+
+# Load the spaCy/SkillNer models once at start-up instead of on the first CV upload.
+# When gunicorn preloads the app, forked workers share these pages copy-on-write.
+warm_up_extractors()
 
 
 # --- KEY CHANGE #1: Custom Unauthorized Handler ---
@@ -70,6 +101,38 @@ def load_user(user_id):
     return db.session.get(User, int(user_id))
 
 
+class UploadTooLarge(Exception):
+    pass
+
+
+class BadSourceRequest(Exception):
+    """An add_source form that cannot be processed, with the HTTP status to answer."""
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+def read_upload(file_storage):
+    """
+    Reads a parsed upload in chunks, enforcing MAX_UPLOAD_BYTES and hashing
+    each chunk as it is read.
+    Returns the raw bytes and their SHA-256 hex digest.
+    """
+    digest = hashlib.sha256()
+    chunks = []
+    size = 0
+    while True:
+        chunk = file_storage.stream.read(UPLOAD_CHUNK_BYTES)
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > MAX_UPLOAD_BYTES:
+            raise UploadTooLarge(f"File exceeds the {MAX_UPLOAD_BYTES // (1024 * 1024)} MB upload limit")
+        digest.update(chunk)
+        chunks.append(chunk)
+    return b"".join(chunks), digest.hexdigest()
+
+
 # ==============================================================================
 # --- API-Friendly Authentication Routes ---
 # ==============================================================================
@@ -136,6 +199,68 @@ def create_profile():
     return jsonify({"message": "Profile created successfully", "profile_id": profile_id}), 201
 
 
+def read_source_form():
+    """
+    Validates an add_source form and reads the CV upload, if any.
+    Returns (source_type, options): for 'cv' the upload's content, file name,
+    SHA-256 and the extraction options; for 'linkedin' and 'github' the URL.
+    Raises BadSourceRequest for anything malformed.
+    """
+    source_type = request.form.get('source_type')
+    if source_type == 'cv':
+        if 'file' not in request.files:
+            raise BadSourceRequest("No file part for 'cv' source_type")
+        file = request.files['file']
+        # Optional per-request tradeoff between NLP speed and accuracy.
+        nlp_profile = request.form.get('nlp_profile')
+        if nlp_profile and nlp_profile not in SPACY_PROFILES:
+            raise BadSourceRequest(f"Invalid nlp_profile. Must be one of {sorted(SPACY_PROFILES)}")
+        # Optional per-request tradeoff between cost and depth: faster tiers may skip the LLM.
+        tier = request.form.get('tier') or EXTRACTION_TIER
+        if tier not in EXTRACTION_TIERS:
+            raise BadSourceRequest(f"Invalid tier. Must be one of {sorted(EXTRACTION_TIERS)}")
+        if not (file.filename and '.' in file.filename
+                and file.filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS):
+            raise BadSourceRequest("Invalid or missing file for 'cv' source_type")
+        try:
+            content, source_hash = read_upload(file)
+        except UploadTooLarge as e:
+            raise BadSourceRequest(str(e), 413)
+        return source_type, {"content": content, "file_name": file.filename, "source_hash": source_hash,
+                             "nlp_profile": nlp_profile, "tier": tier}
+
+    if source_type in ('linkedin', 'github'):
+        url = request.form.get('url')
+        if not url:
+            raise BadSourceRequest(f"Missing 'url' for '{source_type}' source_type")
+        return source_type, {"url": url, "source_hash": None}
+
+    raise BadSourceRequest("Invalid source_type. Must be 'cv', 'linkedin', or 'github'")
+
+
+def extract_source(source_type, options):
+    """Step 1 for a validated form: the extracted record of the new source."""
+    if source_type == 'cv':
+        return extract_cv_data(options["content"], file_name=options["file_name"],
+                               nlp_profile=options["nlp_profile"], tier=options["tier"])
+    if source_type == 'linkedin':
+        return collect_profile_from_linkedin_url(options["url"])
+    return get_profile_from_github_url(options["url"])
+
+
+def store_enhanced_profile(profile, enhanced_profile):
+    """Step 4: saves the enhanced profile and its skills on the profile record."""
+    # The final, enhanced profile is saved back to the database.
+    profile.unified_profile_json = enhanced_profile.model_dump()
+
+    # Update the relational Skill table for potential structured queries in the future.
+    # Clear existing skills and add the new, enhanced list.
+    profile.skills.clear()
+    profile.skills = [Skill(name=skill_name) for skill_name in enhanced_profile.skills]
+
+    db.session.commit()
+
+
 @app.route('/api/profiles/<string:profile_id>/add_source', methods=['POST'])
 @login_required  # Ensures only logged-in users can add sources.
 def add_source_to_profile(profile_id):
@@ -147,65 +272,103 @@ def add_source_to_profile(profile_id):
     # first_or_404() will automatically return a 404 Not Found error if no profile matches.
     profile = Profile.query.filter_by(id=profile_id, user_id=current_user.id).first_or_404()
 
-    source_type = request.form.get('source_type')
-    new_data = None
-
     # --- Step 1: EXTRACT ---
     try:
-        if source_type == 'cv':
-            if 'file' not in request.files:
-                return jsonify({"error": "No file part for 'cv' source_type"}), 400
-            file = request.files['file']
-            if file.filename and '.' in file.filename and file.filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS:
-                filename = secure_filename(file.filename)
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                file.save(filepath)
-                new_data = extract_cv_data(filepath)
-            else:
-                return jsonify({"error": "Invalid or missing file for 'cv' source_type"}), 400
-
-        elif source_type == 'linkedin':
-            url = request.form.get('url')
-            if not url: return jsonify({"error": "Missing 'url' for 'linkedin' source_type"}), 400
-            new_data = collect_profile_from_linkedin_url(url)
-
-        elif source_type == 'github':
-            url = request.form.get('url')
-            if not url: return jsonify({"error": "Missing 'url' for 'github' source_type"}), 400
-            new_data = get_profile_from_github_url(url)
-
-        else:
-            return jsonify({"error": "Invalid source_type. Must be 'cv', 'linkedin', or 'github'"}), 400
-
+        source_type, options = read_source_form()
+        new_data = extract_source(source_type, options)
+    except BadSourceRequest as e:
+        return jsonify({"error": str(e)}), e.status
+    except LlmUnavailableError as e:
+        # Rate limits or outages outlasted the retries; the client may try again later.
+        return jsonify({"error": f"Extraction failed: {str(e)}"}), 503, {"Retry-After": "60"}
+    except HTTPException:
+        # E.g. RequestEntityTooLarge (413) raised by Werkzeug when the form is first read.
+        raise
     except Exception as e:
         return jsonify({"error": f"Extraction failed: {str(e)}"}), 500
 
     # --- Step 2: UNIFY ---
-    # This combines the new data with any existing data for the profile.
-    unified_profile = unifier.unify(profile_id, new_data)
+    # The new source is stored and merged into the profile's existing unified data;
+    # sources added earlier are read back from the store, not extracted again.
+    unified_profile = unifier.add_source(profile_id, new_data)
 
     # --- Step 3: ENHANCE ---
     # The unified data is polished by the LLM for consistency and presentation.
-    enhanced_profile = enhancer.enhance(unified_profile)
+    enhanced_profile = get_enhancer().enhance(unified_profile)
 
     # --- Step 4: STORE ---
-    # The final, enhanced profile is saved back to the database.
-    profile.unified_profile_json = enhanced_profile.model_dump()
-
-    # Update the relational Skill table for potential structured queries in the future.
-    # Clear existing skills and add the new, enhanced list.
-    profile.skills.clear()
-    profile.skills = [Skill(name=skill_name) for skill_name in enhanced_profile.skills]
-
-    db.session.commit()
+    store_enhanced_profile(profile, enhanced_profile)
 
     return jsonify({
         "message": f"Source '{source_type}' added and profile enhanced successfully.",
         "profile_id": profile_id,
+        "source_sha256": options["source_hash"],
         "enhanced_profile": enhanced_profile.model_dump()
     }), 200
 
 
+def ndjson_event(**event):
+    return json.dumps(to_jsonable_python(event)) + "\n"
+
+
+@app.route('/api/profiles/<string:profile_id>/add_source/stream', methods=['POST'])
+@login_required
+def add_source_to_profile_stream(profile_id):
+    """
+    Same workflow and form as add_source, answered progressively as NDJSON
+    (one JSON event per line) so clients can render results as they arrive:
+
+        {"stage": "extract", "field": ..., "value": ...}  a partial CV extraction result
+        {"stage": "enhance", "field": ..., "value": ...}  a refined profile section
+        {"stage": "done", ...}                             the add_source response body
+        {"stage": "error", "error": ..., "status": ...}    extraction failed; nothing was stored
+
+    Partial results are not final; the "done" event carries the stored profile.
+    """
+    profile = Profile.query.filter_by(id=profile_id, user_id=current_user.id).first_or_404()
+    # The form and upload are read before the response starts, so bad requests still get a plain error.
+    try:
+        source_type, options = read_source_form()
+    except BadSourceRequest as e:
+        return jsonify({"error": str(e)}), e.status
+
+    def events():
+        try:
+            if source_type == 'cv':
+                for field, value in extract_cv_data_stream(options["content"], file_name=options["file_name"],
+                                                           nlp_profile=options["nlp_profile"], tier=options["tier"]):
+                    if field is None:
+                        new_data = value
+                    else:
+                        yield ndjson_event(stage="extract", field=field, value=value)
+            else:
+                new_data = extract_source(source_type, options)
+        except LlmUnavailableError as e:
+            yield ndjson_event(stage="error", error=f"Extraction failed: {str(e)}", status=503)
+            return
+        except Exception as e:
+            yield ndjson_event(stage="error", error=f"Extraction failed: {str(e)}", status=500)
+            return
+
+        unified_profile = unifier.add_source(profile_id, new_data)
+        for field, value in get_enhancer().enhance_stream(unified_profile):
+            if field is None:
+                enhanced_profile = value
+            else:
+                yield ndjson_event(stage="enhance", field=field, value=value)
+        store_enhanced_profile(profile, enhanced_profile)
+
+        yield ndjson_event(
+            stage="done",
+            message=f"Source '{source_type}' added and profile enhanced successfully.",
+            profile_id=profile_id,
+            source_sha256=options["source_hash"],
+            enhanced_profile=enhanced_profile.model_dump(),
+        )
+
+    return Response(stream_with_context(events()), mimetype='application/x-ndjson')
+
+
 # ==============================================================================
 # --- Main Execution Block ---
 # ==============================================================================
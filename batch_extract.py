@@ -0,0 +1,48 @@
+# batch_extract.py
+import os
+import sys
+
+from cv_extractor.batch import (
+    REQUESTS_FILE, RESULTS_FILE, ingest_batch_results, prepare_batch, run_batch_locally, write_retry_batch,
+)
+
+# --- CONFIGURATION ---
+INPUT_DIR = "cvs"
+WORK_DIR = "batch"
+OUTPUT_DIR = os.path.join("output", "batch")
+RETRY_FILE = "retry_requests.jsonl"
+RETRY_RESULTS_FILE = "retry_results.jsonl"
+
+
+def main():
+    """
+    Offline bulk extraction for backfills, one step per invocation:
+
+        python batch_extract.py prepare    # parse + NLP, write batch/requests.jsonl
+        python batch_extract.py run-local  # fake backend fills batch/results.jsonl
+        python batch_extract.py ingest     # write one ExtractedCV JSON per CV
+        python batch_extract.py retry      # collect unanswered requests into a new batch file
+
+    In production, upload batch/requests.jsonl to the OpenAI Batch API
+    (endpoint /v1/chat/completions) instead of `run-local`, and save its
+    output file as batch/results.jsonl. Every step can be rerun safely.
+    """
+    step = sys.argv[1] if len(sys.argv) > 1 else "prepare"
+    results_paths = [os.path.join(WORK_DIR, RESULTS_FILE), os.path.join(WORK_DIR, RETRY_RESULTS_FILE)]
+    if step == "prepare":
+        prepare_batch(INPUT_DIR, WORK_DIR)
+    elif step == "run-local":
+        run_batch_locally(os.path.join(WORK_DIR, REQUESTS_FILE), os.path.join(WORK_DIR, RESULTS_FILE))
+        if os.path.exists(os.path.join(WORK_DIR, RETRY_FILE)):
+            run_batch_locally(os.path.join(WORK_DIR, RETRY_FILE), os.path.join(WORK_DIR, RETRY_RESULTS_FILE))
+    elif step == "ingest":
+        ingest_batch_results(WORK_DIR, OUTPUT_DIR, results_paths)
+    elif step == "retry":
+        write_retry_batch(WORK_DIR, os.path.join(WORK_DIR, RETRY_FILE), results_paths)
+    else:
+        print(f"Unknown step '{step}'. Use one of: prepare, run-local, ingest, retry.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
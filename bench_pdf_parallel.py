@@ -0,0 +1,69 @@
+# bench_pdf_parallel.py
+import os
+import time
+import fitz  # PyMuPDF
+from cv_extractor.parsers.pdf_parser import PdfParser
+
+# --- CONFIGURATION ---
+PAGE_COUNTS = [2, 8, 16, 32, 64, 128, 256]
+# At least two workers, otherwise PdfParser never takes the parallel path.
+WORKERS = max(os.cpu_count() or 1, 2)
+REPEATS = 3
+# The parallel path must beat serial by this factor to count as a win, not noise.
+MIN_SPEEDUP = 1.1
+
+SAMPLE_PARAGRAPH = (
+    "Designed and maintained ETL pipelines in Python and Apache Spark, processing "
+    "billions of events per day on Azure Databricks. Built REST APIs with FastAPI, "
+    "containerised services with Docker and Kubernetes, and mentored junior engineers. "
+)
+
+
+def make_pdf(page_count: int) -> bytes:
+    """Builds an in-memory PDF whose pages are filled with CV-like text."""
+    doc = fitz.open()
+    for _ in range(page_count):
+        page = doc.new_page()
+        page.insert_textbox(page.rect + (40, 40, -40, -40), SAMPLE_PARAGRAPH * 12, fontsize=9)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def best_time(parser: PdfParser, data: bytes) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        parser.get_text(data)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    """
+    Times serial vs page-parallel PDF parsing for growing page counts and
+    prints the smallest page count where the parallel path wins.
+    """
+    serial = PdfParser(parallel_workers=0)
+    parallel = PdfParser(parallel_workers=WORKERS, parallel_min_pages=1)
+    parallel.get_text(make_pdf(WORKERS))  # start the pool outside the timings
+
+    print(f"--- PDF parsing benchmark ({WORKERS} worker processes) ---")
+    print(f"{'pages':>6} {'serial ms':>10} {'parallel ms':>12} {'speed-up':>9}")
+    crossover = None
+    for page_count in PAGE_COUNTS:
+        data = make_pdf(page_count)
+        serial_s = best_time(serial, data)
+        parallel_s = best_time(parallel, data)
+        print(f"{page_count:>6} {serial_s * 1000:>10.1f} {parallel_s * 1000:>12.1f} {serial_s / parallel_s:>8.2f}x")
+        if crossover is None and serial_s / parallel_s >= MIN_SPEEDUP:
+            crossover = page_count
+
+    if crossover is None:
+        print("\nParallel parsing never won on this machine; leave CV_PDF_PARALLEL_WORKERS at 0.")
+    else:
+        print(f"\nSuggested setting: CV_PDF_PARALLEL_WORKERS={WORKERS} CV_PDF_PARALLEL_MIN_PAGES={crossover}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# bench_pipeline_offline.py
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+# Air-gapped setup: the fake LLM backend, no response cache, and the automaton skill
+# matcher (its index must be built beforehand). Override any of these in the environment.
+os.environ.setdefault("CV_LLM_BACKEND", "fake")
+os.environ.setdefault("CV_LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("CV_SKILL_MATCHER", "automaton")
+
+from cv_extractor import extract_cv_data  # noqa: E402  (reads the settings above)
+from enhancement_service.enhancer import ProfileEnhancer  # noqa: E402
+from unification_service.source_store import SourceStore  # noqa: E402
+from unification_service.unifier import ProfileUnifier  # noqa: E402
+
+# --- CONFIGURATION ---
+CV_FILES = ["Gaurav_Kumar.pdf", "Gaurav_Kumar.docx", "MAIMOUNI_YOUSSEF_CV.pdf"]
+CONCURRENCY_LEVELS = [1, 4, 16]
+DOCUMENTS_PER_LEVEL = 32
+STAGES = ("extract", "unify", "enhance")
+
+
+def add_cv(unifier: ProfileUnifier, enhancer: ProfileEnhancer, profile_id: str, path: str) -> Dict[str, float]:
+    """Runs the add_source workflow of app.py for one CV; returns the seconds spent in each stage."""
+    timings = {}
+    started = time.perf_counter()
+    cv_data = extract_cv_data(path)
+    timings["extract"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    unified_profile = unifier.add_source(profile_id, cv_data)
+    timings["unify"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    enhancer.enhance(unified_profile)
+    timings["enhance"] = time.perf_counter() - started
+    return timings
+
+
+def run(unifier: ProfileUnifier, enhancer: ProfileEnhancer, concurrency: int) -> Tuple[float, Dict[str, float]]:
+    """
+    Adds DOCUMENTS_PER_LEVEL CVs, each to a new profile, with `concurrency`
+    request threads. Returns CVs per second and the mean seconds per stage.
+    """
+    jobs = [(f"bench-{concurrency}-{i}", CV_FILES[i % len(CV_FILES)]) for i in range(DOCUMENTS_PER_LEVEL)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results: List[Dict[str, float]] = list(pool.map(lambda job: add_cv(unifier, enhancer, *job), jobs))
+    throughput = DOCUMENTS_PER_LEVEL / (time.perf_counter() - started)
+    return throughput, {stage: sum(r[stage] for r in results) / len(results) for stage in STAGES}
+
+
+def main():
+    """
+    Measures end-to-end throughput of the add_source workflow (parse, NLP
+    and LLM extraction, unification, enhancement) offline, against the fake
+    LLM backend and its synthetic latency. Profiles go to a throwaway store.
+    """
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = SourceStore(os.path.join(store_dir, "bench_profiles.db"))
+        unifier, enhancer = ProfileUnifier(store), ProfileEnhancer(store)
+        add_cv(unifier, enhancer, "bench-warmup", CV_FILES[0])  # load models outside the timings
+        print(f"--- Offline add_source throughput (backend: {os.environ['CV_LLM_BACKEND']}) ---")
+        print(f"{'threads':>8} {'CVs/s':>8}" + "".join(f" {stage + ' s':>10}" for stage in STAGES))
+        for concurrency in CONCURRENCY_LEVELS:
+            throughput, stage_seconds = run(unifier, enhancer, concurrency)
+            print(f"{concurrency:>8} {throughput:>8.2f}" + "".join(f" {stage_seconds[s]:>10.3f}" for s in STAGES))
+
+
+if __name__ == "__main__":
+    main()
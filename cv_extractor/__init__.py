@@ -1,2 +1,2 @@
-from .pipeline import extract_cv_data
-
+from .pipeline import extract_cv_data, extract_cv_data_many, extract_cv_data_stream
+from .extractors.registry import warm_up_extractors
@@ -0,0 +1,240 @@
+# cv_extractor/batch.py
+import asyncio
+import json
+import os
+from typing import Iterator, List, Optional
+
+from .config import LLM_MAX_CONCURRENCY, NLP_BATCH_SIZE, NLP_N_PROCESS, SECTION_SEGMENTATION
+from .extractors.hybrid_manager import HybridManager
+from .extractors.llm_data_extractor import EXTRACTION_MODEL, merge_partial_results, parse_llm_output
+from .extractors.registry import get_hybrid_manager
+from .llm.backends import LlmBackend, create_backend
+from .llm.client import run_sync
+from .models.cv_models import ExtractedCV, Skill
+from .parsers.factory import get_parser
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+MANIFEST_FILE = "manifest.jsonl"
+REQUESTS_FILE = "requests.jsonl"
+RESULTS_FILE = "results.jsonl"
+# Request lines follow the OpenAI Batch API input format for this endpoint.
+BATCH_ENDPOINT = "/v1/chat/completions"
+
+
+def _read_jsonl(path: str) -> Iterator[dict]:
+    """Yields the JSON lines of `path`; a missing file is empty, and a line cut off by a crash is skipped."""
+    if not os.path.exists(path):
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def _find_documents(input_dir: str) -> List[str]:
+    """CV files under `input_dir`, as sorted paths relative to it."""
+    found = []
+    for root, _, files in os.walk(input_dir):
+        for name in files:
+            if name.lower().endswith(SUPPORTED_EXTENSIONS):
+                found.append(os.path.relpath(os.path.join(root, name), input_dir))
+    return sorted(found)
+
+
+def prepare_batch(input_dir: str, work_dir: str, nlp_profile: Optional[str] = None,
+                  batch_size: int = NLP_BATCH_SIZE, n_process: int = NLP_N_PROCESS) -> int:
+    """
+    Step 1 of offline bulk extraction: parses every CV under `input_dir`,
+    runs the NLP stage over them in spaCy batches, and appends their LLM
+    requests to `<work_dir>/requests.jsonl`, ready for a batch endpoint.
+    The text and NLP skills of each CV go to `<work_dir>/manifest.jsonl`
+    for `ingest_batch_results`.
+
+    CVs already in the manifest are skipped, so an interrupted run resumes
+    where it stopped, and new files can be added to a job later. Returns
+    the number of CVs prepared.
+    """
+    os.makedirs(work_dir, exist_ok=True)
+    manifest_path = os.path.join(work_dir, MANIFEST_FILE)
+    requests_path = os.path.join(work_dir, REQUESTS_FILE)
+    prepared = {entry["doc_id"] for entry in _read_jsonl(manifest_path)}
+    written = {request["custom_id"] for request in _read_jsonl(requests_path)}
+    pending = [doc_id for doc_id in _find_documents(input_dir) if doc_id not in prepared]
+    print(f"Batch: {len(prepared)} CVs already prepared, {len(pending)} to go.")
+
+    doc_ids = []
+
+    def parsed_documents():
+        for doc_id in pending:
+            path = os.path.join(input_dir, doc_id)
+            print(f"1. Parsing document {path}...")
+            try:
+                parser = get_parser(path)
+                heading_hints = set() if SECTION_SEGMENTATION else None
+                text = parser.get_text(path, heading_hints)
+            except Exception as e:
+                # One unreadable file should not stop a backfill; it is retried on the next run.
+                print(f"   Skipping {path}: {e}")
+                continue
+            doc_ids.append(doc_id)
+            yield text, heading_hints
+
+    manager = get_hybrid_manager(nlp_profile)
+    count = 0
+    with open(requests_path, "a", encoding="utf-8") as requests_file, \
+            open(manifest_path, "a", encoding="utf-8") as manifest_file:
+        results = manager.analyze_many(parsed_documents(), batch_size=batch_size, n_process=n_process)
+        for index, (text, nlp_skills, sections) in enumerate(results):
+            doc_id = doc_ids[index]
+            llm_text, llm_sections = manager.llm_input(text, sections)
+            requests = manager.llm_extractor.request_messages(llm_text, nlp_skills, llm_sections)
+            custom_ids = []
+            for chunk, messages in enumerate(requests):
+                custom_id = f"{doc_id}#{chunk}"
+                custom_ids.append(custom_id)
+                if custom_id in written:
+                    continue
+                request = {
+                    "custom_id": custom_id,
+                    "method": "POST",
+                    "url": BATCH_ENDPOINT,
+                    "body": {"model": EXTRACTION_MODEL, "response_format": {"type": "json_object"},
+                             "messages": messages},
+                }
+                requests_file.write(json.dumps(request) + "\n")
+            # The manifest line is written last: a CV only counts as prepared once all its requests are on disk.
+            requests_file.flush()
+            manifest_file.write(json.dumps({
+                "doc_id": doc_id,
+                "custom_ids": custom_ids,
+                "full_text": text,
+                "nlp_skills": [skill.model_dump(mode="json") for skill in nlp_skills],
+            }) + "\n")
+            manifest_file.flush()
+            count += 1
+    print(f"Batch: prepared {count} CVs; requests in {requests_path}")
+    return count
+
+
+def _successful_results(results_paths: List[str]) -> dict:
+    """
+    Maps custom_id to the parsed extraction result, for every successful line
+    of the results files. A response whose content is not a JSON object
+    counts as failed, so `write_retry_batch` picks its request up again.
+    """
+    results = {}
+    for path in results_paths:
+        for line in _read_jsonl(path):
+            response = line.get("response") or {}
+            if line.get("error") or response.get("status_code") != 200:
+                continue
+            try:
+                content = response["body"]["choices"][0]["message"]["content"]
+            except (KeyError, IndexError, TypeError):
+                continue
+            result = parse_llm_output(content)
+            if not result or not isinstance(result, dict):
+                continue
+            results[line["custom_id"]] = result
+    return results
+
+
+def ingest_batch_results(work_dir: str, output_dir: str, results_paths: Optional[List[str]] = None) -> dict:
+    """
+    Step 3: assembles an ExtractedCV for every prepared CV whose requests
+    all have a successful result, and writes it to
+    `<output_dir>/<relative path of the CV>.json`.
+
+    `results_paths` are results files in the OpenAI Batch API output
+    format, by default `<work_dir>/results.jsonl`; results from a retry
+    batch can simply be passed along with the original ones. CVs already
+    written are skipped, and CVs still missing results stay pending, so
+    ingestion can run again as more results arrive.
+    """
+    results = _successful_results(results_paths or [os.path.join(work_dir, RESULTS_FILE)])
+    counts = {"written": 0, "already_written": 0, "pending": 0}
+    for entry in _read_jsonl(os.path.join(work_dir, MANIFEST_FILE)):
+        output_path = os.path.join(output_dir, entry["doc_id"] + ".json")
+        if os.path.exists(output_path):
+            counts["already_written"] += 1
+            continue
+        if not all(custom_id in results for custom_id in entry["custom_ids"]):
+            counts["pending"] += 1
+            continue
+
+        partials = [results[custom_id] for custom_id in entry["custom_ids"]]
+        llm_output = partials[0] if len(partials) == 1 else merge_partial_results(partials)
+        nlp_skills = [Skill.model_validate(skill) for skill in entry["nlp_skills"]]
+        cv_data = HybridManager.assemble(entry["full_text"], nlp_skills, llm_output)
+
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        # Write-then-rename, so a crash never leaves a half-written file that would be skipped on resume.
+        with open(output_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(cv_data.model_dump_json(indent=2))
+        os.replace(output_path + ".tmp", output_path)
+        counts["written"] += 1
+    print(f"Batch: wrote {counts['written']} CVs, {counts['already_written']} already done, "
+          f"{counts['pending']} waiting for results.")
+    return counts
+
+
+def write_retry_batch(work_dir: str, retry_path: str, results_paths: Optional[List[str]] = None) -> int:
+    """
+    Copies every request without a successful result (failed, expired or
+    never run) to `retry_path`, a new batch file to submit. Returns how
+    many requests it holds.
+    """
+    results = _successful_results(results_paths or [os.path.join(work_dir, RESULTS_FILE)])
+    count = 0
+    with open(retry_path, "w", encoding="utf-8") as f:
+        for request in _read_jsonl(os.path.join(work_dir, REQUESTS_FILE)):
+            if request["custom_id"] not in results:
+                f.write(json.dumps(request) + "\n")
+                count += 1
+    print(f"Batch: {count} requests to retry in {retry_path}")
+    return count
+
+
+def run_batch_locally(requests_path: str, results_path: str, backend: Optional[LlmBackend] = None,
+                      max_concurrency: int = LLM_MAX_CONCURRENCY) -> int:
+    """
+    Step 2 without a batch endpoint: answers the requests in `requests_path`
+    with `backend` (the offline fake by default) and appends the results to
+    `results_path` in the OpenAI Batch API output format. Requests already
+    answered there are skipped, so an interrupted run resumes. Returns the
+    number of requests answered.
+    """
+    backend = backend or create_backend("fake")
+    answered = {line["custom_id"] for line in _read_jsonl(results_path)}
+    todo = [request for request in _read_jsonl(requests_path) if request["custom_id"] not in answered]
+    print(f"Batch: answering {len(todo)} requests with the '{backend.name}' backend...")
+
+    async def answer(request: dict, semaphore: asyncio.Semaphore) -> dict:
+        body = request["body"]
+        async with semaphore:
+            try:
+                content = await backend.complete_json(body["model"], body["messages"], ExtractedCV)
+            except Exception as e:
+                return {"custom_id": request["custom_id"], "response": None,
+                        "error": {"code": type(e).__name__, "message": str(e)}}
+        return {
+            "custom_id": request["custom_id"],
+            "response": {
+                "status_code": 200,
+                "body": {"model": body["model"],
+                         "choices": [{"index": 0, "message": {"role": "assistant", "content": content}}]},
+            },
+            "error": None,
+        }
+
+    async def answer_all():
+        semaphore = asyncio.Semaphore(max_concurrency)
+        with open(results_path, "a", encoding="utf-8") as f:
+            for result in asyncio.as_completed([answer(request, semaphore) for request in todo]):
+                f.write(json.dumps(await result) + "\n")
+                f.flush()
+
+    run_sync(answer_all())
+    return len(todo)
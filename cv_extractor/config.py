@@ -5,7 +5,137 @@ from dotenv import load_dotenv
 # Load environment variables from a .env file
 load_dotenv()
 
+# Only required by the "openai" LLM backend, which checks for it when it is created.
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY not found in .env file. Please add it.")
\ No newline at end of file
+# LLM backend: "openai", or "fake" for offline benchmarks and load tests. The fake returns
+# schema-valid JSON (canned <ModelName>.json files from CV_LLM_FAKE_RESPONSES_DIR, or derived
+# from the request) after a deterministic synthetic latency.
+LLM_BACKEND = os.getenv("CV_LLM_BACKEND", "openai")
+LLM_FAKE_LATENCY_SECONDS = float(os.getenv("CV_LLM_FAKE_LATENCY_SECONDS", "2.0"))
+LLM_FAKE_LATENCY_JITTER_SECONDS = float(os.getenv("CV_LLM_FAKE_LATENCY_JITTER_SECONDS", "1.0"))
+LLM_FAKE_RESPONSES_DIR = os.getenv("CV_LLM_FAKE_RESPONSES_DIR")
+
+# Number of decoded pages allowed to wait for skill matching while a document streams in.
+PAGE_BUFFER_SIZE = int(os.getenv("CV_PAGE_BUFFER_SIZE", "4"))
+
+# Page-parallel PDF parsing (opt-in). Set CV_PDF_PARALLEL_WORKERS > 1 to enable it for
+# documents with at least CV_PDF_PARALLEL_MIN_PAGES pages; smaller CVs stay serial.
+# Run bench_pdf_parallel.py to find the crossover on a given machine.
+PDF_PARALLEL_WORKERS = int(os.getenv("CV_PDF_PARALLEL_WORKERS", "0"))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("CV_PDF_PARALLEL_MIN_PAGES", "32"))
+
+# Split CVs into labelled sections so NLP and LLM stages skip irrelevant ones (education, hobbies, ...).
+SECTION_SEGMENTATION = os.getenv("CV_SECTION_SEGMENTATION", "true").lower() == "true"
+
+# Skill matcher engine: "skillner" (spaCy + SkillNer scoring) or "automaton" (compiled Aho–Corasick).
+SKILL_MATCHER = os.getenv("CV_SKILL_MATCHER", "skillner")
+# Compact binary skill index memory-mapped by the automaton engine. Build it ahead of
+# deployment with `python -m cv_extractor.extractors.skill_index`.
+SKILL_INDEX_PATH = os.getenv(
+    "CV_SKILL_INDEX_PATH",
+    os.path.join(os.path.dirname(__file__), "resources", "skill_index.bin"),
+)
+# Skill canonicalization in the unifier: a dict from every surface form of a skill (SKILL_DB names
+# and forms plus the curated alias file) to its canonical name. Build it ahead of deployment with
+# `python -m unification_service.skill_canonicalizer`; editing the alias file triggers a rebuild.
+SKILL_ALIASES_PATH = os.getenv(
+    "CV_SKILL_ALIASES_PATH",
+    os.path.join(os.path.dirname(__file__), "resources", "skill_aliases.json"),
+)
+SKILL_CANON_INDEX_PATH = os.getenv(
+    "CV_SKILL_CANON_INDEX_PATH",
+    os.path.join(os.path.dirname(__file__), "resources", "skill_canon_index.json"),
+)
+# SkillNer caches its token statistics in the working directory.
+TOKEN_DIST_PATH = os.getenv("CV_TOKEN_DIST_PATH", "token_dist.json")
+
+# spaCy pipeline profiles for the SkillNer engine. SkillNer only needs tokens, lemmas
+# (tagger + attribute_ruler + lemmatizer) and, for one-word similarity scoring, vectors;
+# the parser and NER are never used. See spacy_profiles_report.py for the tradeoff.
+SPACY_PROFILES = {
+    "accurate": {"model": "en_core_web_lg", "exclude": []},
+    "balanced": {"model": "en_core_web_lg", "exclude": ["parser", "ner", "senter"]},
+    "fast": {"model": "en_core_web_sm", "exclude": ["parser", "ner", "senter"]},
+}
+SPACY_PROFILE = os.getenv("CV_SPACY_PROFILE", "accurate")
+# Batching for extract_many / extract_cv_data_many with CV_SKILLNER_PIPED_ANNOTATE: documents
+# per spaCy `nlp.pipe` batch and worker processes (1 keeps everything in-process).
+NLP_BATCH_SIZE = int(os.getenv("CV_NLP_BATCH_SIZE", "16"))
+NLP_N_PROCESS = int(os.getenv("CV_NLP_N_PROCESS", "1"))
+# SkillNer engine: annotate with a re-implementation of SkillNer's `annotate` that takes the
+# main spaCy pass from `nlp.pipe` and tokenizes sub-matches without another pipeline run.
+# Off by default; check it against the stock path with `python skill_matcher_parity.py --piped`.
+SKILLNER_PIPED_ANNOTATE = os.getenv("CV_SKILLNER_PIPED_ANNOTATE", "false").lower() == "true"
+
+# Persistent cache of LLM responses, shared by every OpenAI call site (CV extraction,
+# profile enhancement, GitHub README parsing). Entries expire after CV_LLM_CACHE_TTL_SECONDS
+# and the least recently used ones are evicted once the file holds CV_LLM_CACHE_MAX_MB.
+LLM_CACHE_ENABLED = os.getenv("CV_LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_PATH = os.getenv("CV_LLM_CACHE_PATH", "llm_cache.db")
+LLM_CACHE_TTL_SECONDS = int(os.getenv("CV_LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+LLM_CACHE_MAX_MB = float(os.getenv("CV_LLM_CACHE_MAX_MB", "256"))
+# Skip cache lookups (fresh responses are still stored), e.g. after a prompt change.
+LLM_CACHE_BYPASS = os.getenv("CV_LLM_CACHE_BYPASS", "false").lower() == "true"
+
+# Prompt budgets, counted locally (tiktoken when installed, ~4 characters per token otherwise).
+# Longer inputs are compressed and then truncated so prompt latency stays bounded. The CV
+# budget covers a whole CV, across all of its chunks (see LLM_CHUNK_* below).
+LLM_TOKENIZER_MODEL = os.getenv("CV_LLM_TOKENIZER_MODEL", "gpt-4o")
+LLM_MAX_CV_TOKENS = int(os.getenv("CV_LLM_MAX_CV_TOKENS", "12000"))
+LLM_MAX_README_TOKENS = int(os.getenv("CV_LLM_MAX_README_TOKENS", "4000"))
+
+# Map-reduce LLM extraction for long CVs: above CV_LLM_CHUNK_THRESHOLD_TOKENS the text is split
+# on section boundaries into chunks of at most CV_LLM_CHUNK_TOKENS, extracted concurrently and merged.
+LLM_CHUNK_THRESHOLD_TOKENS = int(os.getenv("CV_LLM_CHUNK_THRESHOLD_TOKENS", "6000"))
+LLM_CHUNK_TOKENS = int(os.getenv("CV_LLM_CHUNK_TOKENS", "3000"))
+
+# Async LLM execution layer: OpenAI requests in flight per process, across all call sites,
+# and the time limit for a single request.
+LLM_MAX_CONCURRENCY = int(os.getenv("CV_LLM_MAX_CONCURRENCY", "8"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("CV_LLM_TIMEOUT_SECONDS", "60"))
+
+# Client-side rate limiting and retries for LLM calls. Set the limits slightly below the
+# organization's quota; each request reserves its prompt tokens plus the expected output.
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("CV_LLM_REQUESTS_PER_MINUTE", "500"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("CV_LLM_TOKENS_PER_MINUTE", "30000"))
+LLM_EXPECTED_OUTPUT_TOKENS = int(os.getenv("CV_LLM_EXPECTED_OUTPUT_TOKENS", "1000"))
+LLM_MAX_RETRIES = int(os.getenv("CV_LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("CV_LLM_BACKOFF_BASE_SECONDS", "1"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("CV_LLM_BACKOFF_MAX_SECONDS", "60"))
+
+# Hedged LLM requests (opt-in): a request still running after the rolling CV_LLM_HEDGE_PERCENTILE
+# latency gets a duplicate, and the first response wins. Hedges are capped at
+# CV_LLM_HEDGE_MAX_EXTRA_RATIO of all requests to bound the extra spend.
+LLM_HEDGING = os.getenv("CV_LLM_HEDGING", "false").lower() == "true"
+LLM_HEDGE_PERCENTILE = float(os.getenv("CV_LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_MAX_EXTRA_RATIO = float(os.getenv("CV_LLM_HEDGE_MAX_EXTRA_RATIO", "0.05"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("CV_LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_WINDOW = int(os.getenv("CV_LLM_HEDGE_WINDOW", "200"))
+
+# Extraction tiers, chosen per request. The rule-based extractor scores how well it understood
+# the CV (0-1); the LLM only runs when that confidence is below the tier's threshold.
+# "thorough" (None) always runs the LLM, as before.
+EXTRACTION_TIERS = {"fast": 0.6, "balanced": 0.8, "thorough": None}
+EXTRACTION_TIER = os.getenv("CV_EXTRACTION_TIER", "thorough")
+
+# Per-profile store of each source's extracted record and the unified profile built from
+# them (unification_service.source_store), so adding a source never re-extracts earlier ones.
+PROFILE_STORE_PATH = os.getenv("CV_PROFILE_STORE_PATH", "profile_sources.db")
+
+# Fuzzy de-duplication in the unifier. Jobs whose company names and titles, and projects whose
+# names, have a character-trigram similarity (0-1) of at least these thresholds are merged; the
+# entry from the source listed first in CV_UNIFY_SOURCE_PRIORITY survives.
+UNIFY_COMPANY_THRESHOLD = float(os.getenv("CV_UNIFY_COMPANY_THRESHOLD", "0.8"))
+UNIFY_TITLE_THRESHOLD = float(os.getenv("CV_UNIFY_TITLE_THRESHOLD", "0.85"))
+UNIFY_PROJECT_THRESHOLD = float(os.getenv("CV_UNIFY_PROJECT_THRESHOLD", "0.85"))
+UNIFY_SOURCE_PRIORITY = [
+    source.strip() for source in os.getenv("CV_UNIFY_SOURCE_PRIORITY", "GitHub README,LinkedIn,CV,GitHub").split(",")
+]
+
+# Profile enhancement: "single" refines all changed sections in one completion; "fanout" runs
+# one completion per section (summary, skills, each job, groups of projects) concurrently,
+# at most CV_ENHANCEMENT_FANOUT_CONCURRENCY at a time per profile.
+ENHANCEMENT_MODE = os.getenv("CV_ENHANCEMENT_MODE", "single")
+ENHANCEMENT_FANOUT_CONCURRENCY = int(os.getenv("CV_ENHANCEMENT_FANOUT_CONCURRENCY", "4"))
+ENHANCEMENT_PROJECTS_PER_PIECE = int(os.getenv("CV_ENHANCEMENT_PROJECTS_PER_PIECE", "10"))
@@ -1,22 +1,170 @@
 # cv_extractor/extractors/hybrid_manager.py
+import itertools
+from typing import Any, Iterable, Iterator, List, Optional, Set, Tuple
 from .nlp_skill_extractor import NlpSkillExtractor
 from .llm_data_extractor import LlmDataExtractor
-from ..models.cv_models import ExtractedCV, Skill
+from .rule_based_extractor import RuleBasedExtractor
+from .section_segmenter import IRRELEVANT_SECTIONS, SectionSegmenter, merge_sections, slice_sections
+from ..config import (
+    EXTRACTION_TIER, EXTRACTION_TIERS, NLP_BATCH_SIZE, NLP_N_PROCESS, SECTION_SEGMENTATION, SPACY_PROFILE,
+)
+from ..models.cv_models import CvSection, ExtractedCV, Skill
+
+# The partial LLM results `extract_pages_stream` passes on; the rest is only final once assembled.
+STREAMED_FIELDS = ("summary", "work_experience", "projects")
 
 
 class HybridManager:
-    def __init__(self):
-        self.nlp_extractor = NlpSkillExtractor()
+    def __init__(self, profile: str = SPACY_PROFILE):
+        self.nlp_extractor = NlpSkillExtractor(profile=profile)
         self.llm_extractor = LlmDataExtractor()
+        self.rule_extractor = RuleBasedExtractor()
 
-    def extract(self, text: str) -> ExtractedCV:
-        print("2a. Running NLP skill extraction...")
-        nlp_skills = self.nlp_extractor.extract(text)
+    def extract(self, text: str, heading_hints: Optional[Set[str]] = None,
+                tier: str = EXTRACTION_TIER) -> ExtractedCV:
+        return self.extract_pages([text], heading_hints, tier)
 
-        nlp_evidence_map = {skill.name: skill.evidence for skill in nlp_skills}
+    def extract_pages(self, pages: Iterable[str], heading_hints: Optional[Set[str]] = None,
+                      tier: str = EXTRACTION_TIER) -> ExtractedCV:
+        """
+        Same as `extract`, but consumes the document page by page so skill
+        matching on early pages overlaps with decoding of later ones.
+
+        Each page is split into labelled sections as it arrives; sections
+        that never feed ExtractedCV (education, hobbies, ...) are skipped by
+        both the NLP and the LLM stage.
+
+        `tier` ("fast", "balanced" or "thorough") decides how confident the
+        rule-based extractor must be for the LLM call to be skipped.
+        """
+        if tier not in EXTRACTION_TIERS:
+            raise ValueError(f"Unknown extraction tier: {tier}")
+        text, nlp_skills, sections = self._analyze_pages(pages, heading_hints)
+        return self._combine(text, nlp_skills, sections, tier)
+
+    def extract_pages_stream(self, pages: Iterable[str], heading_hints: Optional[Set[str]] = None,
+                             tier: str = EXTRACTION_TIER) -> Iterator[Tuple[Optional[str], Any]]:
+        """
+        Streaming counterpart of `extract_pages`, for progressive rendering.
+        When the LLM runs, yields its partial results for STREAMED_FIELDS as
+        they arrive (see `LlmDataExtractor.extract_stream`); always ends with
+        (None, ExtractedCV).
+        """
+        if tier not in EXTRACTION_TIERS:
+            raise ValueError(f"Unknown extraction tier: {tier}")
+        text, nlp_skills, sections = self._analyze_pages(pages, heading_hints)
+        llm_output = self._rule_output(text, nlp_skills, sections, tier)
+        if llm_output is None:
+            llm_text, llm_sections = self.llm_input(text, sections)
+            print("2b. Streaming LLM verification and contextual extraction...")
+            for field, value in self.llm_extractor.extract_stream(llm_text, nlp_skills, llm_sections):
+                if field is None:
+                    llm_output = value
+                elif field in STREAMED_FIELDS:
+                    yield field, value
+        yield None, self.assemble(text, nlp_skills, llm_output)
+
+    def _analyze_pages(self, pages: Iterable[str],
+                       heading_hints: Optional[Set[str]] = None) -> Tuple[str, List[Skill], List[CvSection]]:
+        """The NLP stage of `extract_pages`: returns (text, NLP skills, sections)."""
+        print("2a. Running NLP skill extraction page by page...")
+        segmenter = SectionSegmenter(heading_hints) if SECTION_SEGMENTATION else None
+        page_texts = []
+        sections = []
+        skills_by_name = {}
+        offset = 0
+        for page_text in pages:
+            page_texts.append(page_text)
+            nlp_input = page_text
+            if segmenter is not None:
+                label = sections[-1].label if sections else "header"
+                page_sections = segmenter.segment(page_text, initial_label=label, offset=offset)
+                sections.extend(page_sections)
+                nlp_input = slice_sections(page_text, page_sections, offset=offset)
+            offset += len(page_text)
+
+            if not nlp_input.strip():
+                continue
+            for skill in self.nlp_extractor.extract(nlp_input):
+                if skill.name in skills_by_name:
+                    skills_by_name[skill.name].evidence.extend(skill.evidence)
+                else:
+                    skills_by_name[skill.name] = skill
+
+        text = "".join(page_texts)
+        if sections:
+            sections = merge_sections(sections)
+            print(f"   Sections: {', '.join(s.label for s in sections)}")
+        return text, list(skills_by_name.values()), sections
 
-        print("2b. Running LLM for verification and contextual extraction...")
-        llm_output = self.llm_extractor.extract(text, nlp_skills)
+    def extract_many(self, documents: Iterable[Tuple[str, Optional[Set[str]]]],
+                     batch_size: int = NLP_BATCH_SIZE, n_process: int = NLP_N_PROCESS,
+                     tier: str = EXTRACTION_TIER) -> Iterator[ExtractedCV]:
+        """
+        Extracts many documents, given as (text, heading_hints) pairs. Skill
+        matching runs over spaCy batches of `batch_size` documents across
+        `n_process` processes; each ExtractedCV is yielded in input order as
+        soon as its batch is done.
+        """
+        if tier not in EXTRACTION_TIERS:
+            raise ValueError(f"Unknown extraction tier: {tier}")
+        for text, nlp_skills, sections in self.analyze_many(documents, batch_size, n_process):
+            yield self._combine(text, nlp_skills, sections, tier)
+
+    def analyze_many(self, documents: Iterable[Tuple[str, Optional[Set[str]]]],
+                     batch_size: int = NLP_BATCH_SIZE,
+                     n_process: int = NLP_N_PROCESS) -> Iterator[Tuple[str, List[Skill], List[CvSection]]]:
+        """
+        The NLP stage of `extract_many` on its own: yields (text, NLP skills,
+        sections) per document, in input order, without calling the LLM.
+        """
+        prepared = (self._prepare(text, heading_hints) for text, heading_hints in documents)
+        prepared_for_nlp, prepared_for_llm = itertools.tee(prepared)
+        nlp_results = self.nlp_extractor.extract_many(
+            (nlp_input for _, nlp_input, _ in prepared_for_nlp), batch_size=batch_size, n_process=n_process)
+        for (text, _, sections), nlp_skills in zip(prepared_for_llm, nlp_results):
+            yield text, nlp_skills, sections
+
+    @staticmethod
+    def _prepare(text: str, heading_hints: Optional[Set[str]] = None) -> Tuple[str, str, List[CvSection]]:
+        """Returns (text, NLP input with irrelevant sections removed, sections)."""
+        if not SECTION_SEGMENTATION:
+            return text, text, []
+        sections = SectionSegmenter(heading_hints).segment(text)
+        return text, slice_sections(text, sections), sections
+
+    def _combine(self, text: str, nlp_skills: List[Skill], sections: Optional[List[CvSection]] = None,
+                 tier: str = EXTRACTION_TIER) -> ExtractedCV:
+        llm_output = self._rule_output(text, nlp_skills, sections, tier)
+        if llm_output is None:
+            llm_text, llm_sections = self.llm_input(text, sections)
+            print("2b. Running LLM for verification and contextual extraction...")
+            llm_output = self.llm_extractor.extract(llm_text, nlp_skills, llm_sections)
+
+        return self.assemble(text, nlp_skills, llm_output)
+
+    def _rule_output(self, text: str, nlp_skills: List[Skill], sections: Optional[List[CvSection]],
+                     tier: str) -> Optional[dict]:
+        """The rule-based output if it is confident enough for `tier` to skip the LLM, else None."""
+        threshold = EXTRACTION_TIERS[tier]
+        if threshold is None:
+            return None
+        rule_output, confidence = self.rule_extractor.extract(text, sections or [], nlp_skills)
+        print(f"2b. Rule-based extraction confidence {confidence:.2f} (tier '{tier}', threshold {threshold})")
+        return rule_output if confidence >= threshold else None
+
+    @staticmethod
+    def llm_input(text: str, sections: Optional[List[CvSection]] = None) -> Tuple[str, Optional[List[str]]]:
+        """The text sent to the LLM (irrelevant sections removed) and its relevant section texts, if segmented."""
+        if not sections:
+            return text, None
+        llm_sections = [text[s.start:s.end] for s in sections if s.label not in IRRELEVANT_SECTIONS]
+        return slice_sections(text, sections), llm_sections
+
+    @staticmethod
+    def assemble(text: str, nlp_skills: List[Skill], llm_output: dict) -> ExtractedCV:
+        """Builds the ExtractedCV from the LLM (or rule-based) output, keeping NLP evidence for its skills."""
+        nlp_evidence_map = {skill.name: skill.evidence for skill in nlp_skills}
 
         final_skills = []
         if llm_output.get("skills"):
@@ -35,4 +183,4 @@ class HybridManager:
             projects=llm_output.get("projects", [])
         )
 
-        return final_cv_data
\ No newline at end of file
+        return final_cv_data
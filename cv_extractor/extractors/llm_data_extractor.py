@@ -1,17 +1,155 @@
 # cv_extractor/extractors/llm_data_extractor.py
+import asyncio
 import json
-from openai import OpenAI
-from ..config import OPENAI_API_KEY
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
+from ..config import LLM_CHUNK_THRESHOLD_TOKENS, LLM_CHUNK_TOKENS, LLM_MAX_CV_TOKENS
 from ..models.cv_models import ExtractedCV
+from ..llm.client import get_llm_client, iterate_sync, run_sync
+from ..llm.prompts import compact_schema, count_tokens, fit_to_budget, split_into_chunks
+from ..llm.streaming import stream_partial_objects
+
+# The chat model CV data is extracted with, live and in offline batches (see batch.py).
+EXTRACTION_MODEL = "gpt-4o"
+OUTPUT_SCHEMA = compact_schema(ExtractedCV)
+
+
+def merge_partial_results(partials: List[dict]) -> dict:
+    """
+    Reduces per-chunk extraction results into one: the first summary wins,
+    skills are deduplicated by name, and work experience and projects are
+    unioned (an entry seen in two chunks is kept once).
+    """
+    merged = {"summary": None, "skills": [], "work_experience": [], "projects": []}
+    seen_skills, seen_jobs, seen_projects = set(), {}, {}
+    for partial in partials:
+        if not merged["summary"] and partial.get("summary"):
+            merged["summary"] = partial["summary"]
+
+        for skill in partial.get("skills") or []:
+            name = (skill.get("name") or "").strip().lower()
+            if name and name not in seen_skills:
+                seen_skills.add(name)
+                merged["skills"].append(skill)
+
+        for job in partial.get("work_experience") or []:
+            key = ((job.get("job_title") or "").strip().lower(), (job.get("company") or "").strip().lower())
+            if key not in seen_jobs:
+                seen_jobs[key] = job
+                merged["work_experience"].append(job)
+            else:
+                _merge_entry(seen_jobs[key], job)
+
+        for project in partial.get("projects") or []:
+            key = (project.get("project_name") or "").strip().lower()
+            if key not in seen_projects:
+                seen_projects[key] = project
+                merged["projects"].append(project)
+            else:
+                _merge_entry(seen_projects[key], project)
+    return merged
+
+
+def parse_llm_output(content: Optional[str]) -> dict:
+    """The extraction result in an LLM response, or {} if it is not valid JSON."""
+    try:
+        return json.loads(content)
+    except (json.JSONDecodeError, IndexError, TypeError):
+        return {}
+
+
+def _merge_entry(kept: dict, duplicate: dict):
+    """Folds a duplicate job or project (split across two chunks) into the kept one."""
+    if duplicate.get("description") and duplicate["description"] != kept.get("description"):
+        kept["description"] = "\n".join(filter(None, [kept.get("description"), duplicate["description"]]))
+    inferred = list(kept.get("inferred_skills") or [])
+    inferred.extend(s for s in duplicate.get("inferred_skills") or [] if s not in inferred)
+    kept["inferred_skills"] = inferred
 
 
 class LlmDataExtractor:
     def __init__(self):
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+        self.client = get_llm_client()
+
+    def extract(self, cv_text: str, nlp_skills: list, sections: Optional[List[str]] = None) -> dict:
+        """Blocking wrapper around `extract_async`, for synchronous callers."""
+        return run_sync(self.extract_async(cv_text, nlp_skills, sections))
+
+    async def extract_async(self, cv_text: str, nlp_skills: list, sections: Optional[List[str]] = None) -> dict:
+        """
+        Extracts structured data from the CV text. Long CVs (above
+        LLM_CHUNK_THRESHOLD_TOKENS) are split into chunks along `sections`,
+        the texts of the CV's sections in order, or along lines if none are
+        given; the chunks are extracted concurrently and the results merged.
+        """
+        return await self._extract(self.request_messages(cv_text, nlp_skills, sections))
 
-    def extract(self, cv_text: str, nlp_skills: list) -> dict:
-        nlp_skill_names = [skill.name for skill in nlp_skills]
-        output_schema = ExtractedCV.model_json_schema()
+    async def _extract(self, requests: List[List[dict]]) -> dict:
+        if len(requests) == 1:
+            return await self._complete(requests[0])
+
+        print(f"   Long CV: extracting {len(requests)} chunks concurrently...")
+        partials = await asyncio.gather(*(self._complete(messages) for messages in requests))
+        return merge_partial_results(partials)
+
+    def request_messages(self, cv_text: str, nlp_skills: list,
+                         sections: Optional[List[str]] = None) -> List[List[dict]]:
+        """
+        The chat messages `extract_async` sends: one request, or one per
+        chunk for long CVs, whose results go through `merge_partial_results`.
+
+        LLM_MAX_CV_TOKENS bounds the whole CV, so it also bounds the number
+        of chunks: a longer text is compressed and trimmed first, and then
+        chunked along lines, as its sections may have been cut.
+        """
+        if count_tokens(cv_text) > LLM_MAX_CV_TOKENS:
+            cv_text, sections = fit_to_budget(cv_text, LLM_MAX_CV_TOKENS), None
+        if count_tokens(cv_text) <= LLM_CHUNK_THRESHOLD_TOKENS:
+            return [self._messages(cv_text, [skill.name for skill in nlp_skills])]
+        chunks = split_into_chunks(sections or [cv_text], LLM_CHUNK_TOKENS)
+        return [self._messages(chunk, self._skills_in(chunk, nlp_skills)) for chunk in chunks]
+
+    def extract_stream(self, cv_text: str, nlp_skills: list,
+                       sections: Optional[List[str]] = None) -> Iterator[Tuple[Optional[str], Any]]:
+        """Blocking wrapper around `extract_stream_async`, for synchronous callers."""
+        return iterate_sync(self.extract_stream_async(cv_text, nlp_skills, sections))
+
+    async def extract_stream_async(self, cv_text: str, nlp_skills: list,
+                                   sections: Optional[List[str]] = None) -> AsyncIterator[Tuple[Optional[str], Any]]:
+        """
+        Streaming counterpart of `extract_async`, for progressive rendering.
+        Yields ("summary", str), then ("work_experience", WorkExperience) and
+        ("projects", Project) as each entry closes in the completion, and
+        finally (None, dict), the same result `extract_async` returns.
+
+        Long CVs are still extracted chunk by chunk, so their partial
+        results only arrive once every chunk has been merged.
+        """
+        requests = self.request_messages(cv_text, nlp_skills, sections)
+        if len(requests) == 1:
+            pieces = self.client.stream_json(model=EXTRACTION_MODEL, messages=requests[0], response_model=ExtractedCV)
+        else:
+            pieces = _single_piece(json.dumps(await self._extract(requests)))
+        async for field, value in stream_partial_objects(pieces, ExtractedCV):
+            yield field, value
+
+    @staticmethod
+    def _skills_in(chunk: str, nlp_skills: list) -> List[str]:
+        """The NLP skills with evidence in this chunk, so each chunk only verifies its own."""
+        chunk_lower = chunk.lower()
+        return [skill.name for skill in nlp_skills
+                if any(e.text_snippet.lower() in chunk_lower for e in skill.evidence)]
+
+    async def _complete(self, messages: List[dict]) -> dict:
+        # Identical CVs produce identical prompts, so re-uploads are served from the cache.
+        content = await self.client.complete_json(
+            model=EXTRACTION_MODEL,
+            messages=messages,
+            response_model=ExtractedCV,
+        )
+        return parse_llm_output(content)
+
+    @staticmethod
+    def _messages(cv_text: str, nlp_skill_names: List[str]) -> List[dict]:
 
         # --- UPDATED PROMPT ---
         prompt = f"""
@@ -33,20 +171,15 @@ class LlmDataExtractor:
                4.  **Verify NLP Skills:** Review the "Skills found by NLP Tool". Remove junk or non-skills.
                5.  **Combine Skills:** The final skill list should include verified NLP skills and inferred skills.
                6.  **Format Output:** Your final output MUST be a valid JSON object that strictly follows this JSON schema:
-               {json.dumps(output_schema, indent=2)}
+               {OUTPUT_SCHEMA}
                """
 
-        response = self.client.chat.completions.create(
-            model="gpt-4o",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system",
-                 "content": "You are an expert HR assistant outputting JSON according to the provided schema."},
-                {"role": "user", "content": prompt}
-            ]
-        )
+        return [
+            {"role": "system",
+             "content": "You are an expert HR assistant outputting JSON according to the provided schema."},
+            {"role": "user", "content": prompt}
+        ]
+
 
-        try:
-            return json.loads(response.choices[0].message.content)
-        except (json.JSONDecodeError, IndexError):
-            return {}
\ No newline at end of file
+async def _single_piece(text: str) -> AsyncIterator[str]:
+    yield text
@@ -1,51 +1,153 @@
 # cv_extractor/extractors/nlp_skill_extractor.py
-import spacy
-from spacy.matcher import PhraseMatcher
-from typing import List
-
-# Import from SkillNer
-from skillNer.skill_extractor_class import SkillExtractor as SkillNerExtractor
-from skillNer.general_params import SKILL_DB
+import itertools
+import threading
+from typing import Iterable, Iterator, List
 
 # Import our Pydantic models
+from cv_extractor.config import (
+    NLP_BATCH_SIZE, NLP_N_PROCESS, SKILL_MATCHER, SKILLNER_PIPED_ANNOTATE, SPACY_PROFILE, SPACY_PROFILES,
+)
 from cv_extractor.models.cv_models import Skill
 from cv_extractor.models.common import Evidence
 
+# SkillNer keeps n-gram matches scoring at least this much (annotate's default `tresh`).
+SKILLNER_SCORE_THRESHOLD = 0.5
+
 
 class NlpSkillExtractor:
     """
     A wrapper for the SkillNer library to extract skills and format them
     into our Pydantic models.
+
+    Two matcher engines are available:
+    - "skillner": the full spaCy pipeline plus SkillNer's n-gram scoring.
+    - "automaton": a compiled Aho–Corasick automaton over SKILL_DB surface
+      forms that finds all mentions in one linear pass. It is memory-mapped
+      from the binary skill index, so workers share its pages and start in
+      milliseconds (see skill_index.py).
+
+    `profile` names an entry of SPACY_PROFILES (model size and disabled
+    components) used by the SkillNer engine. With `piped_annotate`, the
+    SkillNer engine uses `_annotate` instead of SkillNer's own `annotate`,
+    which lets `extract_many` batch the spaCy pass through `nlp.pipe`.
     """
 
-    def __init__(self):
-        # Initializes the spaCy model and the SkillNer extractor.
-        # This setup can take a moment on first run.
-        self.nlp = spacy.load("en_core_web_lg")
-        self.skill_extractor = SkillNerExtractor(self.nlp, SKILL_DB, PhraseMatcher)
+    def __init__(self, engine: str = SKILL_MATCHER, profile: str = SPACY_PROFILE,
+                 piped_annotate: bool = SKILLNER_PIPED_ANNOTATE):
+        if profile not in SPACY_PROFILES:
+            raise ValueError(f"Unknown spaCy profile: {profile}")
+        self.engine = engine
+        self.profile = profile
+        self.piped_annotate = piped_annotate
+        if engine == "automaton":
+            from .skill_index import load_skill_index
+            self.automaton = load_skill_index()
+        elif engine == "skillner":
+            # Initializes the spaCy model and the SkillNer extractor.
+            # This setup can take a moment on first run.
+            import spacy
+            from spacy.matcher import PhraseMatcher
+            from skillNer.cleaner import Cleaner
+            from skillNer.skill_extractor_class import SkillExtractor as SkillNerExtractor
+            from skillNer.general_params import SKILL_DB
+            from skillNer.text_class import Text
+
+            pipeline = SPACY_PROFILES[profile]
+            self.nlp = spacy.load(pipeline["model"], exclude=pipeline["exclude"])
+            self.skill_extractor = SkillNerExtractor(self.nlp, SKILL_DB, PhraseMatcher)
+            if piped_annotate:
+                # SkillNer's sub-matchers compare on the LOWER attribute only, so
+                # they need tokens, not another full pipeline run each.
+                self.skill_extractor.skill_getters.nlp = self.nlp.make_doc
+                # The same normalization SkillNer's Text applies before calling spaCy.
+                self._cleaner = Cleaner(include_cleaning_functions=["remove_punctuation", "remove_extra_space"],
+                                        to_lowercase=False)
+                self._text_class = Text
+        else:
+            raise ValueError(f"Unknown skill matcher engine: {engine}")
+        # spaCy's string store is mutated while annotating, so calls on a
+        # shared instance are serialized. The slow LLM step is not affected.
+        self._lock = threading.Lock()
 
     def extract(self, text: str) -> List[Skill]:
         """
-        Extracts skills from text using SkillNer and maps them to our
-        internal Pydantic models with evidence.
+        Extracts skills from text using the configured engine and maps them
+        to our internal Pydantic models with evidence.
         """
-        annotations = self.skill_extractor.annotate(text)
+        if self.engine == "automaton":
+            # The automaton is read-only, so no lock is needed.
+            return self._to_skills(match.text for match in self.automaton.match(text))
 
-        # --- Adapter Logic ---
-        # Transforms SkillNer's dictionary output into our Pydantic objects
-        extracted_skills = {}
+        with self._lock:
+            if self.piped_annotate:
+                matched_values = self._annotate(text, self.nlp(self._normalize(text)))
+            else:
+                matched_values = self._annotate_stock(text)
+        return self._to_skills(matched_values)
+
+    def extract_many(self, texts: Iterable[str], batch_size: int = NLP_BATCH_SIZE,
+                     n_process: int = NLP_N_PROCESS) -> Iterator[List[Skill]]:
+        """
+        Extracts skills from many texts, streaming them through spaCy's
+        `nlp.pipe` in batches of `batch_size` across `n_process` processes.
+        Results are yielded in input order, each as soon as it is ready.
+        Without `piped_annotate`, the SkillNer engine annotates one text at a time.
+        """
+        if self.engine == "automaton" or not self.piped_annotate:
+            for text in texts:
+                yield self.extract(text)
+            return
 
+        texts_for_spacy, texts_for_skillner = itertools.tee(texts)
+        docs = self.nlp.pipe((self._normalize(text) for text in texts_for_spacy),
+                             batch_size=batch_size, n_process=n_process)
+        for text in texts_for_skillner:
+            with self._lock:
+                matched_values = self._annotate(text, next(docs))
+            yield self._to_skills(matched_values)
+
+    def _normalize(self, text: str) -> str:
+        return self._cleaner(text).lower()
+
+    def _annotate_stock(self, text: str) -> List[str]:
+        """SkillNer's own `annotate`. Returns the matched text of each kept match."""
+        results = self.skill_extractor.annotate(text, tresh=SKILLNER_SCORE_THRESHOLD)["results"]
         # Combine full and ngram matches for comprehensive coverage
-        all_matches = annotations['results'].get('full_matches', []) + \
-                      annotations['results'].get('ngram_scored', [])
+        all_matches = results.get("full_matches", []) + results.get("ngram_scored", [])
+        return [match['doc_node_value'] for match in all_matches]
+
+    def _annotate(self, text: str, doc) -> List[str]:
+        """
+        SkillNer's `annotate`, except that the main spaCy pass is handed in,
+        so it can come from `nlp.pipe`. Returns the matched text of each kept match.
+        """
+        text_obj = self._text_class(text, lambda _normalized: doc)
+        getters = self.skill_extractor.skill_getters
+        matchers = self.skill_extractor.matchers
 
-        for match in all_matches:
-            # SkillNer uses 'skill_id' for a normalized name (e.g., 'KS122Z36QK3N5097B5JH')
-            # For readability, we can map this or use the matched value.
-            # Let's use the matched text ('doc_node_value') as the skill name for now.
-            skill_name = match['doc_node_value'].lower()
-            evidence_text = match['doc_node_value']
+        skills_full, text_obj = getters.get_full_match_skills(text_obj, matchers['full_matcher'])
+        skills_abv, text_obj = getters.get_abv_match_skills(text_obj, matchers['abv_matcher'])
+        skills_uni_full, text_obj = getters.get_full_uni_match_skills(text_obj, matchers['full_uni_matcher'])
+        skills_low_form, text_obj = getters.get_low_match_skills(text_obj, matchers['low_form_matcher'])
+        skills_on_token = getters.get_token_match_skills(text_obj, matchers['token_matcher'])
+        ngram_scored = self.skill_extractor.utils.process_n_gram(
+            skills_on_token + skills_low_form + skills_uni_full, text_obj)
 
+        # Combine full and ngram matches for comprehensive coverage
+        all_matches = skills_full + skills_abv + \
+                      [match for match in ngram_scored if match['score'] >= SKILLNER_SCORE_THRESHOLD]
+        # SkillNer uses 'skill_id' for a normalized name (e.g., 'KS122Z36QK3N5097B5JH')
+        # For readability, we can map this or use the matched value.
+        # Let's use the matched text ('doc_node_value') as the skill name for now.
+        return [match['doc_node_value'] for match in all_matches]
+
+    @staticmethod
+    def _to_skills(matched_values: Iterable[str]) -> List[Skill]:
+        # --- Adapter Logic ---
+        # Transforms the matches into our Pydantic objects
+        extracted_skills = {}
+        for evidence_text in matched_values:
+            skill_name = " ".join(evidence_text.lower().split())
             evidence = Evidence(text_snippet=evidence_text)
 
             if skill_name not in extracted_skills:
@@ -53,4 +155,4 @@ class NlpSkillExtractor:
 
             extracted_skills[skill_name].evidence.append(evidence)
 
-        return list(extracted_skills.values())
\ No newline at end of file
+        return list(extracted_skills.values())
@@ -0,0 +1,96 @@
+# cv_extractor/extractors/registry.py
+import gc
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from .hybrid_manager import HybridManager
+from ..config import SPACY_PROFILE
+
+
+def _current_rss_bytes() -> int:
+    """Returns the resident set size of this process, or 0 if unknown."""
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+class ExtractorRegistry:
+    """
+    A process-wide home for the expensive extractor objects (spaCy models,
+    SkillNer matchers, OpenAI clients).
+
+    Each entry is built once, on first use or during `warm_up()`, and the
+    same instance is handed to every caller afterwards. Construction is
+    guarded by a lock so concurrent requests never load a model twice.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._instances: Dict[str, object] = {}
+        self._stats: Dict[str, dict] = {}
+
+    def get(self, name: str, factory: Callable[[], object]):
+        """Returns the instance registered under `name`, building it if needed."""
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            # Another thread may have finished loading while we waited.
+            if name not in self._instances:
+                rss_before = _current_rss_bytes()
+                started = time.perf_counter()
+                self._instances[name] = factory()
+                load_seconds = time.perf_counter() - started
+                rss_delta = max(_current_rss_bytes() - rss_before, 0)
+                self._stats[name] = {
+                    "load_seconds": round(load_seconds, 3),
+                    "rss_bytes": rss_delta,
+                }
+                print(f"Loaded extractor '{name}' in {load_seconds:.2f}s "
+                      f"(+{rss_delta / 1024 ** 2:.1f} MB RSS)")
+            return self._instances[name]
+
+    def warm_up(self, freeze: bool = True):
+        """
+        Loads the extractors for the deployment's default spaCy profile up
+        front, typically at app start. Other profiles load on first use.
+
+        With `freeze=True` the loaded objects are moved out of the garbage
+        collector's reach (`gc.freeze`). When the app is preloaded in a
+        gunicorn master, this keeps forked workers from touching, and so
+        copying, the pages that hold the models.
+        """
+        get_hybrid_manager()
+        if freeze:
+            gc.collect()
+            gc.freeze()
+
+    def stats(self) -> dict:
+        """Reports load time and memory held per extractor, plus process RSS."""
+        return {
+            "extractors": {name: dict(stat) for name, stat in self._stats.items()},
+            "process_rss_bytes": _current_rss_bytes(),
+        }
+
+
+registry = ExtractorRegistry()
+
+
+def get_hybrid_manager(profile: Optional[str] = None) -> HybridManager:
+    """
+    Returns the shared, warm HybridManager for this process. Each spaCy
+    profile gets its own instance, loaded the first time it is asked for.
+    """
+    profile = profile or SPACY_PROFILE
+    return registry.get(f"hybrid_manager:{profile}", lambda: HybridManager(profile=profile))
+
+
+def warm_up_extractors(freeze: bool = True):
+    """Loads all extractors into the process-wide registry."""
+    registry.warm_up(freeze=freeze)
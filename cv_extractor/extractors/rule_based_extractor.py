@@ -0,0 +1,180 @@
+# cv_extractor/extractors/rule_based_extractor.py
+import re
+from typing import List, Optional, Tuple
+
+from ..models.cv_models import CvSection, Skill
+
+_MONTH = (r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec|janv|févr|mars|avr|mai|juin|juil|"
+          r"août|déc)[a-zé]*\.?")
+_YEAR = r"(?:19|20)\d{2}"
+_DATE = rf"(?:{_MONTH}\s+|\d{{1,2}}/)?{_YEAR}"
+DATE_RANGE_RE = re.compile(
+    rf"\(?{_DATE}\s*(?:-|–|—|to|à)\s*(?:{_DATE}|present|current|now|today|aujourd'hui)\)?", re.IGNORECASE)
+# Separators between a job title and a company, most specific first.
+_TITLE_COMPANY_SEPARATORS = (" at ", " @ ", " | ", " – ", " — ", " - ", ", ")
+_BULLETS = "●•▪◦‣*-–"
+_MAX_HEADER_WORDS = 12
+_MAX_PROJECT_HEADING_WORDS = 8
+# Below this many NLP skills, the skills signal is only partly trusted.
+_EXPECTED_SKILLS = 8
+# Below this many, the rules' skills list (NLP matches only) is too thin to stand in for the LLM's.
+MIN_SKILLS = 3
+
+# How much each signal contributes to the confidence score.
+CONFIDENCE_WEIGHTS = {
+    "experience": 0.4,  # job entries parsed with both a title and a company
+    "skills": 0.25,     # enough NLP skill matches to stand without LLM verification
+    "coverage": 0.15,   # share of the text under recognized section headings
+    "summary": 0.1,
+    "projects": 0.1,    # projects parsed with a description; none without a projects section
+}
+
+
+def _lines(text: str) -> List[str]:
+    return [line.strip() for line in text.splitlines() if line.strip()]
+
+
+def _section_lines(text: str, section: CvSection) -> List[str]:
+    """The non-empty lines of a section, without its heading line."""
+    lines = _lines(text[section.start:section.end])
+    return lines[1:] if section.heading else lines
+
+
+def _is_header_line(line: str) -> bool:
+    return line[0] not in _BULLETS and len(line.split()) <= _MAX_HEADER_WORDS
+
+
+def _first_column(line: str) -> str:
+    """Tab-aligned layouts put the location or dates in a second column; keep the first."""
+    return line.split("\t")[0].strip(" ,|-–—")
+
+
+def _split_title_company(header: str) -> Tuple[str, Optional[str]]:
+    for separator in _TITLE_COMPANY_SEPARATORS:
+        if separator in header.lower():
+            index = header.lower().index(separator)
+            title, company = header[:index].strip(" ,|-–—"), header[index + len(separator):].strip(" ,|-–—")
+            if title and company:
+                return title, company
+    return header.strip(" ,|-–—"), None
+
+
+class RuleBasedExtractor:
+    """
+    A cheap, deterministic alternative to the LLM for well-structured CVs.
+
+    It reads the summary section verbatim, job entries from header lines in
+    the experience section ("Title at Company, 2019 - 2021"), and project
+    headings from the projects section, and keeps every NLP skill as is.
+    `extract` also returns a confidence score between 0 and 1 saying how
+    much of the CV these rules could account for. It is 0 unless at least
+    one job was parsed with both a title and a company and there are at
+    least MIN_SKILLS NLP skills, so no tier skips the LLM for a CV whose
+    work experience or skills the rules could not read.
+    """
+
+    def extract(self, text: str, sections: List[CvSection], nlp_skills: List[Skill]) -> Tuple[dict, float]:
+        summary = self._summary(text, sections)
+        jobs, complete_jobs = self._work_experience(text, sections)
+        projects = self._projects(text, sections)
+
+        has_experience = any(s.label == "experience" for s in sections)
+        labelled = sum(s.end - s.start for s in sections if s.label != "other")
+        scores = {
+            "experience": complete_jobs / len(jobs) if has_experience and jobs else 0.0,
+            "skills": min(len(nlp_skills) / _EXPECTED_SKILLS, 1.0),
+            "coverage": labelled / len(text) if sections and text else 0.0,
+            "summary": 1.0 if summary else 0.0,
+            "projects": sum(1 for p in projects if p["description"]) / len(projects) if projects else 0.0,
+        }
+        confidence = sum(CONFIDENCE_WEIGHTS[name] * score for name, score in scores.items())
+        if not complete_jobs or len(nlp_skills) < MIN_SKILLS:
+            confidence = 0.0
+
+        output = {
+            "summary": summary,
+            "skills": [{"name": skill.name} for skill in nlp_skills],
+            "work_experience": jobs,
+            "projects": projects,
+        }
+        return output, round(confidence, 3)
+
+    @staticmethod
+    def _summary(text: str, sections: List[CvSection]) -> Optional[str]:
+        bodies = []
+        for section in sections:
+            if section.label == "summary":
+                lines = _lines(text[section.start:section.end])
+                bodies.append(" ".join(lines[1:] if section.heading else lines))
+        return " ".join(filter(None, bodies)) or None
+
+    @staticmethod
+    def _work_experience(text: str, sections: List[CvSection]) -> Tuple[List[dict], int]:
+        """
+        Returns the parsed jobs and how many of them have both a title and a
+        company. A job starts at a line with a date range. Its title and
+        company are on that line ("Title at Company, 2019 - 2021"), or on the
+        run of short lines just above it ("Company / City / Title / dates"),
+        or the company is on the short line just below.
+        """
+        jobs = []
+        for section in sections:
+            if section.label != "experience":
+                continue
+            current, short_run, needs_company = None, [], False
+            for line in _section_lines(text, section):
+                if _is_header_line(line) and DATE_RANGE_RE.search(line):
+                    title, company = _split_title_company(_first_column(DATE_RANGE_RE.sub("", line)))
+                    run = [_first_column(short) for short in short_run]
+                    if not title and run:
+                        title = run.pop()
+                    if company is None and run:
+                        company = run[0]
+                    if current is not None and short_run and current["description"][-len(short_run):] == short_run:
+                        # Those lines were the new job's header, not the previous job's description.
+                        del current["description"][-len(short_run):]
+                    if title:
+                        current = {"job_title": title, "company": company, "description": []}
+                        jobs.append(current)
+                        needs_company = company is None
+                    short_run = []
+                    continue
+
+                if needs_company and _is_header_line(line) and len(line.split()) <= 6:
+                    current["company"] = _first_column(line)
+                    needs_company = False
+                    continue
+                needs_company = False
+                cleaned = line.lstrip(_BULLETS).strip()
+                if current is not None:
+                    current["description"].append(cleaned)
+                is_short = _is_header_line(line) and len(line.split()) <= 6 and not line.endswith(".")
+                short_run = short_run + [cleaned] if is_short else []
+
+        complete = 0
+        for job in jobs:
+            complete += bool(job["job_title"] and job["company"])
+            job["company"] = job["company"] or ""
+            job["description"] = "\n".join(job["description"]) or None
+        return jobs, complete
+
+    @staticmethod
+    def _projects(text: str, sections: List[CvSection]) -> List[dict]:
+        """Project headings are short lines without a sentence or a "Label: value" in them."""
+        projects = []
+        for section in sections:
+            if section.label != "projects":
+                continue
+            current = None
+            for line in _section_lines(text, section):
+                name = _first_column(DATE_RANGE_RE.sub("", line)).rstrip(":")
+                is_heading = _is_header_line(line) and len(name.split()) <= _MAX_PROJECT_HEADING_WORDS \
+                    and not line.endswith(".") and ":" not in name
+                if is_heading and name:
+                    current = {"project_name": name, "description": []}
+                    projects.append(current)
+                elif current is not None:
+                    current["description"].append(line.lstrip(_BULLETS).strip())
+        for project in projects:
+            project["description"] = "\n".join(project["description"]) or None
+        return projects
@@ -0,0 +1,119 @@
+# cv_extractor/extractors/section_segmenter.py
+import re
+from typing import Iterable, List, Optional, Set
+
+from ..models.cv_models import CvSection
+from ..parsers.base_parser import normalize_heading
+
+# Known section headings, matched against a normalized line (lowercase, no trailing colon).
+SECTION_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "professional profile", "objective",
+                "career objective", "about me", "about", "profil"),
+    "experience": ("experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history", "experiences",
+                   "expérience professionnelle", "expériences professionnelles"),
+    "projects": ("projects", "personal projects", "academic projects", "key projects",
+                 "selected projects", "projets"),
+    "skills": ("skills", "technical skills", "skills & interests", "core competencies",
+               "competencies", "technologies", "compétences", "compétences techniques"),
+    "education": ("education", "academic background", "formation", "formations", "academic qualifications"),
+    "certifications": ("certifications", "certificates", "licenses & certifications", "courses"),
+    "awards": ("awards", "awards & distinctions", "honors", "honors & awards", "achievements"),
+    "publications": ("publications", "research", "selected publications"),
+    "languages": ("languages", "langues"),
+    "interests": ("interests", "hobbies", "hobbies & interests", "centres d'intérêt"),
+    "references": ("references", "referees"),
+}
+_ALIAS_TO_LABEL = {alias: label for label, aliases in SECTION_HEADINGS.items() for alias in aliases}
+
+# Sections that never feed ExtractedCV fields. Everything else, including text
+# before the first heading and unrecognized headings, is kept. "languages" is
+# kept too: on tech CVs it often lists programming languages.
+IRRELEVANT_SECTIONS = {"education", "interests", "references"}
+
+_MAX_HEADING_WORDS = 6
+# Joins a known heading to more words, as in "SKILLS AND TOOLS" or "EXPERIENCE: 2015-2024".
+_CONNECTOR_RE = re.compile(r"\s*(?:&|\band\b|:)")
+_LINE_RE = re.compile(r"[^\n]*\n?")
+
+
+class SectionSegmenter:
+    """
+    Splits CV text into labelled sections (summary, experience, projects,
+    skills, education, ...) using heading heuristics.
+
+    Headings are recognized from known section names, from ALL-CAPS short
+    lines, and from `heading_hints`: normalized lines the parser saw in a
+    larger font (see `BaseParser.iter_pages`). The set is read as each line
+    is checked, so it may grow between pages (see `BaseParser.stream_pages`).
+    """
+
+    def __init__(self, heading_hints: Optional[Set[str]] = None):
+        self.heading_hints = heading_hints if heading_hints is not None else set()
+
+    def segment(self, text: str, initial_label: str = "header", offset: int = 0) -> List[CvSection]:
+        """
+        Returns sections covering `text` end to end, with character offsets.
+
+        `initial_label` and `offset` let a caller segment a document page by
+        page, carrying the last section's label over to the next page.
+        """
+        sections = [CvSection(label=initial_label, start=offset, end=offset)]
+        position = offset
+        for match in _LINE_RE.finditer(text):
+            line = match.group()
+            if not line:
+                break
+            label = self._heading_label(line)
+            if label is not None:
+                sections.append(CvSection(label=label, heading=line.strip(), start=position, end=position))
+            position += len(line)
+            sections[-1].end = position
+
+        # The initial span is only worth keeping if it holds text.
+        if len(sections) > 1 and sections[0].start == sections[0].end:
+            sections.pop(0)
+        return sections
+
+    def _heading_label(self, line: str) -> Optional[str]:
+        stripped = line.strip()
+        normalized = normalize_heading(stripped)
+        if not normalized or len(normalized.split()) > _MAX_HEADING_WORDS:
+            return None
+
+        is_upper = stripped.isupper()
+        hinted = normalized in self.heading_hints
+        label = _ALIAS_TO_LABEL.get(normalized)
+        if label is not None:
+            # "Languages:" inside a skills block is an inline label, not a heading.
+            if not stripped.endswith(":") or is_upper or hinted:
+                return label
+            return None
+
+        if is_upper or hinted:
+            # Only a known heading followed by a connector keeps its label:
+            # "EDUCATION FIRST" is some other heading, not education.
+            label = _ALIAS_TO_LABEL.get(_CONNECTOR_RE.split(normalized, 1)[0])
+            if label is not None:
+                return label
+            if any(char.isalpha() for char in normalized):
+                return "other"
+        return None
+
+
+def merge_sections(sections: Iterable[CvSection]) -> List[CvSection]:
+    """Joins adjacent sections with the same label, e.g. a section that spans two pages."""
+    merged = []
+    for section in sections:
+        if merged and merged[-1].label == section.label and section.heading is None \
+                and merged[-1].end == section.start:
+            merged[-1].end = section.end
+        else:
+            merged.append(section.model_copy())
+    return merged
+
+
+def slice_sections(text: str, sections: Iterable[CvSection], exclude: Set[str] = IRRELEVANT_SECTIONS,
+                   offset: int = 0) -> str:
+    """Returns the text of every section whose label is not in `exclude`, in order."""
+    return "".join(text[s.start - offset:s.end - offset] for s in sections if s.label not in exclude)
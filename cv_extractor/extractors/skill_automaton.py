@@ -0,0 +1,163 @@
+# cv_extractor/extractors/skill_automaton.py
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Sequence, Tuple
+
+from nltk.stem import PorterStemmer
+
+# Match kinds, strongest first. They mirror SkillNer's matcher pipeline
+# (full_matcher, abv_matcher, full_uni_matcher, low_form_matcher).
+FULL, ABBREVIATION, FULL_UNIGRAM, LOW_SURFACE = 0, 1, 2, 3
+MATCH_KINDS = ("full", "abv", "full_uni", "low_surface")
+
+# Single-token low-surface forms made of a word this common across SKILL_DB
+# ("system", "management", "data", ...) are too ambiguous to match on their own.
+COMMON_TOKEN_COUNT = 200
+
+# Same punctuation SkillNer strips before matching (general_params.LIST_PUNCTUATIONS), plus ";".
+_TOKEN_RE = re.compile(r"[^\s/·,.\-():;!'?]+")
+_stemmer = PorterStemmer()
+
+
+@lru_cache(maxsize=100_000)
+def normalize_token(token: str) -> str:
+    """Lowercases and stems a token, so inflected forms ("developing") match the DB ("develop")."""
+    return _stemmer.stem(token.lower())
+
+
+def tokenize(text: str) -> List[Tuple[str, int, int]]:
+    """Returns (normalized token, start, end) triples, with offsets into `text`."""
+    return [(normalize_token(m.group()), m.start(), m.end()) for m in _TOKEN_RE.finditer(text)]
+
+
+class SkillMatch(NamedTuple):
+    skill_id: str
+    kind: int
+    start: int  # character offsets into the original text
+    end: int
+    text: str
+
+
+def resolve_matches(text: str, tokens: List[Tuple[str, int, int]],
+                    candidates: List[Tuple[int, int, int, str]]) -> List[SkillMatch]:
+    """
+    Turns raw (first token, stop token, kind, skill_id) occurrences into
+    SkillMatches: longest first, then strongest kind, then leftmost, and
+    anything overlapping an already kept match is dropped.
+    """
+    candidates.sort(key=lambda c: (c[0] - c[1], c[2], c[0]))
+    taken = [False] * len(tokens)
+    matches = []
+    for first, stop, kind, skill_id in candidates:
+        if any(taken[first:stop]):
+            continue
+        taken[first:stop] = [True] * (stop - first)
+        start, end = tokens[first][1], tokens[stop - 1][2]
+        matches.append(SkillMatch(skill_id, kind, start, end, text[start:end]))
+    matches.sort(key=lambda m: m.start)
+    return matches
+
+
+class SkillAutomaton:
+    """
+    An Aho–Corasick automaton over normalized tokens, compiled from every
+    SKILL_DB surface form. `match` finds all skill mentions in one linear
+    pass over the text, then keeps the longest, strongest non-overlapping ones.
+
+    This dict-based form is what gets built; at run time the same automaton
+    is read from the memory-mapped skill index (see skill_index.py).
+    """
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[int]] = [[]]
+        # (skill_id, kind, token count) for each compiled surface form
+        self.patterns: List[Tuple[str, int, int]] = []
+        self._pattern_index: Dict[Tuple[str, ...], int] = {}
+
+    def add(self, tokens: Sequence[str], skill_id: str, kind: int):
+        tokens = tuple(tokens)
+        if not tokens:
+            return
+        existing = self._pattern_index.get(tokens)
+        if existing is not None:
+            # The same surface form can belong to several skills; keep the strongest kind.
+            if kind < self.patterns[existing][1]:
+                self.patterns[existing] = (skill_id, kind, len(tokens))
+            return
+
+        state = 0
+        for token in tokens:
+            next_state = self.goto[state].get(token)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][token] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+            state = next_state
+        self._pattern_index[tokens] = len(self.patterns)
+        self.outputs[state].append(len(self.patterns))
+        self.patterns.append((skill_id, kind, len(tokens)))
+
+    def finalize(self):
+        """Computes failure links breadth-first and folds inherited outputs into each state."""
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and token not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                target = self.goto[fallback].get(token, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                self.outputs[next_state] = self.outputs[next_state] + self.outputs[self.fail[next_state]]
+        self._pattern_index = {}
+
+    def find_all(self, tokens: Sequence[str]) -> List[Tuple[int, int]]:
+        """Returns (pattern index, index of the last token) for every occurrence."""
+        found = []
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        state = 0
+        for position, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for pattern in outputs[state]:
+                found.append((pattern, position))
+        return found
+
+    def match(self, text: str) -> List[SkillMatch]:
+        tokens = tokenize(text)
+        candidates = []
+        for pattern, last in self.find_all([token for token, _, _ in tokens]):
+            skill_id, kind, length = self.patterns[pattern]
+            candidates.append((last - length + 1, last + 1, kind, skill_id))
+        return resolve_matches(text, tokens, candidates)
+
+
+def _surface_tokens(form: str) -> List[str]:
+    return [token for token, _, _ in tokenize(form)]
+
+
+def build_skill_automaton(skill_db: dict, token_dist: dict) -> SkillAutomaton:
+    """Compiles SKILL_DB surface forms, filtered with token_dist statistics, into an automaton."""
+    automaton = SkillAutomaton()
+    for skill_id, skill in skill_db.items():
+        high_forms = skill.get("high_surfce_forms", {})
+        if high_forms.get("full"):
+            kind = FULL if skill.get("skill_len", 1) > 1 else FULL_UNIGRAM
+            automaton.add(_surface_tokens(high_forms["full"]), skill_id, kind)
+        if high_forms.get("abv"):
+            automaton.add(_surface_tokens(high_forms["abv"]), skill_id, ABBREVIATION)
+        for form in skill.get("low_surface_forms", []):
+            words = form.lower().split()
+            if len(words) == 1 and token_dist.get(words[0], 0) >= COMMON_TOKEN_COUNT:
+                continue
+            automaton.add(_surface_tokens(form), skill_id, LOW_SURFACE)
+    automaton.finalize()
+    return automaton
+
@@ -0,0 +1,220 @@
+# cv_extractor/extractors/skill_index.py
+import bisect
+import json
+import mmap
+import os
+import struct
+from array import array
+from functools import lru_cache
+from collections.abc import Sequence
+from typing import List, Tuple
+
+from ..config import SKILL_INDEX_PATH, TOKEN_DIST_PATH
+from .skill_automaton import SkillAutomaton, SkillMatch, build_skill_automaton, resolve_matches, tokenize
+
+INDEX_MAGIC = b"SKIX"
+INDEX_FORMAT_VERSION = 2
+
+# Sections of the index file, in on-disk order. Blobs hold concatenated UTF-8
+# strings; every other section is an array of native uint32.
+_SECTIONS = (
+    "token_blob", "token_offsets",                  # sorted normalized tokens (token id = position)
+    "skill_blob", "skill_offsets",                  # SKILL_DB ids (skill index = position)
+    "edge_offsets", "edge_tokens", "edge_targets",  # automaton transitions, per state, sorted by token id
+    "fail", "output_offsets", "output_patterns",    # failure links and matches ending in each state
+    "pattern_skills", "pattern_kinds", "pattern_lengths",
+)
+_BLOBS = {"token_blob", "skill_blob"}
+_HEADER = struct.Struct(f"<4sI{2 * len(_SECTIONS)}Q")
+
+
+class _StringTable(Sequence):
+    """A read-only view of strings stored as a blob plus an offsets array."""
+
+    def __init__(self, blob: memoryview, offsets: memoryview):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> bytes:
+        return bytes(self._blob[self._offsets[index]:self._offsets[index + 1]])
+
+    def find(self, value: bytes) -> int:
+        """Binary-searches a sorted table; returns the position of `value` or -1."""
+        position = bisect.bisect_left(self, value)
+        if position < len(self) and self[position] == value:
+            return position
+        return -1
+
+
+def _uint32_array(values) -> array:
+    return array("I", values)
+
+
+def _string_table(strings: List[str]) -> Tuple[bytes, array]:
+    blob = bytearray()
+    offsets = _uint32_array([0])
+    for string in strings:
+        blob += string.encode("utf-8")
+        offsets.append(len(blob))
+    return bytes(blob), offsets
+
+
+def write_skill_index(automaton: SkillAutomaton, path: str):
+    """
+    Serializes a compiled automaton into one compact binary file: interned
+    strings, integer ids and flat uint32 arrays.
+    """
+    tokens = sorted({token for edges in automaton.goto for token in edges})
+    token_ids = {token: token_id for token_id, token in enumerate(tokens)}
+    skills = sorted({skill_id for skill_id, _, _ in automaton.patterns})
+    skill_ids = {skill_id: index for index, skill_id in enumerate(skills)}
+
+    edge_offsets, edge_tokens, edge_targets = _uint32_array([0]), _uint32_array([]), _uint32_array([])
+    output_offsets, output_patterns = _uint32_array([0]), _uint32_array([])
+    for edges, outputs in zip(automaton.goto, automaton.outputs):
+        for token_id, target in sorted((token_ids[token], target) for token, target in edges.items()):
+            edge_tokens.append(token_id)
+            edge_targets.append(target)
+        edge_offsets.append(len(edge_tokens))
+        output_patterns.extend(outputs)
+        output_offsets.append(len(output_patterns))
+
+    token_blob, token_offsets = _string_table(tokens)
+    skill_blob, skill_offsets = _string_table(skills)
+    sections = {
+        "token_blob": token_blob, "token_offsets": token_offsets,
+        "skill_blob": skill_blob, "skill_offsets": skill_offsets,
+        "edge_offsets": edge_offsets, "edge_tokens": edge_tokens, "edge_targets": edge_targets,
+        "fail": _uint32_array(automaton.fail),
+        "output_offsets": output_offsets, "output_patterns": output_patterns,
+        "pattern_skills": _uint32_array(skill_ids[skill_id] for skill_id, _, _ in automaton.patterns),
+        "pattern_kinds": _uint32_array(kind for _, kind, _ in automaton.patterns),
+        "pattern_lengths": _uint32_array(length for _, _, length in automaton.patterns),
+    }
+
+    # Sections are 8-byte aligned so uint32 views never straddle a boundary.
+    layout, position = [], _HEADER.size
+    for name in _SECTIONS:
+        data = bytes(sections[name]) if name in _BLOBS else sections[name].tobytes()
+        position += -position % 8
+        layout.append((name, position, data))
+        position += len(data)
+
+    header_fields = [value for _, offset, data in layout for value in (offset, len(data))]
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, INDEX_FORMAT_VERSION, *header_fields))
+        for _, offset, data in layout:
+            f.write(b"\0" * (offset - f.tell()))
+            f.write(data)
+    # Atomic rename, so workers opening the index never see a half-written file.
+    os.replace(temp_path, path)
+
+
+class SkillIndex:
+    """
+    The compiled skill matcher, memory-mapped straight from the index file.
+
+    Nothing is unpickled or copied at start-up: every array is a view on
+    the mapped pages, which the OS shares between all worker processes.
+    `match` runs the same Aho–Corasick scan as `SkillAutomaton.match`.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, *fields = _HEADER.unpack_from(self._mmap)
+        if magic != INDEX_MAGIC or version != INDEX_FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a skill index of version {INDEX_FORMAT_VERSION}")
+
+        view = memoryview(self._mmap)
+        arrays = {}
+        for name, offset, length in zip(_SECTIONS, fields[0::2], fields[1::2]):
+            section = view[offset:offset + length]
+            arrays[name] = section if name in _BLOBS else section.cast("I")
+        self._tokens = _StringTable(arrays["token_blob"], arrays["token_offsets"])
+        self._skills = _StringTable(arrays["skill_blob"], arrays["skill_offsets"])
+        self._edge_offsets = arrays["edge_offsets"]
+        self._edge_tokens = arrays["edge_tokens"]
+        self._edge_targets = arrays["edge_targets"]
+        self._fail = arrays["fail"]
+        self._output_offsets = arrays["output_offsets"]
+        self._output_patterns = arrays["output_patterns"]
+        self._pattern_skills = arrays["pattern_skills"]
+        self._pattern_kinds = arrays["pattern_kinds"]
+        self._pattern_lengths = arrays["pattern_lengths"]
+        # Token ids are looked up by binary search; repeated words hit this small per-process cache.
+        self.token_id = lru_cache(maxsize=20_000)(self._find_token)
+
+    def _find_token(self, token: str) -> int:
+        return self._tokens.find(token.encode("utf-8"))
+
+    def _step(self, state: int, token_id: int) -> int:
+        """Follows the transition on `token_id`, or returns -1 if there is none."""
+        lo, hi = self._edge_offsets[state], self._edge_offsets[state + 1]
+        position = bisect.bisect_left(self._edge_tokens, token_id, lo, hi)
+        if position < hi and self._edge_tokens[position] == token_id:
+            return self._edge_targets[position]
+        return -1
+
+    def find_all(self, tokens: Sequence[str]) -> List[Tuple[int, int]]:
+        """Returns (pattern index, index of the last token) for every occurrence."""
+        found = []
+        state = 0
+        for position, token in enumerate(tokens):
+            token_id = self.token_id(token)
+            if token_id < 0:
+                state = 0
+                continue
+            next_state = self._step(state, token_id)
+            while next_state < 0 and state:
+                state = self._fail[state]
+                next_state = self._step(state, token_id)
+            state = max(next_state, 0)
+            for i in range(self._output_offsets[state], self._output_offsets[state + 1]):
+                found.append((self._output_patterns[i], position))
+        return found
+
+    def match(self, text: str) -> List[SkillMatch]:
+        tokens = tokenize(text)
+        candidates = []
+        for pattern, last in self.find_all([token for token, _, _ in tokens]):
+            length = self._pattern_lengths[pattern]
+            skill_id = self._skills[self._pattern_skills[pattern]].decode("utf-8")
+            candidates.append((last - length + 1, last + 1, self._pattern_kinds[pattern], skill_id))
+        return resolve_matches(text, tokens, candidates)
+
+
+def build_skill_index(path: str = SKILL_INDEX_PATH):
+    """
+    The build step: compiles SKILL_DB into the binary index at `path`.
+    token_dist.json is only used here, to leave out common single-word forms.
+    """
+    from skillNer.general_params import SKILL_DB
+    with open(TOKEN_DIST_PATH) as f:
+        token_dist = json.load(f)
+    write_skill_index(build_skill_automaton(SKILL_DB, token_dist), path)
+
+
+def load_skill_index(path: str = SKILL_INDEX_PATH) -> SkillIndex:
+    """Memory-maps the skill index, building it first if it does not exist yet or is of another version."""
+    if os.path.exists(path):
+        try:
+            return SkillIndex(path)
+        except ValueError as e:
+            print(f"Rebuilding skill index: {e}")
+    else:
+        print("Building skill index from SKILL_DB (first run only)...")
+    build_skill_index(path)
+    return SkillIndex(path)
+
+
+if __name__ == "__main__":
+    # python -m cv_extractor.extractors.skill_index
+    build_skill_index()
+    print(f"Skill index written to {SKILL_INDEX_PATH}")
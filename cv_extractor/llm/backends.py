@@ -0,0 +1,175 @@
+# cv_extractor/llm/backends.py
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+from typing import AsyncIterator, List, Optional, Protocol, Tuple, Type
+
+from pydantic import BaseModel, ValidationError
+
+from ..config import (
+    LLM_BACKEND, LLM_FAKE_LATENCY_JITTER_SECONDS, LLM_FAKE_LATENCY_SECONDS, LLM_FAKE_RESPONSES_DIR, OPENAI_API_KEY,
+)
+
+
+class LlmBackend(Protocol):
+    """
+    What LlmClient needs from a model provider: one JSON-mode chat
+    completion. Caching, rate limiting, retries and hedging are layered on
+    top by the client, so a backend only talks to its provider.
+    """
+
+    name: str
+    # Exceptions that mean "try again later" (rate limits, outages).
+    retryable_errors: Tuple[Type[BaseException], ...]
+
+    async def complete_json(self, model: str, messages: List[dict],
+                            response_model: Type[BaseModel]) -> Optional[str]:
+        """Returns the response message content, a JSON object as text."""
+        ...
+
+    def stream_json(self, model: str, messages: List[dict],
+                    response_model: Type[BaseModel]) -> AsyncIterator[str]:
+        """The same completion, yielded as text pieces while it is generated."""
+        ...
+
+
+class OpenAiBackend:
+    """The OpenAI chat completions API, in JSON mode."""
+
+    name = "openai"
+
+    def __init__(self, api_key: Optional[str] = OPENAI_API_KEY):
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found in .env file. Please add it.")
+        import openai
+        # Retries are handled by LlmClient, where they can respect the shared limiter.
+        self.client = openai.AsyncOpenAI(api_key=api_key, max_retries=0)
+        self.retryable_errors = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+    async def complete_json(self, model: str, messages: List[dict],
+                            response_model: Type[BaseModel]) -> Optional[str]:
+        response = await self.client.chat.completions.create(
+            model=model,
+            response_format={"type": "json_object"},
+            messages=messages,
+        )
+        return response.choices[0].message.content
+
+    async def stream_json(self, model: str, messages: List[dict],
+                          response_model: Type[BaseModel]) -> AsyncIterator[str]:
+        stream = await self.client.chat.completions.create(
+            model=model,
+            response_format={"type": "json_object"},
+            messages=messages,
+            stream=True,
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+class FakeLlmBackend:
+    """
+    A deterministic stand-in for offline benchmarks and load tests.
+
+    The response is a canned `<ModelName>.json` from `responses_dir` if one
+    exists. Otherwise it is derived from the request: a JSON object embedded
+    in the prompt that already validates against the response model is
+    echoed back (the enhancer's "edit this profile" case), else a minimal
+    instance is built from the model's JSON schema. Either way it validates.
+
+    Each call sleeps `latency_seconds` plus up to `jitter_seconds`, seeded
+    from the request, so a rerun sees the same latencies. Streamed calls
+    spread that latency over pieces of `STREAM_PIECE_CHARS` characters.
+    """
+
+    STREAM_PIECE_CHARS = 16
+
+    name = "fake"
+    retryable_errors: Tuple[Type[BaseException], ...] = ()
+
+    def __init__(self, latency_seconds: float = LLM_FAKE_LATENCY_SECONDS,
+                 jitter_seconds: float = LLM_FAKE_LATENCY_JITTER_SECONDS,
+                 responses_dir: Optional[str] = LLM_FAKE_RESPONSES_DIR):
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.responses_dir = responses_dir
+
+    async def complete_json(self, model: str, messages: List[dict],
+                            response_model: Type[BaseModel]) -> Optional[str]:
+        await asyncio.sleep(self._latency(messages))
+        return json.dumps(self.respond(messages, response_model))
+
+    async def stream_json(self, model: str, messages: List[dict],
+                          response_model: Type[BaseModel]) -> AsyncIterator[str]:
+        content = json.dumps(self.respond(messages, response_model))
+        pieces = [content[i:i + self.STREAM_PIECE_CHARS] for i in range(0, len(content), self.STREAM_PIECE_CHARS)]
+        delay = self._latency(messages) / len(pieces)
+        for piece in pieces:
+            await asyncio.sleep(delay)
+            yield piece
+
+    def _latency(self, messages: List[dict]) -> float:
+        request = json.dumps(messages, sort_keys=True)
+        seed = int.from_bytes(hashlib.sha256(request.encode("utf-8")).digest()[:8], "big")
+        return self.latency_seconds + random.Random(seed).uniform(0, self.jitter_seconds)
+
+    def respond(self, messages: List[dict], response_model: Type[BaseModel]) -> dict:
+        canned = self._canned_response(response_model)
+        if canned is not None:
+            return canned
+        for candidate in _embedded_json_objects(messages[-1]["content"]):
+            try:
+                return response_model.model_validate(candidate).model_dump(mode="json")
+            except ValidationError:
+                continue
+        schema = response_model.model_json_schema()
+        return _skeleton(schema, schema.get("$defs", {}))
+
+    def _canned_response(self, response_model: Type[BaseModel]) -> Optional[dict]:
+        if not self.responses_dir:
+            return None
+        path = os.path.join(self.responses_dir, f"{response_model.__name__}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return response_model.model_validate(json.load(f)).model_dump(mode="json")
+
+
+def _embedded_json_objects(text: str):
+    """Yields every top-level JSON object that starts a line of `text`."""
+    decoder = json.JSONDecoder()
+    for match in re.finditer(r"^\s*\{", text, re.MULTILINE):
+        try:
+            value, _ = decoder.raw_decode(text, match.end() - 1)
+        except json.JSONDecodeError:
+            continue
+        if isinstance(value, dict):
+            yield value
+
+
+def _skeleton(schema: dict, defs: dict):
+    """The smallest value that satisfies `schema`: required fields only, empty containers."""
+    if "$ref" in schema:
+        return _skeleton(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+    if "default" in schema:
+        return schema["default"]
+    if "anyOf" in schema:
+        return _skeleton(schema["anyOf"][0], defs)
+    kind = schema.get("type")
+    if kind == "object":
+        properties = schema.get("properties", {})
+        return {name: _skeleton(properties[name], defs) for name in schema.get("required", [])}
+    return {"array": [], "string": "", "integer": 0, "number": 0, "boolean": False, "null": None}.get(kind)
+
+
+def create_backend(name: str = LLM_BACKEND) -> LlmBackend:
+    """Builds the backend selected by CV_LLM_BACKEND ("openai" or "fake")."""
+    if name == "openai":
+        return OpenAiBackend()
+    if name == "fake":
+        return FakeLlmBackend()
+    raise ValueError(f"Unknown LLM backend: {name}")
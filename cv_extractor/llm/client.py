@@ -0,0 +1,298 @@
+# cv_extractor/llm/client.py
+import asyncio
+import concurrent.futures
+import json
+import threading
+import time
+from typing import AsyncIterator, Coroutine, Iterator, List, Optional, Type, TypeVar
+
+from pydantic import BaseModel
+
+from ..config import (
+    LLM_CACHE_BYPASS, LLM_EXPECTED_OUTPUT_TOKENS, LLM_MAX_CONCURRENCY, LLM_MAX_RETRIES, LLM_TIMEOUT_SECONDS,
+)
+from .backends import LlmBackend, create_backend
+from .cache import cache_key, get_llm_cache, schema_version
+from .hedging import HedgingPolicy
+from .prompts import count_tokens
+from .rate_limit import RateLimiter, backoff_delay, retry_after_seconds
+
+T = TypeVar("T")
+
+
+class LlmUnavailableError(Exception):
+    """Raised when an LLM request still fails after every retry."""
+
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_thread: Optional[threading.Thread] = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Returns the process-wide event loop all LLM calls run on, starting it
+    in a daemon thread on first use. Blocking callers (Flask request
+    threads) submit coroutines to it, so their LLM calls overlap.
+    """
+    global _loop, _loop_thread
+    if _loop is None:
+        with _loop_lock:
+            if _loop is None:
+                loop = asyncio.new_event_loop()
+                _loop_thread = threading.Thread(target=loop.run_forever, name="llm-event-loop", daemon=True)
+                _loop_thread.start()
+                _loop = loop
+    return _loop
+
+
+def submit(coro: Coroutine[object, object, T]) -> "concurrent.futures.Future[T]":
+    """Schedules a coroutine on the LLM event loop from any thread."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+
+def run_sync(coro: Coroutine[object, object, T]) -> T:
+    """Runs a coroutine on the LLM event loop and blocks until it finishes."""
+    if threading.current_thread() is _loop_thread:
+        coro.close()
+        raise RuntimeError("run_sync() would deadlock on the LLM event loop; await the coroutine instead.")
+    return submit(coro).result()
+
+
+async def _next_item(iterator: AsyncIterator[T]) -> T:
+    return await iterator.__anext__()
+
+
+def iterate_sync(iterator: AsyncIterator[T]) -> Iterator[T]:
+    """Consumes an async iterator on the LLM event loop from blocking code, one item at a time."""
+    try:
+        while True:
+            try:
+                yield run_sync(_next_item(iterator))
+            except StopAsyncIteration:
+                return
+    finally:
+        if hasattr(iterator, "aclose"):
+            run_sync(iterator.aclose())
+
+
+class LlmClient:
+    """
+    The asynchronous LLM execution layer shared by every LLM call site.
+    Requests go to a pluggable backend (OpenAI, or the offline fake).
+
+    Calls go through the persistent response cache and the shared rate
+    limiter, at most `max_concurrency` requests are in flight per process,
+    and each attempt is bounded by `timeout` seconds. Transient failures
+    are retried with jittered exponential backoff, honouring Retry-After.
+    Slow attempts may be hedged with a duplicate request (see HedgingPolicy).
+    Coroutines must run on the shared loop (see `get_event_loop`); blocking
+    code uses `run_sync`. Cache reads and writes are blocking SQLite calls,
+    so they run in worker threads and never stall the other requests on the loop.
+    """
+
+    def __init__(self, backend: Optional[LlmBackend] = None, max_concurrency: int = LLM_MAX_CONCURRENCY,
+                 timeout: float = LLM_TIMEOUT_SECONDS, max_retries: int = LLM_MAX_RETRIES):
+        self.backend = backend or create_backend()
+        # Transient failures worth retrying; anything else (bad request, auth) fails at once.
+        self.retryable_errors = tuple(self.backend.retryable_errors) + (asyncio.TimeoutError,)
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.rate_limiter = RateLimiter()
+        self.hedging = HedgingPolicy()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def complete_json(self, model: str, messages: List[dict], response_model: Type[BaseModel],
+                            timeout: Optional[float] = None, bypass: bool = LLM_CACHE_BYPASS,
+                            hedge: bool = True) -> str:
+        """
+        Runs a JSON-mode chat completion whose answer should follow
+        `response_model`, and returns the message content. Only responses
+        that parse as JSON are cached. With `bypass=True` the cache lookup
+        is skipped, but the fresh response is still stored.
+        `hedge=False` opts a call out of request hedging.
+
+        Raises LlmUnavailableError once transient failures exhaust the retries.
+        """
+        cache = get_llm_cache()
+        key = cache_key(self.backend.name, model, messages, schema_version(response_model))
+        if cache is not None and not bypass:
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                return cached
+
+        estimated_tokens = sum(count_tokens(m["content"]) for m in messages) + LLM_EXPECTED_OUTPUT_TOKENS
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        request = lambda started=None: self._request(
+            model, messages, response_model, estimated_tokens, timeout or self.timeout, started)
+        for attempt in range(self.max_retries + 1):
+            try:
+                content = await (self._hedged(request) if hedge else request())
+                break
+            except self.retryable_errors as e:
+                await self._back_off(e, attempt)
+
+        if cache is not None and content and _is_json(content):
+            await asyncio.to_thread(cache.set, key, model, content)
+        return content
+
+    async def stream_json(self, model: str, messages: List[dict], response_model: Type[BaseModel],
+                          timeout: Optional[float] = None, bypass: bool = LLM_CACHE_BYPASS) -> AsyncIterator[str]:
+        """
+        Streaming counterpart of `complete_json`: yields the message content
+        in pieces as the model generates it. `timeout` bounds the wait for
+        each piece rather than the whole response. A cached response is
+        yielded in one piece, and a complete streamed response is cached.
+
+        Failures are retried only before the first piece is yielded; after
+        that, or once retries are exhausted, LlmUnavailableError is raised.
+        Streams are never hedged.
+        """
+        cache = get_llm_cache()
+        key = cache_key(self.backend.name, model, messages, schema_version(response_model))
+        if cache is not None and not bypass:
+            cached = await asyncio.to_thread(cache.get, key)
+            if cached is not None:
+                yield cached
+                return
+
+        estimated_tokens = sum(count_tokens(m["content"]) for m in messages) + LLM_EXPECTED_OUTPUT_TOKENS
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        for attempt in range(self.max_retries + 1):
+            pieces = []
+            try:
+                await self.rate_limiter.acquire(estimated_tokens)
+                async with self._semaphore:
+                    stream = self.backend.stream_json(model, messages, response_model)
+                    try:
+                        while True:
+                            try:
+                                piece = await asyncio.wait_for(_next_item(stream), timeout=timeout or self.timeout)
+                            except StopAsyncIteration:
+                                break
+                            pieces.append(piece)
+                            yield piece
+                    finally:
+                        await stream.aclose()
+                break
+            except self.retryable_errors as e:
+                if pieces:
+                    # The caller already consumed part of this response; a retry cannot resume it.
+                    raise LlmUnavailableError(f"LLM stream broke off after {len(pieces)} pieces: {e!r}") from e
+                await self._back_off(e, attempt)
+
+        content = "".join(pieces)
+        if cache is not None and content and _is_json(content):
+            await asyncio.to_thread(cache.set, key, model, content)
+
+    async def _back_off(self, error: Exception, attempt: int):
+        """Waits before retrying a failed attempt, or raises LlmUnavailableError after the last one."""
+        if attempt == self.max_retries:
+            raise LlmUnavailableError(
+                f"LLM request failed after {attempt + 1} attempts: {error!r}") from error
+        delay = retry_after_seconds(error)
+        if delay is not None:
+            # The quota is shared, so everyone waits, not just this call.
+            self.rate_limiter.pause(delay)
+        delay = delay if delay is not None else backoff_delay(attempt)
+        print(f"   LLM request failed ({type(error).__name__}), retrying in {delay:.1f}s...")
+        await asyncio.sleep(delay)
+
+    async def _request(self, model: str, messages: List[dict], response_model: Type[BaseModel],
+                       estimated_tokens: int, timeout: float,
+                       started_event: Optional[asyncio.Event] = None) -> Optional[str]:
+        """
+        One rate-limited, time-bounded backend request. `started_event` is set
+        once it is past the rate limiter and holds a concurrency slot.
+        """
+        await self.rate_limiter.acquire(estimated_tokens)
+        async with self._semaphore:
+            if started_event is not None:
+                started_event.set()
+            started = time.monotonic()
+            content = await asyncio.wait_for(
+                self.backend.complete_json(model, messages, response_model),
+                timeout=timeout,
+            )
+        self.hedging.latencies.record(time.monotonic() - started)
+        return content
+
+    async def _hedged(self, request):
+        """
+        Runs `request()`; if it outlives the policy's hedge delay, races it
+        against a duplicate and returns the first success, cancelling the other.
+
+        The delay counts from when the primary holds its concurrency slot, like
+        the latencies it is derived from: time spent queueing is not slowness a
+        duplicate could beat. For the same reason nothing is hedged while every
+        slot is taken, since the duplicate would only queue behind the same limits.
+        """
+        self.hedging.requests += 1
+        started = asyncio.Event()
+        primary = asyncio.ensure_future(request(started))
+        hedge = None
+        try:
+            delay = self.hedging.hedge_delay()
+            if delay is None:
+                return await primary
+            waiter = asyncio.ensure_future(started.wait())
+            try:
+                await asyncio.wait({primary, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                waiter.cancel()
+            if primary.done():
+                return await primary
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or self._semaphore.locked() or not self.hedging.try_launch_hedge():
+                return await primary
+
+            hedge = asyncio.ensure_future(request())
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedging.hedge_wins += 1
+                        else:
+                            self.hedging.primary_wins += 1
+                        return task.result()
+            # Both failed: surface the primary's error to the retry loop.
+            return primary.result()
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> dict:
+        """Hedging metrics and response-cache counters for this process."""
+        cache = get_llm_cache()
+        return {
+            "hedging": self.hedging.stats(),
+            "cache": cache.stats() if cache is not None else None,
+        }
+
+
+def _is_json(content: str) -> bool:
+    try:
+        json.loads(content)
+    except json.JSONDecodeError:
+        return False
+    return True
+
+
+_client: Optional[LlmClient] = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LlmClient:
+    """Returns the process-wide LLM client."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LlmClient()
+    return _client
@@ -0,0 +1,78 @@
+# cv_extractor/llm/hedging.py
+import math
+from collections import deque
+from typing import Optional
+
+from ..config import (
+    LLM_HEDGE_MAX_EXTRA_RATIO, LLM_HEDGE_MIN_SAMPLES, LLM_HEDGE_PERCENTILE, LLM_HEDGE_WINDOW, LLM_HEDGING,
+)
+
+
+class LatencyTracker:
+    """Keeps the last `window` successful request latencies, in seconds."""
+
+    def __init__(self, window: int = LLM_HEDGE_WINDOW):
+        self._samples = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def percentile(self, percentile: float) -> Optional[float]:
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(math.ceil(percentile / 100 * len(ordered)) - 1, 0)
+        return ordered[rank]
+
+
+class HedgingPolicy:
+    """
+    Decides when a slow LLM request gets a duplicate ("hedge").
+
+    A request still running after the rolling `percentile` latency is
+    hedged, unless hedges already make up `max_extra_ratio` of all requests,
+    which caps the extra spend. Nothing is hedged until `min_samples`
+    latencies have been seen.
+    """
+
+    def __init__(self, enabled: bool = LLM_HEDGING, percentile: float = LLM_HEDGE_PERCENTILE,
+                 max_extra_ratio: float = LLM_HEDGE_MAX_EXTRA_RATIO, min_samples: int = LLM_HEDGE_MIN_SAMPLES):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.max_extra_ratio = max_extra_ratio
+        self.min_samples = min_samples
+        self.latencies = LatencyTracker()
+        self.requests = 0
+        self.hedges_launched = 0
+        self.hedge_wins = 0
+        self.primary_wins = 0
+        self.hedges_denied = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """How long to wait on a request before hedging it, or None to never hedge it."""
+        if not self.enabled or len(self.latencies) < self.min_samples:
+            return None
+        return self.latencies.percentile(self.percentile)
+
+    def try_launch_hedge(self) -> bool:
+        """Accounts for a hedge if the extra-spend budget still allows it."""
+        if self.hedges_launched + 1 > self.max_extra_ratio * self.requests:
+            self.hedges_denied += 1
+            return False
+        self.hedges_launched += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "requests": self.requests,
+            "hedges_launched": self.hedges_launched,
+            "hedges_denied": self.hedges_denied,
+            "hedge_wins": self.hedge_wins,
+            "primary_wins": self.primary_wins,
+            "hedge_win_rate": round(self.hedge_wins / self.hedges_launched, 3) if self.hedges_launched else 0.0,
+            "hedge_delay_seconds": self.latencies.percentile(self.percentile),
+        }
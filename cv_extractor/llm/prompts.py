@@ -0,0 +1,135 @@
+# cv_extractor/llm/prompts.py
+import json
+import math
+import re
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, Iterator, List
+
+from ..config import LLM_TOKENIZER_MODEL
+
+try:
+    # Exact counts when tiktoken is installed; the estimate below otherwise.
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# OpenAI's rule of thumb for English text.
+CHARS_PER_TOKEN = 4
+TRUNCATION_MARKER = "\n[... truncated ...]\n"
+
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+_SPACES_RE = re.compile(r"[ \t ]+")
+# "3", "Page 3", "3 / 5", "Page 3 of 5": page numbers carry no content. A year on its own line does.
+_PAGE_NUMBER_RE = re.compile(r"(?:page\s*)?\d{1,3}(?:\s*(?:/|of)\s*\d{1,3})?", re.IGNORECASE)
+# A line repeated this many times is taken for page furniture (a running header or footer
+# printed on every page). Content repeats less: a job title held at two employers, or the
+# same bullet under two roles, is kept.
+FURNITURE_MIN_REPEATS = 3
+
+
+@lru_cache(maxsize=None)
+def compact_schema(model_class, by_alias: bool = True) -> str:
+    """A Pydantic model's JSON schema as minified JSON, built once per model."""
+    return json.dumps(model_class.model_json_schema(by_alias=by_alias), separators=(",", ":"))
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(LLM_TOKENIZER_MODEL)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str) -> int:
+    """Counts prompt tokens locally, without a round trip to the API."""
+    encoding = _encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def compress_text(text: str) -> str:
+    """
+    Drops whitespace runs, blank lines, page numbers and all but the first
+    copy of page furniture (lines repeated FURNITURE_MIN_REPEATS times or
+    more), none of which carry content.
+    """
+    text = _BLANK_LINES_RE.sub("\n", _SPACES_RE.sub(" ", text))
+    lines = [line.strip() for line in text.split("\n")]
+    counts = Counter(lines)
+    seen = set()
+    kept = []
+    for line in lines:
+        if _PAGE_NUMBER_RE.fullmatch(line):
+            continue
+        if len(line) > 3 and counts[line] >= FURNITURE_MIN_REPEATS:
+            if line in seen:
+                continue
+            seen.add(line)
+        kept.append(line)
+    return "\n".join(kept).strip()
+
+
+def fit_to_budget(text: str, max_tokens: int) -> str:
+    """
+    Returns `text` unchanged if it fits in `max_tokens`. Otherwise it is
+    compressed and, if still too long, cut at a line boundary with a marker.
+    The beginning of a CV or README carries the most signal, so it is kept.
+    """
+    if not text or count_tokens(text) <= max_tokens:
+        return text
+    text = compress_text(text)
+    tokens = count_tokens(text)
+    if tokens <= max_tokens:
+        return text
+
+    encoding = _encoding()
+    budget = max_tokens - count_tokens(TRUNCATION_MARKER)
+    if encoding is not None:
+        head = encoding.decode(encoding.encode(text, disallowed_special=())[:budget])
+    else:
+        head = text[:budget * CHARS_PER_TOKEN]
+    # Avoid ending on half a line.
+    cut = head.rfind("\n")
+    if cut > len(head) // 2:
+        head = head[:cut]
+    print(f"   Trimmed LLM input from {tokens} to ~{max_tokens} tokens.")
+    return head + TRUNCATION_MARKER
+
+
+def _split_units(piece: str, max_tokens: int) -> Iterator[str]:
+    """Yields `piece` whole if it fits, else its lines, else fixed-size slices of them."""
+    if count_tokens(piece) <= max_tokens:
+        yield piece
+        return
+    # Halve the estimate so a slice fits even with a denser exact tokenizer.
+    step = max(max_tokens * CHARS_PER_TOKEN // 2, 1)
+    for line in piece.splitlines(keepends=True):
+        if count_tokens(line) <= max_tokens:
+            yield line
+        else:
+            yield from (line[i:i + step] for i in range(0, len(line), step))
+
+
+def split_into_chunks(pieces: Iterable[str], max_tokens: int) -> List[str]:
+    """
+    Packs consecutive pieces of text (e.g. CV sections) into chunks of at
+    most `max_tokens`, in order. A piece that is too long on its own is split
+    on line boundaries; a single overlong line is split by characters.
+    """
+    chunks, current, current_tokens = [], [], 0
+    for piece in pieces:
+        for unit in _split_units(piece, max_tokens):
+            unit_tokens = count_tokens(unit)
+            if current and current_tokens + unit_tokens > max_tokens:
+                chunks.append("".join(current))
+                current, current_tokens = [], 0
+            current.append(unit)
+            current_tokens += unit_tokens
+    if current:
+        chunks.append("".join(current))
+    return [chunk for chunk in chunks if chunk.strip()]
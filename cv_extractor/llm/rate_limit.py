@@ -0,0 +1,106 @@
+# cv_extractor/llm/rate_limit.py
+import asyncio
+import email.utils
+import random
+import time
+from typing import Optional
+
+from ..config import (
+    LLM_BACKOFF_BASE_SECONDS, LLM_BACKOFF_MAX_SECONDS, LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE,
+)
+
+
+class TokenBucket:
+    """
+    A token bucket refilled continuously at `rate_per_minute`, holding at
+    most one minute's worth. `acquire` waits until enough is available.
+    """
+
+    def __init__(self, rate_per_minute: float):
+        self.capacity = float(rate_per_minute)
+        self.refill_per_second = rate_per_minute / 60.0
+        self.available = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` can be taken (0 if it can be taken now)."""
+        self._refill()
+        missing = min(amount, self.capacity) - self.available
+        return max(missing / self.refill_per_second, 0.0)
+
+    def take(self, amount: float):
+        self._refill()
+        self.available -= min(amount, self.capacity)
+
+
+class RateLimiter:
+    """
+    Client-side limiter for the OpenAI quotas, shared by every LLM call in
+    the process. Each request takes one unit from the requests/min bucket
+    and its estimated token count from the tokens/min bucket, waiting until
+    both allow it. A 429 pauses all callers until its Retry-After passes.
+    """
+
+    def __init__(self, requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = LLM_TOKENS_PER_MINUTE):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self, estimated_tokens: int):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # One waiter at a time, so requests are admitted in arrival order.
+        async with self._lock:
+            while True:
+                delay = max(self._paused_until - time.monotonic(),
+                            self.requests.wait_time(1),
+                            self.tokens.wait_time(estimated_tokens))
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+            self.requests.take(1)
+            self.tokens.take(estimated_tokens)
+
+    def pause(self, seconds: float):
+        """Holds back every caller for `seconds`, e.g. after a 429."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def backoff_delay(attempt: int, base: float = LLM_BACKOFF_BASE_SECONDS,
+                  maximum: float = LLM_BACKOFF_MAX_SECONDS) -> float:
+    """Exponential backoff with full jitter for the given retry attempt (0-based)."""
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
+
+
+def retry_after_seconds(error: Exception) -> Optional[float]:
+    """Reads the server's Retry-After hint (seconds or an HTTP date) from an OpenAI API error."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        parsed = email.utils.parsedate_to_datetime(retry_after)
+    except (ValueError, TypeError):
+        # A malformed date is no hint; the caller falls back to backoff.
+        return None
+    return max(parsed.timestamp() - time.time(), 0.0) if parsed else None
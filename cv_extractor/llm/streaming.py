@@ -0,0 +1,153 @@
+# cv_extractor/llm/streaming.py
+import json
+import typing
+from typing import Any, AsyncIterator, List, Optional, Tuple, Type
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+# A completed JSON value and where it sits: ("summary",) or ("work_experience", 0).
+JsonPath = Tuple[Any, ...]
+
+
+class _Frame:
+    """An open object or array while scanning."""
+
+    __slots__ = ("kind", "start", "path", "key", "index", "expect_key")
+
+    def __init__(self, kind: str, start: int, path: JsonPath):
+        self.kind = kind
+        self.start = start
+        self.path = path
+        self.key = None
+        self.index = 0
+        self.expect_key = kind == "{"
+
+
+class IncrementalJsonParser:
+    """
+    Scans a JSON document as it arrives in pieces and reports each value as
+    soon as it is complete, without re-parsing what was already seen.
+
+    `feed` returns (path, value) pairs for the values that closed in the
+    new piece, for paths of at most `max_depth` steps below the root: with
+    the default of 2, the top-level fields and the elements of top-level
+    arrays. A field that is an array is reported element by element, then
+    whole once it closes.
+    """
+
+    def __init__(self, max_depth: int = 2):
+        self.max_depth = max_depth
+        self._text = ""
+        self._pos = 0
+        self._stack: List[_Frame] = []
+        self._in_string = False
+        self._escape = False
+        self._value_start: Optional[int] = None
+        self._scalar_start: Optional[int] = None
+
+    def feed(self, piece: str) -> List[Tuple[JsonPath, Any]]:
+        self._text += piece
+        events = []
+        text = self._text
+        while self._pos < len(text):
+            char = text[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    self._close(self._value_start, self._pos + 1, events)
+            elif self._scalar_start is not None and (char in ",]}" or char.isspace()):
+                # A number, true, false or null ends at the first delimiter, which is then handled as usual.
+                self._close(self._scalar_start, self._pos, events)
+                self._scalar_start = None
+                continue
+            elif char == '"':
+                self._in_string = True
+                self._value_start = self._pos
+            elif char in "{[":
+                self._stack.append(_Frame(char, self._pos, self._child_path()))
+            elif char in "}]":
+                if not self._stack:
+                    raise ValueError(f"Unbalanced '{char}' at offset {self._pos}")
+                frame = self._stack.pop()
+                self._close(frame.start, self._pos + 1, events, frame.path)
+            elif char == ",":
+                if self._stack and self._stack[-1].kind == "{":
+                    self._stack[-1].expect_key = True
+            elif char != ":" and not char.isspace() and self._stack and self._scalar_start is None:
+                self._scalar_start = self._pos
+            self._pos += 1
+        return events
+
+    def _child_path(self) -> JsonPath:
+        """The path of a value starting now, in the innermost open container."""
+        if not self._stack:
+            return ()
+        parent = self._stack[-1]
+        return parent.path + ((parent.key if parent.kind == "{" else parent.index),)
+
+    def _close(self, start: int, end: int, events: list, path: Optional[JsonPath] = None):
+        parent = self._stack[-1] if self._stack else None
+        if parent is not None and parent.kind == "{" and parent.expect_key:
+            parent.key = json.loads(self._text[start:end])
+            parent.expect_key = False
+            return
+        if path is None:
+            path = self._child_path()
+        if parent is not None and parent.kind == "[":
+            parent.index += 1
+        if 1 <= len(path) <= self.max_depth:
+            events.append((path, json.loads(self._text[start:end])))
+
+
+def _field_adapters(response_model: Type[BaseModel]) -> dict:
+    """Per JSON key: (validator for the field, or for one item if it is a list; whether it is a list)."""
+    adapters = {}
+    for name, field in response_model.model_fields.items():
+        annotation = field.annotation
+        is_list = typing.get_origin(annotation) in (list, List)
+        item = typing.get_args(annotation)[0] if is_list else annotation
+        adapters[field.alias or name] = (name, TypeAdapter(item), is_list)
+    return adapters
+
+
+async def stream_partial_objects(pieces: AsyncIterator[str],
+                                 response_model: Type[BaseModel]) -> AsyncIterator[Tuple[Optional[str], Any]]:
+    """
+    Turns a streamed JSON completion for `response_model` into validated
+    partial results, in the order the model writes them: (field, value)
+    for each scalar field, (field, item) for each element of a list field.
+    Items that fail validation are skipped. The last pair is (None, the
+    full response as a dict), or (None, {}) if it is not valid JSON.
+    """
+    adapters = _field_adapters(response_model)
+    parser = IncrementalJsonParser()
+    text = []
+    async for piece in pieces:
+        text.append(piece)
+        if parser is None:
+            continue
+        try:
+            events = parser.feed(piece)
+        except ValueError:
+            # Malformed output: stop reporting partials, the final parse settles it.
+            parser = None
+            continue
+        for path, value in events:
+            if path[0] not in adapters:
+                continue
+            name, adapter, is_list = adapters[path[0]]
+            if is_list != (len(path) == 2):
+                continue
+            try:
+                yield name, adapter.validate_python(value)
+            except ValidationError:
+                continue
+
+    try:
+        yield None, json.loads("".join(text))
+    except json.JSONDecodeError:
+        yield None, {}
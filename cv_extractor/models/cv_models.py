@@ -30,6 +30,16 @@ class Project(BaseModel):
         description="Skills inferred by the LLM from the project description."
     )
 
+class CvSection(BaseModel):
+    """
+    A labelled span of the CV text, e.g. the Experience section, produced by
+    the section segmenter between parsing and extraction.
+    """
+    label: str = Field(description="Section type, e.g. 'experience', 'skills', 'header' or 'other'.")
+    heading: Optional[str] = Field(default=None, description="The heading line that opened the section.")
+    start: int = Field(description="Offset of the section's first character in the full text.")
+    end: int = Field(description="Offset just past the section's last character.")
+
 class ExtractedCV(BaseModel):
     """
     The root model representing all structured data extracted from a CV.
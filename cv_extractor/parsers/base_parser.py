@@ -1,9 +1,90 @@
 # cv_extractor/parsers/base_parser.py
+import queue
+import re
+import threading
 from abc import ABC, abstractmethod
+from typing import BinaryIO, Iterator, Optional, Set, Union
+
+# A document can be given as a path on disk, its raw bytes, or a binary file-like object.
+DocumentSource = Union[str, bytes, BinaryIO]
+
+_END_OF_DOCUMENT = object()
+
+
+def normalize_heading(line: str) -> str:
+    """Lowercases a line and strips bullets, trailing colons and extra spaces."""
+    line = line.strip().strip("●•▪–-*:|").strip()
+    return re.sub(r"\s+", " ", line).lower()
+
 
 class BaseParser(ABC):
     """Abstract base class for all file parsers."""
     @abstractmethod
-    def get_text(self, file_path: str) -> str:
-        """Extracts plain text from a given file."""
-        pass
\ No newline at end of file
+    def iter_pages(self, source: DocumentSource, heading_hints: Optional[Set[str]] = None) -> Iterator[str]:
+        """
+        Yields the plain text of a document one page (or block) at a time.
+
+        If `heading_hints` is given, formats with layout cues (e.g. font
+        size) add the lines of each page that look like headings to it,
+        normalized with `normalize_heading`, before yielding the page.
+        Other formats leave it empty.
+        """
+        pass
+
+    def get_text(self, source: DocumentSource, heading_hints: Optional[Set[str]] = None) -> str:
+        """Extracts plain text from a given document, collecting `heading_hints` like `iter_pages`."""
+        return "".join(self.iter_pages(source, heading_hints))
+
+    def stream_pages(self, source: DocumentSource, buffer_size: int = 4,
+                     heading_hints: Optional[Set[str]] = None) -> Iterator[str]:
+        """
+        Yields pages like `iter_pages`, but decodes them on a background thread
+        so the caller can work on early pages while later ones are read.
+
+        At most `buffer_size` decoded pages wait in memory at any time, which
+        keeps memory flat on very long documents. Each page's hints are added
+        to `heading_hints` just before that page is yielded, never earlier, so
+        the caller sees the same hints however far ahead the thread has read.
+        """
+        buffer = queue.Queue(maxsize=max(buffer_size, 1))
+        stop = threading.Event()
+
+        def put(item) -> bool:
+            # Poll so the producer exits if the consumer stopped reading.
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        # The thread fills its own set; each page carries a snapshot of it.
+        read_hints = set() if heading_hints is not None else None
+
+        def produce():
+            try:
+                for page in self.iter_pages(source, read_hints):
+                    if not put((page, frozenset(read_hints) if read_hints is not None else None)):
+                        return
+            except Exception as e:
+                put(e)
+                return
+            put(_END_OF_DOCUMENT)
+
+        producer = threading.Thread(target=produce, name="page-decoder", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = buffer.get()
+                if item is _END_OF_DOCUMENT:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                page, page_hints = item
+                if page_hints is not None:
+                    heading_hints.update(page_hints)
+                yield page
+        finally:
+            stop.set()
+            producer.join()
@@ -1,9 +1,130 @@
 # cv_extractor/parsers/docx_parser.py
+import io
+import zipfile
+import xml.etree.ElementTree as ET
+from typing import Iterator, Optional, Set
 import docx
-from .base_parser import BaseParser
+from .base_parser import BaseParser, DocumentSource
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_BODY, _P, _R = _W + "body", _W + "p", _W + "r"
+_T, _TAB, _BR, _CR = _W + "t", _W + "tab", _W + "br", _W + "cr"
+_TBL, _TR, _TC = _W + "tbl", _W + "tr", _W + "tc"
+# Text boxes are stored twice (modern shape + VML fallback); only the first copy is read.
+_MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+
+# Lines are grouped into blocks of roughly a page so downstream stages get
+# page-sized chunks, like they do for PDFs.
+_BLOCK_CHARS = 3000
+
 
 class DocxParser(BaseParser):
-    """Parses plain text from DOCX files."""
-    def get_text(self, file_path: str) -> str:
-        doc = docx.Document(file_path)
+    """
+    Parses plain text from DOCX files, given as a path, bytes or a file-like object.
+
+    The fast path streams `word/document.xml` out of the zip with an
+    incremental XML parser, emitting paragraphs, text boxes and table rows
+    (cells joined by " | ") in reading order. python-docx is kept as a
+    fallback for files the fast path cannot read. DOCX has no heading hints.
+    """
+    def iter_pages(self, source: DocumentSource, heading_hints: Optional[Set[str]] = None) -> Iterator[str]:
+        if isinstance(source, (bytes, bytearray)):
+            source = io.BytesIO(source)
+
+        yielded = False
+        try:
+            for block in self._iter_blocks(source):
+                yielded = True
+                yield block
+        except (zipfile.BadZipFile, KeyError, ET.ParseError):
+            # Only fall back if nothing was emitted yet, otherwise text would be duplicated.
+            if yielded:
+                raise
+            if hasattr(source, "seek"):
+                source.seek(0)
+            yield self._get_text_with_python_docx(source)
+
+    def _iter_blocks(self, source) -> Iterator[str]:
+        block, block_len = [], 0
+        with zipfile.ZipFile(source) as archive:
+            with archive.open("word/document.xml") as xml_stream:
+                for line in self._iter_lines(xml_stream):
+                    block.append(line)
+                    block_len += len(line) + 1
+                    if block_len >= _BLOCK_CHARS:
+                        yield "\n".join(block) + "\n"
+                        block, block_len = [], 0
+        if block:
+            yield "\n".join(block)
+
+    @staticmethod
+    def _iter_lines(xml_stream) -> Iterator[str]:
+        body = None
+        paragraphs = []  # text runs of each open <w:p> (text boxes nest them)
+        rows = []        # cell texts of each open <w:tr>
+        cells = []       # lines of each open <w:tc>
+        run_depth = 0    # <w:tab> also appears in paragraph properties, so only runs count
+        fallback_depth = 0
+
+        for event, elem in ET.iterparse(xml_stream, events=("start", "end")):
+            tag = elem.tag
+            if tag == _MC_FALLBACK:
+                fallback_depth += 1 if event == "start" else -1
+                continue
+            if fallback_depth:
+                continue
+
+            if event == "start":
+                if tag == _P:
+                    paragraphs.append([])
+                elif tag == _TR:
+                    rows.append([])
+                elif tag == _TC:
+                    cells.append([])
+                elif tag == _R:
+                    run_depth += 1
+                elif tag == _BODY:
+                    body = elem
+                continue
+
+            line = None
+            in_run = run_depth and paragraphs
+            if tag == _R:
+                run_depth -= 1
+            elif tag == _T:
+                if in_run:
+                    paragraphs[-1].append(elem.text or "")
+            elif tag == _TAB:
+                if in_run:
+                    paragraphs[-1].append("\t")
+            elif tag in (_BR, _CR):
+                if in_run:
+                    paragraphs[-1].append("\n")
+            elif tag == _P:
+                text = "".join(paragraphs.pop())
+                if cells:
+                    cells[-1].append(text)
+                else:
+                    line = text
+            elif tag == _TC:
+                cell_text = " ".join(part.strip() for part in cells.pop() if part.strip())
+                if rows:
+                    rows[-1].append(cell_text)
+            elif tag == _TR:
+                row = [cell for cell in rows.pop() if cell]
+                if row:
+                    if cells:  # nested table
+                        cells[-1].append(" | ".join(row))
+                    else:
+                        line = " | ".join(row)
+
+            # Drop finished top-level content so memory stays flat on large files.
+            if tag in (_P, _TBL) and body is not None and not paragraphs and not cells:
+                body.clear()
+            if line is not None:
+                yield line
+
+    @staticmethod
+    def _get_text_with_python_docx(source) -> str:
+        doc = docx.Document(source)
         return "\n".join([para.text for para in doc.paragraphs])
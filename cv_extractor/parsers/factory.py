@@ -6,11 +6,14 @@ from .pdf_parser import PdfParser
 from .docx_parser import DocxParser
 
 
-def get_parser(file_path: str) -> BaseParser:
+def get_parser(file_name: str) -> BaseParser:
     """
     Factory function to get the correct parser based on file extension.
+
+    `file_name` can be a path on disk or just the original name of an
+    uploaded file; only its extension is used.
     """
-    _, extension = os.path.splitext(file_path)
+    _, extension = os.path.splitext(file_name)
     extension = extension.lower()
 
     if extension == ".pdf":
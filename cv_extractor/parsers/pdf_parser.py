@@ -1,12 +1,155 @@
 # cv_extractor/parsers/pdf_parser.py
+import os
+import tempfile
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Set, Tuple, Union
 import fitz  # PyMuPDF
-from .base_parser import BaseParser
+from .base_parser import BaseParser, DocumentSource, normalize_heading
+from ..config import PDF_PARALLEL_WORKERS, PDF_PARALLEL_MIN_PAGES
+
+# A line counts as a heading candidate when its font is this much larger than body text.
+_HEADING_SIZE_RATIO = 1.15
+_MAX_HEADING_WORDS = 6
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """Returns a process pool shared by all parsers, created on first use."""
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_workers = workers
+        return _pool
+
+
+# (text, font size) of each non-blank line of a page, for heading hints.
+SizedLines = List[Tuple[str, float]]
+
+
+def _read_page(page: fitz.Page, with_layout: bool) -> Tuple[str, Optional[SizedLines]]:
+    """
+    The plain text of a page and, if `with_layout`, the font size of each of
+    its lines. Both come from the same layout pass: the text is rebuilt from
+    it line by line, exactly as `page.get_text()` returns it.
+    """
+    if not with_layout:
+        return page.get_text(), None
+    text_lines, sized_lines = [], []
+    for block in page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)["blocks"]:
+        for line in block.get("lines", []):
+            text_lines.append("".join(span["text"] for span in line["spans"]) + "\n")
+            spans = [span for span in line["spans"] if span["text"].strip()]
+            if spans:
+                sized_lines.append(("".join(span["text"] for span in spans), max(span["size"] for span in spans)))
+    return "".join(text_lines), sized_lines
+
+
+def _extract_page_range(path: str, start: int, stop: int,
+                        with_layout: bool) -> List[Tuple[str, Optional[SizedLines]]]:
+    """Runs in a worker process: opens the document independently and reads pages [start, stop)."""
+    with fitz.open(path) as doc:
+        return [_read_page(doc[page_number], with_layout) for page_number in range(start, stop)]
+
+
+class _HeadingHintCollector:
+    """
+    Adds the heading-like lines of each page to a hint set: short lines set
+    in a noticeably larger font than the body text. The body size is the
+    most common one (by characters) over the pages read so far.
+    """
+
+    def __init__(self, hints: Set[str]):
+        self.hints = hints
+        self.size_weights = Counter()
+
+    def add_page(self, sized_lines: SizedLines):
+        for text, size in sized_lines:
+            self.size_weights[round(size, 1)] += len(text)
+        if not self.size_weights:
+            return
+        body_size = self.size_weights.most_common(1)[0][0]
+        self.hints.update(normalize_heading(text) for text, size in sized_lines
+                          if size >= body_size * _HEADING_SIZE_RATIO and len(text.split()) <= _MAX_HEADING_WORDS)
+
 
 class PdfParser(BaseParser):
-    """Parses plain text from PDF files."""
-    def get_text(self, file_path: str) -> str:
-        doc = fitz.open(file_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        return text
\ No newline at end of file
+    """
+    Parses plain text from PDF files, given as a path, bytes or a file-like object.
+
+    With `parallel_workers` > 1, documents of at least `parallel_min_pages`
+    pages are split into page ranges that are decoded in a process pool and
+    reassembled in order. Shorter documents always take the serial path.
+
+    With a `heading_hints` set, text and font sizes come from one layout
+    pass per page, and each page's heading hints are added before it is
+    yielded. Without it, pages are read with the cheaper plain-text pass.
+    """
+    def __init__(self, parallel_workers: int = PDF_PARALLEL_WORKERS,
+                 parallel_min_pages: int = PDF_PARALLEL_MIN_PAGES):
+        self.parallel_workers = parallel_workers
+        self.parallel_min_pages = parallel_min_pages
+
+    def iter_pages(self, source: DocumentSource, heading_hints: Optional[Set[str]] = None) -> Iterator[str]:
+        if not isinstance(source, (str, bytes, bytearray)):
+            source = source.read()
+        if isinstance(source, bytearray):
+            source = bytes(source)
+        collector = _HeadingHintCollector(heading_hints) if heading_hints is not None else None
+
+        with self._open(source) as doc:
+            page_count = len(doc)
+            if self.parallel_workers < 2 or page_count < self.parallel_min_pages:
+                for page in doc:
+                    text, sized_lines = _read_page(page, collector is not None)
+                    if collector is not None:
+                        collector.add_page(sized_lines)
+                    yield text
+                return
+
+        for text, sized_lines in self._iter_pages_parallel(source, page_count, collector is not None):
+            if collector is not None:
+                collector.add_page(sized_lines)
+            yield text
+
+    def _iter_pages_parallel(self, source: Union[str, bytes], page_count: int,
+                             with_layout: bool) -> Iterator[Tuple[str, Optional[SizedLines]]]:
+        pool = _get_pool(self.parallel_workers)
+        # Workers get a path, so the document is not pickled once per range:
+        # in-memory documents are written to a temporary file once.
+        temp_path = None
+        if isinstance(source, bytes):
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+                f.write(source)
+            source = temp_path = f.name
+        # A few ranges per worker keeps the pool busy when pages vary in cost.
+        range_count = min(page_count, self.parallel_workers * 4)
+        bounds = [page_count * i // range_count for i in range(range_count + 1)]
+        futures = []
+        try:
+            futures = [pool.submit(_extract_page_range, source, start, stop, with_layout)
+                       for start, stop in zip(bounds, bounds[1:])]
+            # Results are consumed in submission order, so pages stay in reading order.
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _open(source: Union[str, bytes]) -> fitz.Document:
+        if isinstance(source, str):
+            return fitz.open(source)
+        return fitz.open(stream=source, filetype="pdf")
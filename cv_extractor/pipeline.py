@@ -1,33 +1,107 @@
 # cv_extractor/pipeline.py
+from typing import Any, Iterable, Iterator, Optional, Tuple
+from .config import EXTRACTION_TIER, NLP_BATCH_SIZE, NLP_N_PROCESS, PAGE_BUFFER_SIZE, SECTION_SEGMENTATION
 from .models.cv_models import ExtractedCV
+from .parsers.base_parser import DocumentSource
 from .parsers.factory import get_parser
 # from .extractors.nlp_skill_extractor import NlpSkillExtractor
-from .extractors.hybrid_manager import HybridManager # Import the new manager
+from .extractors.registry import get_hybrid_manager
 
 
 
-def extract_cv_data(file_path: str) -> ExtractedCV:
+def extract_cv_data(source: DocumentSource, file_name: Optional[str] = None,
+                    nlp_profile: Optional[str] = None, tier: str = EXTRACTION_TIER) -> ExtractedCV:
     """
     The main orchestration function.
 
     1. Selects the correct parser for the file type.
-    2. Extracts the full text from the file.
-    3. Uses the NLP extractor to find skills with evidence.
+    2. Streams the text out of the file page by page.
+    3. Splits the pages into labelled sections and uses the NLP extractor to
+       find skills with evidence in the relevant ones as pages arrive.
     4. Populates and returns a structured ExtractedCV object.
 
     Args:
-        file_path (str): The path to the CV file (PDF or DOCX).
+        source (str | bytes | file-like): The path to the CV file (PDF or DOCX),
+            or its content already in memory.
+        file_name (str, optional): The original file name, used to pick the
+            parser. Required when `source` is not a path.
+        nlp_profile (str, optional): A spaCy profile from SPACY_PROFILES
+            ("fast", "balanced", "accurate"). Defaults to CV_SPACY_PROFILE.
+        tier (str): An extraction tier from EXTRACTION_TIERS ("fast",
+            "balanced", "thorough"). Faster tiers skip the LLM when the
+            rule-based extractor is confident enough. Defaults to CV_EXTRACTION_TIER.
 
     Returns:
         ExtractedCV: A Pydantic model containing the extracted data.
     """
     print("1. Parsing document...")
-    parser = get_parser(file_path)
-    full_text = parser.get_text(file_path)
+    if file_name is None:
+        if not isinstance(source, str):
+            raise ValueError("file_name is required when the CV is not given as a path.")
+        file_name = source
+    parser = get_parser(file_name)
+    # Filled page by page as the parser decodes the document; layout cues are only read when segmenting.
+    heading_hints = set() if SECTION_SEGMENTATION else None
+    pages = parser.stream_pages(source, buffer_size=PAGE_BUFFER_SIZE, heading_hints=heading_hints)
 
-    # The manager now handles the entire extraction process
-    manager = HybridManager()
-    cv_data = manager.extract(full_text)
+    # The manager now handles the entire extraction process. It is loaded once
+    # per process and shared, so only the first call pays the model load.
+    manager = get_hybrid_manager(nlp_profile)
+    cv_data = manager.extract_pages(pages, heading_hints, tier)
 
     print("3. Finalizing structured output...")
-    return cv_data
\ No newline at end of file
+    return cv_data
+
+
+def extract_cv_data_stream(source: DocumentSource, file_name: Optional[str] = None,
+                           nlp_profile: Optional[str] = None,
+                           tier: str = EXTRACTION_TIER) -> Iterator[Tuple[Optional[str], Any]]:
+    """
+    Streaming counterpart of `extract_cv_data`, for progressive rendering.
+    Takes the same arguments, and yields the LLM's partial results as they
+    arrive: ("summary", str), ("work_experience", WorkExperience) and
+    ("projects", Project). Ends with (None, ExtractedCV), the final result.
+    """
+    print("1. Parsing document...")
+    if file_name is None:
+        if not isinstance(source, str):
+            raise ValueError("file_name is required when the CV is not given as a path.")
+        file_name = source
+    parser = get_parser(file_name)
+    heading_hints = set() if SECTION_SEGMENTATION else None
+    pages = parser.stream_pages(source, buffer_size=PAGE_BUFFER_SIZE, heading_hints=heading_hints)
+
+    manager = get_hybrid_manager(nlp_profile)
+    yield from manager.extract_pages_stream(pages, heading_hints, tier)
+
+
+def extract_cv_data_many(paths: Iterable[str], nlp_profile: Optional[str] = None,
+                         batch_size: int = NLP_BATCH_SIZE, n_process: int = NLP_N_PROCESS,
+                         tier: str = EXTRACTION_TIER) -> Iterator[ExtractedCV]:
+    """
+    Batch counterpart of `extract_cv_data` for many CV files.
+
+    Documents are parsed lazily and streamed through spaCy in batches of
+    `batch_size` across `n_process` processes, which is much faster than one
+    `extract_cv_data` call per file. Results are yielded in the order of
+    `paths`, as soon as each batch completes.
+
+    Args:
+        paths (iterable of str): Paths to CV files (PDF or DOCX).
+        nlp_profile (str, optional): A spaCy profile from SPACY_PROFILES.
+        batch_size (int): Documents per spaCy batch. Defaults to CV_NLP_BATCH_SIZE.
+        n_process (int): spaCy worker processes. Defaults to CV_NLP_N_PROCESS.
+        tier (str): An extraction tier from EXTRACTION_TIERS.
+
+    Yields:
+        ExtractedCV: One per path, in input order.
+    """
+    def parsed_documents():
+        for path in paths:
+            print(f"1. Parsing document {path}...")
+            parser = get_parser(path)
+            heading_hints = set() if SECTION_SEGMENTATION else None
+            yield parser.get_text(path, heading_hints), heading_hints
+
+    manager = get_hybrid_manager(nlp_profile)
+    yield from manager.extract_many(parsed_documents(), batch_size=batch_size, n_process=n_process, tier=tier)
@@ -0,0 +1,166 @@
+# enhancement_service/delta.py
+import hashlib
+import json
+from typing import Any, Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field, TypeAdapter, ValidationError
+from unification_service.models import UnifiedProfile
+
+
+class DeltaWorkExperience(BaseModel):
+    id: str = Field(description="The id of the input entry this rewrites.")
+    job_title: str
+    company_name: str
+    description: Optional[str] = None
+
+
+class DeltaProject(BaseModel):
+    id: str = Field(description="The id of the input entry this rewrites.")
+    project_name: str
+    description: Optional[str] = None
+
+
+class EnhancementDelta(BaseModel):
+    """
+    The LLM's answer to a delta enhancement: refined versions of only the
+    sections it was sent. Sections it was not sent are left out.
+    """
+    summary: Optional[str] = None
+    work_experience: List[DeltaWorkExperience] = Field(default=[])
+    projects: List[DeltaProject] = Field(default=[])
+
+
+def section_key(kind: str, value) -> str:
+    """Content address of one section's input, e.g. "work:3f2a...": equal inputs get equal keys."""
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return f"{kind}:{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]}"
+
+
+class ProfileSections:
+    """
+    A unified profile split into the sections the enhancer refines, each
+    keyed by the hash of its input: the summary (keyed by everything it is
+    written from) and every work experience and project. A section whose
+    key has an enhanced result from an earlier run is unchanged and needs
+    no LLM call. Skills are not a section: the unifier already gives them
+    their canonical names.
+    """
+
+    def __init__(self, profile: UnifiedProfile):
+        self.profile = profile
+        self.work_keys = [section_key("work", exp.model_dump()) for exp in profile.work_experience]
+        self.project_keys = [section_key("project", proj.model_dump()) for proj in profile.projects]
+        self.summary_key = section_key("summary", self.summary_inputs())
+
+    def summary_inputs(self) -> dict:
+        """What the summary is written from: no descriptions, just the profile's outline."""
+        return {
+            "current_summary": self.profile.summary,
+            "skills": self.profile.skills,
+            "work_experience": [f"{exp.job_title} at {exp.company_name}" for exp in self.profile.work_experience],
+            "projects": [proj.project_name for proj in self.profile.projects],
+        }
+
+    def keys(self) -> List[str]:
+        return [self.summary_key, *self.work_keys, *self.project_keys]
+
+    def changed_input(self, enhanced: Dict[str, object]) -> dict:
+        """
+        The payload for the LLM: the sections without an enhanced result
+        in `enhanced`, with ids ("w<index>", "p<index>") to match the answers.
+        Raw source payloads (`source_data`) are never part of it.
+        """
+        payload = {}
+        if self.summary_key not in enhanced:
+            payload["summary_inputs"] = self.summary_inputs()
+        work = [{"id": f"w{i}", **exp.model_dump(exclude={"source"})}
+                for i, (exp, key) in enumerate(zip(self.profile.work_experience, self.work_keys))
+                if key not in enhanced]
+        if work:
+            payload["work_experience"] = work
+        projects = [{"id": f"p{i}", "project_name": proj.project_name, "description": proj.description}
+                    for i, (proj, key) in enumerate(zip(self.profile.projects, self.project_keys))
+                    if key not in enhanced]
+        if projects:
+            payload["projects"] = projects
+        return payload
+
+    def record(self, delta: EnhancementDelta, enhanced: Dict[str, object]) -> List[Tuple[str, Any]]:
+        """
+        Adds the sections refined in `delta` to `enhanced`, under their keys.
+        Returns them as (field, value) pairs: ("summary", str), ("work_experience", dict), ("projects", dict).
+        """
+        recorded = []
+        if delta.summary:
+            enhanced[self.summary_key] = delta.summary
+            recorded.append(("summary", delta.summary))
+        for exp in delta.work_experience:
+            index = _index(exp.id, "w", len(self.work_keys))
+            if index is not None:
+                enhanced[self.work_keys[index]] = {
+                    **exp.model_dump(exclude={"id"}),
+                    "source": self.profile.work_experience[index].source,
+                }
+                recorded.append(("work_experience", enhanced[self.work_keys[index]]))
+        for proj in delta.projects:
+            index = _index(proj.id, "p", len(self.project_keys))
+            if index is not None:
+                enhanced[self.project_keys[index]] = {
+                    "project_name": proj.project_name,
+                    "description": proj.description,
+                    "source": self.profile.projects[index].source,
+                }
+                recorded.append(("projects", enhanced[self.project_keys[index]]))
+        return recorded
+
+    def assemble(self, enhanced: Dict[str, object]) -> UnifiedProfile:
+        """
+        The enhanced profile: every section from `enhanced` where it has a
+        valid result, else as it is in the unified profile. Everything else
+        (contact info, name, source data, ...) comes from the unified profile.
+        """
+        profile = self.profile
+        return profile.model_copy(update={
+            "summary": _validated(str, enhanced.get(self.summary_key), profile.summary),
+            "work_experience": [
+                _validated(type(exp), enhanced.get(key), exp)
+                for exp, key in zip(profile.work_experience, self.work_keys)
+            ],
+            "projects": [
+                _validated(type(proj), enhanced.get(key), proj)
+                for proj, key in zip(profile.projects, self.project_keys)
+            ],
+        })
+
+
+def split_payload(payload: dict, projects_per_piece: int) -> List[dict]:
+    """
+    Splits a delta payload into independent pieces for fan-out: the summary
+    inputs, each work experience, and groups of projects.
+    """
+    pieces = []
+    if "summary_inputs" in payload:
+        pieces.append({"summary_inputs": payload["summary_inputs"]})
+    for exp in payload.get("work_experience", []):
+        pieces.append({"work_experience": [exp]})
+    projects = payload.get("projects", [])
+    for start in range(0, len(projects), projects_per_piece):
+        pieces.append({"projects": projects[start:start + projects_per_piece]})
+    return pieces
+
+
+def _index(entry_id: str, prefix: str, count: int) -> Optional[int]:
+    """The position encoded in an id like "w3", or None if the LLM returned an unknown id."""
+    if not entry_id.startswith(prefix) or not entry_id[len(prefix):].isdigit():
+        return None
+    index = int(entry_id[len(prefix):])
+    return index if index < count else None
+
+
+def _validated(annotation, value, fallback):
+    """`value` validated as `annotation`, or `fallback` if it is missing or invalid."""
+    if value is None:
+        return fallback
+    try:
+        return TypeAdapter(annotation).validate_python(value)
+    except ValidationError:
+        return fallback
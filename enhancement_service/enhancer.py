@@ -1,26 +1,208 @@
 # enhancement_service/enhancer.py
+import asyncio
 import json
-from openai import OpenAI
+from typing import Any, AsyncIterator, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
 from unification_service.models import UnifiedProfile
-from cv_extractor.config import OPENAI_API_KEY  # Re-use the existing config
+from unification_service.source_store import SourceStore
+from cv_extractor.config import (  # Re-use the existing config
+    ENHANCEMENT_FANOUT_CONCURRENCY, ENHANCEMENT_MODE, ENHANCEMENT_PROJECTS_PER_PIECE,
+)
+from cv_extractor.llm.client import LlmUnavailableError, get_llm_client, iterate_sync, run_sync
+from cv_extractor.llm.prompts import compact_schema
+from cv_extractor.llm.streaming import stream_partial_objects
+from .delta import EnhancementDelta, ProfileSections, split_payload
+
+OUTPUT_SCHEMA = compact_schema(UnifiedProfile, by_alias=False)
+DELTA_SCHEMA = compact_schema(EnhancementDelta, by_alias=False)
 
 
 class ProfileEnhancer:
     """
     Uses an LLM to refine and enhance a unified profile, focusing on
     consistency, coherence, and professional presentation.
+
+    With a SourceStore, enhancement is incremental: only the sections that
+    changed since the profile was last enhanced are sent to the LLM, and
+    the others are reused from the stored result (see ProfileSections).
+
+    In "fanout" mode each section is refined by its own completion, at
+    most `fanout_concurrency` at a time, so latency follows the slowest
+    section instead of the whole profile. A section whose completion fails
+    keeps its original text.
     """
 
-    def __init__(self):
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+    def __init__(self, store: Optional[SourceStore] = None, mode: str = ENHANCEMENT_MODE,
+                 fanout_concurrency: int = ENHANCEMENT_FANOUT_CONCURRENCY):
+        if mode not in ("single", "fanout"):
+            raise ValueError(f"Unknown enhancement mode: {mode}")
+        self.client = get_llm_client()
+        self.store = store
+        self.mode = mode
+        self.fanout_concurrency = fanout_concurrency
 
     def enhance(self, profile: UnifiedProfile) -> UnifiedProfile:
+        """Blocking wrapper around `enhance_async`, for synchronous callers."""
+        return run_sync(self.enhance_async(profile))
+
+    async def enhance_async(self, profile: UnifiedProfile) -> UnifiedProfile:
         """
         Takes a UnifiedProfile object, sends it to an LLM for refinement,
         and returns the enhanced UnifiedProfile.
         """
-        profile_json = profile.model_dump_json(indent=2)
-        output_schema_json = UnifiedProfile.model_json_schema(by_alias=False)
+        if self.store is not None or self.mode == "fanout":
+            return await self._enhance_sections(profile)
+
+        messages, carried_source_data = self._messages(profile)
+        try:
+            content = await self.client.complete_json(
+                model="gpt-4o",
+                messages=messages,
+                response_model=UnifiedProfile,
+            )
+        except LlmUnavailableError as e:
+            print(f"Enhancement skipped, LLM unavailable: {e}")
+            # Enhancement is a polish step; keep the unified profile rather than failing.
+            return profile
+
+        try:
+            enhanced_data = json.loads(content)
+        except (json.JSONDecodeError, IndexError, TypeError) as e:
+            print(f"Error parsing LLM response for enhancement: {e}")
+            # In case of an error, return the original profile to prevent data loss.
+            return profile
+        return self._validated(profile, enhanced_data, carried_source_data)
+
+    async def _enhance_sections(self, profile: UnifiedProfile) -> UnifiedProfile:
+        async for field, value in self._iter_sections(profile):
+            if field is None:
+                enhanced_profile = value
+        return enhanced_profile
+
+    async def _iter_sections(self, profile: UnifiedProfile) -> AsyncIterator[Tuple[Optional[str], Any]]:
+        """
+        Refines the profile section by section: only those without a stored
+        enhanced result (all of them without a store), then stores the new set.
+        Yields each refined section as (field, value) once its completion
+        finishes (see `ProfileSections.record`), then (None, the enhanced profile).
+        """
+        sections = ProfileSections(profile)
+        # Store calls are blocking SQLite calls; they run in worker threads so the shared loop keeps going.
+        enhanced = ({} if self.store is None
+                    else await asyncio.to_thread(self.store.get_enhanced_sections, profile.profile_id))
+        payload = sections.changed_input(enhanced)
+        changed = sum(1 for key in sections.keys() if key not in enhanced)
+        print(f"Enhancement: {changed} of {len(sections.keys())} sections to refine ({self.mode}).")
+
+        if payload:
+            if self.mode == "fanout":
+                semaphore = asyncio.Semaphore(self.fanout_concurrency)
+                pieces = split_payload(payload, ENHANCEMENT_PROJECTS_PER_PIECE)
+                tasks = [asyncio.ensure_future(self._refine(piece, semaphore)) for piece in pieces]
+            else:
+                tasks = [asyncio.ensure_future(self._refine(payload))]
+            try:
+                for refinement in asyncio.as_completed(tasks):
+                    # Sections missing from the answers keep their unified text and are not stored,
+                    # so they are retried.
+                    for field, value in sections.record(await refinement, enhanced):
+                        yield field, value
+            finally:
+                # If the caller stops listening, no completion is left running for nobody.
+                for task in tasks:
+                    task.cancel()
+
+        if self.store is not None:
+            current = set(sections.keys())
+            await asyncio.to_thread(
+                self.store.save_enhanced_sections,
+                profile.profile_id, {key: value for key, value in enhanced.items() if key in current})
+        yield None, sections.assemble(enhanced)
+
+    async def _refine(self, payload: dict, semaphore: Optional[asyncio.Semaphore] = None) -> EnhancementDelta:
+        """One completion refining the sections in `payload`; an empty delta if it fails."""
+        if semaphore is not None:
+            async with semaphore:
+                return await self._refine(payload)
+        try:
+            content = await self.client.complete_json(
+                model="gpt-4o",
+                messages=self._delta_messages(payload),
+                response_model=EnhancementDelta,
+            )
+        except LlmUnavailableError as e:
+            print(f"Enhancement of {', '.join(payload)} skipped, LLM unavailable: {e}")
+            return EnhancementDelta()
+        except Exception as e:
+            # A non-retryable error (e.g. a rejected request) only costs this piece its refinement.
+            print(f"Enhancement of {', '.join(payload)} failed: {e!r}")
+            return EnhancementDelta()
+        try:
+            return EnhancementDelta.model_validate_json(content)
+        except (ValidationError, TypeError) as e:
+            print(f"Error parsing LLM response for enhancement: {e}")
+            return EnhancementDelta()
+
+    def enhance_stream(self, profile: UnifiedProfile) -> Iterator[Tuple[Optional[str], Any]]:
+        """Blocking wrapper around `enhance_stream_async`, for synchronous callers."""
+        return iterate_sync(self.enhance_stream_async(profile))
+
+    async def enhance_stream_async(self, profile: UnifiedProfile) -> AsyncIterator[Tuple[Optional[str], Any]]:
+        """
+        Streaming counterpart of `enhance_async`, for progressive rendering.
+        Yields (field, value) for each top-level field of the enhanced profile
+        and (field, item) for each entry of its lists (skills, work experience,
+        projects) as soon as it closes in the completion, then (None, the
+        enhanced UnifiedProfile). Partial results are not final: if the full
+        response turns out invalid, the last pair carries the original profile.
+
+        With a store or in "fanout" mode, the section-by-section path runs
+        instead, yielding each refined section as its completion finishes.
+        """
+        if self.store is not None or self.mode == "fanout":
+            async for field, value in self._iter_sections(profile):
+                yield field, value
+            return
+
+        messages, carried_source_data = self._messages(profile)
+        pieces = self.client.stream_json(model="gpt-4o", messages=messages, response_model=UnifiedProfile)
+        try:
+            async for field, value in stream_partial_objects(pieces, UnifiedProfile):
+                if field is not None:
+                    yield field, value
+                elif value:
+                    yield None, self._validated(profile, value, carried_source_data)
+                else:
+                    print("Error parsing LLM response for enhancement: not a JSON object")
+                    yield None, profile
+        except LlmUnavailableError as e:
+            print(f"Enhancement skipped, LLM unavailable: {e}")
+            yield None, profile
+
+    @staticmethod
+    def _validated(profile: UnifiedProfile, enhanced_data: dict,
+                   carried_source_data: Optional[dict]) -> UnifiedProfile:
+        try:
+            # Validate the LLM's output by creating a new UnifiedProfile object.
+            # This ensures the data structure is correct before returning.
+            enhanced_profile = UnifiedProfile(**enhanced_data)
+        except (ValidationError, TypeError) as e:
+            print(f"Error parsing LLM response for enhancement: {e}")
+            # In case of an error, return the original profile to prevent data loss.
+            return profile
+        if carried_source_data is not None:
+            enhanced_profile.source_data = carried_source_data
+        # Skills were canonicalized by the unifier; the LLM's copy is not trusted to keep them so.
+        enhanced_profile.skills = profile.skills
+        return enhanced_profile
+
+    @staticmethod
+    def _messages(profile: UnifiedProfile) -> Tuple[List[dict], Optional[dict]]:
+        """The enhancement prompt, and the source data left out of it, to put back afterwards."""
+        # The raw source payloads (CV full text, LinkedIn raw data) dominate the size and are
+        # never edited, so they are left out of the prompt and put back afterwards.
+        carried_source_data = profile.source_data
+        profile_json = profile.model_dump_json(exclude={"source_data"})
 
         # This prompt is the most critical part of this service.
         # It strictly instructs the LLM to edit, not invent.
@@ -32,7 +214,7 @@ class ProfileEnhancer:
         1.  **DO NOT ADD NEW INFORMATION:** You must not invent any new skills, experiences, projects, or details. Your sole purpose is to improve the presentation of the EXISTING data.
         2.  **CREATE A PROFESSIONAL SUMMARY:** Write a concise, powerful professional summary (2-4 sentences) that synthesizes the candidate's key strengths based *only* on the provided skills, experience, and projects.
         3.  **REFINE WORK EXPERIENCE:** For each job, rewrite the description to be more professional and action-oriented. Use clear, impactful language. If descriptions are messy, structure them into bullet points starting with action verbs.
-        4.  **STANDARDIZE SKILLS:** Review the skill list. Correct capitalization (e.g., "python" -> "Python", "javascript" -> "JavaScript"). Ensure consistency.
+        4.  **KEEP SKILLS AS GIVEN:** The skill list is already standardized. Return it unchanged.
         5.  **ENSURE COHERENCE:** Make sure the entire profile reads like a single, coherent document, not a patchwork of different sources.
 
         **Unified Profile Data to Refine:**
@@ -43,24 +225,41 @@ class ProfileEnhancer:
         Your final output MUST be a valid JSON object that strictly follows this JSON schema. Do not add any extra text or explanations.
 
         **Output Schema:**
-        {json.dumps(output_schema_json, indent=2)}
+        {OUTPUT_SCHEMA}
         """
 
-        response = self.client.chat.completions.create(
-            model="gpt-4o",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "You are a resume editor that outputs perfectly structured JSON."},
-                {"role": "user", "content": prompt}
-            ]
-        )
+        messages = [
+            {"role": "system", "content": "You are a resume editor that outputs perfectly structured JSON."},
+            {"role": "user", "content": prompt}
+        ]
+        return messages, carried_source_data
 
-        try:
-            enhanced_data = json.loads(response.choices[0].message.content)
-            # Validate the LLM's output by creating a new UnifiedProfile object.
-            # This ensures the data structure is correct before returning.
-            return UnifiedProfile(**enhanced_data)
-        except (json.JSONDecodeError, IndexError) as e:
-            print(f"Error parsing LLM response for enhancement: {e}")
-            # In case of an error, return the original profile to prevent data loss.
-            return profile
\ No newline at end of file
+    @staticmethod
+    def _delta_messages(payload: dict) -> List[dict]:
+        delta_json = json.dumps(payload, separators=(",", ":"), ensure_ascii=False)
+        prompt = f"""
+        You are a world-class professional resume editor and career coach.
+        Some sections of a unified profile, aggregated from multiple sources (CV, LinkedIn, GitHub), have changed since it was last refined. Refine only the sections below.
+
+        **CRITICAL INSTRUCTIONS:**
+        1.  **DO NOT ADD NEW INFORMATION:** You must not invent any new skills, experiences, projects, or details. Your sole purpose is to improve the presentation of the EXISTING data.
+        2.  **SUMMARY:** Only if `summary_inputs` is given, write a concise, powerful professional summary (2-4 sentences) based *only* on it, as `summary`.
+        3.  **WORK EXPERIENCE:** For each entry in `work_experience`, rewrite the description to be more professional and action-oriented, structured into bullet points starting with action verbs if it is messy. Keep its `id`.
+        4.  **PROJECTS:** For each entry in `projects`, polish the description the same way. Keep its `id` and `project_name`.
+        5.  Leave out every section that is not given below.
+
+        **Changed Sections:**
+        ---
+        {delta_json}
+        ---
+
+        Your final output MUST be a valid JSON object that strictly follows this JSON schema. Do not add any extra text or explanations.
+
+        **Output Schema:**
+        {DELTA_SCHEMA}
+        """
+
+        return [
+            {"role": "system", "content": "You are a resume editor that outputs perfectly structured JSON."},
+            {"role": "user", "content": prompt}
+        ]
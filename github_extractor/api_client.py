@@ -7,9 +7,10 @@ import requests
 from dotenv import load_dotenv
 from typing import Optional
 
-# --- NEW: Import OpenAI and config ---
-from openai import OpenAI
-from cv_extractor.config import OPENAI_API_KEY
+# --- NEW: Import the shared LLM layer and config ---
+from cv_extractor.config import LLM_MAX_README_TOKENS
+from cv_extractor.llm.client import get_llm_client, run_sync
+from cv_extractor.llm.prompts import compact_schema, fit_to_budget
 
 # Import our updated Pydantic models
 from .models import GitHubProfile, GitHubRepository, ParsedReadme
@@ -17,6 +18,8 @@ from .models import GitHubProfile, GitHubRepository, ParsedReadme
 # Load environment variables from .env file
 load_dotenv()
 
+README_SCHEMA = compact_schema(ParsedReadme)
+
 
 class GitHubApiClient:
     """
@@ -28,7 +31,7 @@ class GitHubApiClient:
         if not self.github_token:
             raise ValueError("GITHUB_TOKEN not found in .env file. Please add it.")
 
-        self.openai_client = OpenAI(api_key=OPENAI_API_KEY)
+        self.llm_client = get_llm_client()
 
         self.headers = {
             "Accept": "application/vnd.github+json",
@@ -39,6 +42,10 @@ class GitHubApiClient:
 
         # --- NEW: The LLM README Parser Method ---
     def _parse_readme_with_llm(self, readme_content: str) -> Optional[ParsedReadme]:
+            """Blocking wrapper around `_parse_readme_with_llm_async`."""
+            return run_sync(self._parse_readme_with_llm_async(readme_content))
+
+    async def _parse_readme_with_llm_async(self, readme_content: str) -> Optional[ParsedReadme]:
             """
             Uses an LLM to parse unstructured README text into a structured
             ParsedReadme Pydantic model.
@@ -46,7 +53,7 @@ class GitHubApiClient:
             if not readme_content:
                 return None
 
-            output_schema = ParsedReadme.model_json_schema()
+            readme_content = fit_to_budget(readme_content, LLM_MAX_README_TOKENS)
 
             prompt = f"""
             You are a highly intelligent data extraction bot. Your task is to analyze the following GitHub profile README markdown text and extract structured information.
@@ -63,20 +70,20 @@ class GitHubApiClient:
             4.  Your output MUST be a valid JSON object that strictly adheres to the following JSON Schema. Do not add any commentary.
 
             **JSON Schema:**
-            {json.dumps(output_schema, indent=2)}
+            {README_SCHEMA}
             """
 
             try:
-                response = self.openai_client.chat.completions.create(
+                content = await self.llm_client.complete_json(
                     model="gpt-4o",
-                    response_format={"type": "json_object"},
                     messages=[
                         {"role": "system",
                          "content": "You are a data extractor that only outputs JSON conforming to a provided schema."},
                         {"role": "user", "content": prompt}
-                    ]
+                    ],
+                    response_model=ParsedReadme,
                 )
-                parsed_data = json.loads(response.choices[0].message.content)
+                parsed_data = json.loads(content)
                 # Validate the LLM's output against our Pydantic model
                 return ParsedReadme(**parsed_data)
             except Exception as e:
@@ -0,0 +1,89 @@
+# skill_matcher_parity.py
+import sys
+import time
+import spacy
+from spacy.matcher import PhraseMatcher
+from skillNer.skill_extractor_class import SkillExtractor as SkillNerExtractor
+from skillNer.general_params import SKILL_DB
+
+from cv_extractor.parsers.factory import get_parser
+from cv_extractor.extractors.nlp_skill_extractor import NlpSkillExtractor
+from cv_extractor.extractors.skill_index import load_skill_index
+
+# --- CONFIGURATION ---
+SAMPLE_CVS = ["MAIMOUNI_YOUSSEF_CV.pdf", "Gaurav_Kumar.pdf", "Gaurav_Kumar.docx"]
+# Share of SkillNer's high-confidence (full) matches the automaton must also find.
+MIN_FULL_MATCH_RECALL = 0.9
+
+
+def piped_annotate_parity() -> bool:
+    """
+    Checks that the SkillNer engine finds the same skills, with the same
+    evidence, with CV_SKILLNER_PIPED_ANNOTATE as with SkillNer's own annotate.
+    """
+    stock = NlpSkillExtractor(engine="skillner", piped_annotate=False)
+    piped = NlpSkillExtractor(engine="skillner", piped_annotate=True)
+    texts = [get_parser(cv_path).get_text(cv_path) for cv_path in SAMPLE_CVS]
+
+    passed = True
+    piped_results = piped.extract_many(texts)
+    for cv_path, text in zip(SAMPLE_CVS, texts):
+        expected = {skill.name: len(skill.evidence) for skill in stock.extract(text)}
+        actual = {skill.name: len(skill.evidence) for skill in next(piped_results)}
+        print(f"--- {cv_path} ---")
+        print(f"Stock: {len(expected):>3} skills, piped: {len(actual):>3} skills")
+        if actual != expected:
+            print(f"Only stock: {sorted(expected.keys() - actual.keys())}")
+            print(f"Only piped: {sorted(actual.keys() - expected.keys())}")
+            differing = sorted(name for name in expected.keys() & actual.keys() if expected[name] != actual[name])
+            print(f"Evidence counts differ: {differing}")
+            passed = False
+    return passed
+
+
+def main():
+    """
+    Compares the automaton skill matcher with SkillNer on the bundled sample
+    CVs and exits non-zero if it misses too many of SkillNer's full matches.
+    """
+    nlp = spacy.load("en_core_web_lg")
+    skill_ner = SkillNerExtractor(nlp, SKILL_DB, PhraseMatcher)
+    automaton = load_skill_index()
+
+    passed = True
+    for cv_path in SAMPLE_CVS:
+        text = get_parser(cv_path).get_text(cv_path)
+
+        started = time.perf_counter()
+        results = skill_ner.annotate(text)["results"]
+        skill_ner_s = time.perf_counter() - started
+        full_ids = {match["skill_id"] for match in results["full_matches"]}
+        scored_ids = {match["skill_id"] for match in results["ngram_scored"]}
+
+        started = time.perf_counter()
+        automaton_ids = {match.skill_id for match in automaton.match(text)}
+        automaton_s = time.perf_counter() - started
+
+        full_recall = len(full_ids & automaton_ids) / len(full_ids) if full_ids else 1.0
+        all_ids = full_ids | scored_ids
+        print(f"--- {cv_path} ---")
+        print(f"SkillNer:  {len(all_ids):>3} skills in {skill_ner_s * 1000:.0f} ms")
+        print(f"Automaton: {len(automaton_ids):>3} skills in {automaton_s * 1000:.1f} ms")
+        print(f"Full-match recall: {full_recall:.2%}, overall overlap: {len(all_ids & automaton_ids)}")
+        missed = sorted(SKILL_DB[skill_id]["skill_name"] for skill_id in full_ids - automaton_ids)
+        if missed:
+            print(f"Missed full matches: {missed}")
+        if full_recall < MIN_FULL_MATCH_RECALL:
+            passed = False
+
+    print("\nPARITY OK" if passed else "\nPARITY FAILED")
+    sys.exit(0 if passed else 1)
+
+
+if __name__ == "__main__":
+    if "--piped" in sys.argv[1:]:
+        # python skill_matcher_parity.py --piped
+        ok = piped_annotate_parity()
+        print("\nPARITY OK" if ok else "\nPARITY FAILED")
+        sys.exit(0 if ok else 1)
+    main()
@@ -0,0 +1,64 @@
+# spacy_profiles_report.py
+import os
+import time
+from cv_extractor.config import SPACY_PROFILES
+from cv_extractor.extractors.nlp_skill_extractor import NlpSkillExtractor
+from cv_extractor.parsers.factory import get_parser
+
+# --- CONFIGURATION ---
+SAMPLE_CVS = ["MAIMOUNI_YOUSSEF_CV.pdf", "Gaurav_Kumar.pdf", "Gaurav_Kumar.docx"]
+BASELINE_PROFILE = "accurate"
+OUTPUT_DIR = "output"
+OUTPUT_FILENAME = "spacy_profiles_report.md"
+
+
+def main():
+    """
+    Runs SkillNer with every spaCy profile on the sample CVs and writes a
+    markdown report of load time, latency and agreement with the baseline.
+    """
+    texts = {path: get_parser(path).get_text(path) for path in SAMPLE_CVS}
+
+    results = {}
+    for profile in SPACY_PROFILES:
+        print(f"--- Profile: {profile} ---")
+        started = time.perf_counter()
+        extractor = NlpSkillExtractor(engine="skillner", profile=profile)
+        load_s = time.perf_counter() - started
+
+        skills, latencies = {}, []
+        for path, text in texts.items():
+            started = time.perf_counter()
+            skills[path] = {skill.name for skill in extractor.extract(text)}
+            latencies.append(time.perf_counter() - started)
+        results[profile] = {"load_s": load_s, "latencies": latencies, "skills": skills}
+
+    baseline = results[BASELINE_PROFILE]["skills"]
+    lines = [
+        "# spaCy profile report",
+        "",
+        f"Skill agreement is measured against the `{BASELINE_PROFILE}` profile.",
+        "",
+        "| profile | model | load (s) | mean latency (ms) | precision | recall |",
+        "|---|---|---|---|---|---|",
+    ]
+    for profile, result in results.items():
+        found = sum(len(result["skills"][path]) for path in texts)
+        expected = sum(len(baseline[path]) for path in texts)
+        agreed = sum(len(result["skills"][path] & baseline[path]) for path in texts)
+        precision = agreed / found if found else 1.0
+        recall = agreed / expected if expected else 1.0
+        mean_ms = 1000 * sum(result["latencies"]) / len(result["latencies"])
+        lines.append(f"| {profile} | {SPACY_PROFILES[profile]['model']} | {result['load_s']:.1f} "
+                     f"| {mean_ms:.0f} | {precision:.2%} | {recall:.2%} |")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    output_path = os.path.join(OUTPUT_DIR, OUTPUT_FILENAME)
+    with open(output_path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+    print("\n".join(lines))
+    print(f"\nReport saved to: {output_path}")
+
+
+if __name__ == "__main__":
+    main()
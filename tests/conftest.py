@@ -0,0 +1,9 @@
+# tests/conftest.py
+import os
+
+# The settings are read when cv_extractor.config is imported: run offline, without an API key or a real backend.
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("CV_LLM_BACKEND", "fake")
+os.environ.setdefault("CV_LLM_FAKE_LATENCY_SECONDS", "0")
+os.environ.setdefault("CV_LLM_FAKE_LATENCY_JITTER_SECONDS", "0")
+os.environ.setdefault("CV_LLM_CACHE_ENABLED", "false")
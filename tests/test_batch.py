@@ -0,0 +1,130 @@
+# tests/test_batch.py
+import json
+import os
+import shutil
+
+import pytest
+
+from cv_extractor import batch
+from cv_extractor.extractors.hybrid_manager import HybridManager
+from cv_extractor.extractors.llm_data_extractor import EXTRACTION_MODEL, LlmDataExtractor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_CVS = ["Gaurav_Kumar.docx", "MAIMOUNI_YOUSSEF_CV.pdf"]
+
+
+class StandInManager:
+    """The parts of HybridManager prepare_batch uses, without loading spaCy or SkillNer."""
+
+    llm_input = staticmethod(HybridManager.llm_input)
+
+    def __init__(self):
+        self.llm_extractor = LlmDataExtractor()
+
+    def analyze_many(self, documents, batch_size, n_process):
+        for text, _ in documents:
+            yield text, [], []
+
+
+@pytest.fixture(autouse=True)
+def stand_in_manager(monkeypatch):
+    monkeypatch.setattr(batch, "get_hybrid_manager", lambda nlp_profile=None: StandInManager())
+
+
+@pytest.fixture
+def input_dir(tmp_path):
+    path = tmp_path / "cvs"
+    path.mkdir()
+    shutil.copy(os.path.join(REPO_ROOT, SAMPLE_CVS[0]), path)
+    return path
+
+
+def read_jsonl(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def result_line(custom_id, content, status_code=200):
+    return {"custom_id": custom_id, "error": None, "response": {
+        "status_code": status_code, "body": {"choices": [{"message": {"role": "assistant", "content": content}}]}}}
+
+
+def write_jsonl(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(json.dumps(line) + "\n" for line in lines)
+
+
+def test_prepare_writes_requests_and_resumes(input_dir, tmp_path):
+    work_dir = str(tmp_path / "work")
+    assert batch.prepare_batch(str(input_dir), work_dir) == 1
+    requests = read_jsonl(os.path.join(work_dir, batch.REQUESTS_FILE))
+    assert [request["custom_id"] for request in requests] == ["Gaurav_Kumar.docx#0"]
+    assert requests[0]["body"]["model"] == EXTRACTION_MODEL
+
+    # Nothing is prepared twice; a CV added later is picked up on the next run.
+    assert batch.prepare_batch(str(input_dir), work_dir) == 0
+    shutil.copy(os.path.join(REPO_ROOT, SAMPLE_CVS[1]), input_dir)
+    assert batch.prepare_batch(str(input_dir), work_dir) == 1
+    manifest = read_jsonl(os.path.join(work_dir, batch.MANIFEST_FILE))
+    assert [entry["doc_id"] for entry in manifest] == SAMPLE_CVS
+    assert len(read_jsonl(os.path.join(work_dir, batch.REQUESTS_FILE))) == 2
+
+
+def test_local_run_and_ingest(input_dir, tmp_path):
+    work_dir, output_dir = str(tmp_path / "work"), str(tmp_path / "out")
+    batch.prepare_batch(str(input_dir), work_dir)
+    requests_path = os.path.join(work_dir, batch.REQUESTS_FILE)
+    results_path = os.path.join(work_dir, batch.RESULTS_FILE)
+    assert batch.run_batch_locally(requests_path, results_path) == 1
+    assert batch.run_batch_locally(requests_path, results_path) == 0
+
+    assert batch.ingest_batch_results(work_dir, output_dir)["written"] == 1
+    assert os.path.exists(os.path.join(output_dir, "Gaurav_Kumar.docx.json"))
+    assert batch.ingest_batch_results(work_dir, output_dir) == {"written": 0, "already_written": 1, "pending": 0}
+
+
+@pytest.mark.parametrize("line", [
+    result_line("cv.pdf#0", "Sorry, I cannot help with that."),
+    result_line("cv.pdf#0", "[1, 2]"),
+    result_line("cv.pdf#0", None),
+    result_line("cv.pdf#0", '{"summary": "ok"}', status_code=500),
+    {"custom_id": "cv.pdf#0", "response": None, "error": {"code": "timeout", "message": "..."}},
+])
+def test_failed_results_are_retried(tmp_path, line):
+    work_dir = str(tmp_path)
+    write_jsonl(os.path.join(work_dir, batch.REQUESTS_FILE), [{"custom_id": "cv.pdf#0", "body": {}}])
+    write_jsonl(os.path.join(work_dir, batch.MANIFEST_FILE), [
+        {"doc_id": "cv.pdf", "custom_ids": ["cv.pdf#0"], "full_text": "...", "nlp_skills": []}])
+    write_jsonl(os.path.join(work_dir, batch.RESULTS_FILE), [line])
+
+    assert batch.ingest_batch_results(work_dir, str(tmp_path / "out"))["pending"] == 1
+    retry_path = str(tmp_path / "retry.jsonl")
+    assert batch.write_retry_batch(work_dir, retry_path) == 1
+    assert [request["custom_id"] for request in read_jsonl(retry_path)] == ["cv.pdf#0"]
+
+
+def test_chunked_cv_waits_for_every_chunk(tmp_path):
+    work_dir = str(tmp_path)
+    write_jsonl(os.path.join(work_dir, batch.MANIFEST_FILE), [
+        {"doc_id": "cv.pdf", "custom_ids": ["cv.pdf#0", "cv.pdf#1"], "full_text": "...", "nlp_skills": []}])
+    first = result_line("cv.pdf#0", json.dumps({"summary": "First.", "work_experience": [
+        {"job_title": "Engineer", "company": "Acme", "description": "Part one."}]}))
+    write_jsonl(os.path.join(work_dir, batch.RESULTS_FILE), [first])
+    assert batch.ingest_batch_results(work_dir, str(tmp_path / "out"))["pending"] == 1
+
+    # Results of a retry batch are passed along with the original ones.
+    second = result_line("cv.pdf#1", json.dumps({"summary": "Second.", "work_experience": [
+        {"job_title": "Engineer", "company": "Acme", "description": "Part two."}]}))
+    write_jsonl(str(tmp_path / "retry_results.jsonl"), [second])
+    results_paths = [os.path.join(work_dir, batch.RESULTS_FILE), str(tmp_path / "retry_results.jsonl")]
+    assert batch.ingest_batch_results(work_dir, str(tmp_path / "out"), results_paths)["written"] == 1
+    with open(tmp_path / "out" / "cv.pdf.json", encoding="utf-8") as f:
+        cv = json.load(f)
+    assert cv["summary"] == "First."
+    assert [exp["description"] for exp in cv["work_experience"]] == ["Part one.\nPart two."]
+
+
+def test_truncated_lines_are_skipped(tmp_path):
+    path = tmp_path / "results.jsonl"
+    path.write_text(json.dumps({"custom_id": "a"}) + "\n" + '{"custom_id": "b", "resp', encoding="utf-8")
+    assert [line["custom_id"] for line in batch._read_jsonl(str(path))] == ["a"]
@@ -0,0 +1,95 @@
+# tests/test_dedup.py
+import pytest
+
+from unification_service.dedup import (
+    FuzzyDeduplicator, level_signature, normalize_company, normalize_project, normalize_title,
+)
+from unification_service.models import UnifiedProject, UnifiedWorkExperience
+
+
+@pytest.fixture
+def deduplicator():
+    return FuzzyDeduplicator(company_threshold=0.8, title_threshold=0.85, project_threshold=0.85,
+                             source_priority=["GitHub README", "LinkedIn", "CV", "GitHub"])
+
+
+def job(title, company, source="CV", description=None):
+    return UnifiedWorkExperience(job_title=title, company_name=company, source=source, description=description)
+
+
+def project(name, source="GitHub", description=None):
+    return UnifiedProject(project_name=name, source=source, description=description)
+
+
+@pytest.mark.parametrize("kept, new", [
+    (("Software Engineer", "Google"), ("SWE", "Google LLC")),
+    (("Sr. Software Engineer", "Acme Inc."), ("Senior Software Engineer", "ACME")),
+    (("Software Engineer II", "Google"), ("Software Engineer II", "Google Inc")),
+])
+def test_work_experience_merges_the_same_role(deduplicator, kept, new):
+    merged = deduplicator.work_experience([job(*kept)], [job(*new, source="LinkedIn")])
+    assert len(merged) == 1
+
+
+@pytest.mark.parametrize("kept, new", [
+    (("Software Engineer", "Google"), ("Software Engineer II", "Google")),
+    (("Software Engineer II", "Google"), ("Software Engineer III", "Google")),
+    (("Software Engineer", "Google"), ("Senior Software Engineer", "Google")),
+    (("Staff Engineer", "Google"), ("Principal Engineer", "Google")),
+    (("Engineer 1", "Google"), ("Engineer 2", "Google")),
+    (("Software Engineer", "Google"), ("Software Engineer", "Microsoft")),
+    (("Software Engineer", "腾讯"), ("Software Engineer", "阿里巴巴")),
+    (("Software Engineer", "—"), ("Software Engineer", "***")),
+])
+def test_work_experience_keeps_different_roles(deduplicator, kept, new):
+    merged = deduplicator.work_experience([job(*kept)], [job(*new, source="LinkedIn")])
+    assert len(merged) == 2
+
+
+def test_new_entries_are_deduplicated_among_themselves(deduplicator):
+    merged = deduplicator.work_experience([], [job("Data Engineer", "Spotify"), job("Data Engineer", "Spotify Ltd")])
+    assert len(merged) == 1
+
+
+@pytest.mark.parametrize("kept, new", [
+    ("推荐系统", "推荐系统"),
+    ("Café Finder", "café-finder"),
+    ("cv-extractor", "CvExtractor"),
+    ("cv_extractor", "CV Extractor"),
+])
+def test_projects_merge_spellings_of_one_repository(deduplicator, kept, new):
+    assert len(deduplicator.projects([project(kept)], [project(new, source="GitHub README")])) == 1
+
+
+@pytest.mark.parametrize("kept, new", [
+    ("aoc-2021", "aoc-2022"),
+    ("project 1 tool", "project 10 tool"),
+    ("cv-extractor", "job-scraper"),
+    ("推荐系统", "聊天机器人"),
+    ("C++", "C#"),
+    ("C", "C++"),
+    ("!!!", "???"),
+])
+def test_projects_keep_different_repositories(deduplicator, kept, new):
+    assert len(deduplicator.projects([project(kept)], [project(new)])) == 2
+
+
+def test_higher_priority_source_survives_in_place(deduplicator):
+    kept = [job("Software Engineer", "Google", source="CV", description="Built search."),
+            job("Analyst", "Bank")]
+    merged = deduplicator.work_experience(kept, [job("Software Engineer", "Google LLC", source="LinkedIn")])
+    assert [exp.source for exp in merged] == ["LinkedIn", "CV"]
+    assert merged[0].company_name == "Google LLC"
+    # The survivor had no description, so it keeps the duplicate's.
+    assert merged[0].description == "Built search."
+
+
+def test_non_latin_and_accented_names_keep_their_letters():
+    assert normalize_company("Société Générale SA") == "société générale"
+    assert normalize_project("推荐系统") == "推荐系统"
+    assert normalize_project("C++ / C#") == "c++ c#"
+
+
+def test_level_signature():
+    assert level_signature(normalize_title("Sr. Software Engineer II")) == ("senior", "ii")
+    assert level_signature(normalize_title("Software Engineer")) == ()
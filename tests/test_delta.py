@@ -0,0 +1,97 @@
+# tests/test_delta.py
+from enhancement_service.delta import (
+    DeltaProject, DeltaWorkExperience, EnhancementDelta, ProfileSections, split_payload,
+)
+from unification_service.models import UnifiedContactInfo, UnifiedProfile, UnifiedProject, UnifiedWorkExperience
+
+
+def make_profile(description="Built search.", title="Engineer", summary="Backend engineer."):
+    return UnifiedProfile(
+        profile_id="p1", contact_info=UnifiedContactInfo(), summary=summary, skills=["Go", "Python"],
+        work_experience=[
+            UnifiedWorkExperience(job_title=title, company_name="Google", description=description, source="CV"),
+            UnifiedWorkExperience(job_title="Intern", company_name="Spotify", source="LinkedIn"),
+        ],
+        projects=[UnifiedProject(project_name="cv-tools", description="A parser.", source="GitHub")],
+        source_data={"cv": {"full_text": "raw CV text"}},
+    )
+
+
+def test_equal_inputs_get_equal_keys():
+    assert ProfileSections(make_profile()).keys() == ProfileSections(make_profile()).keys()
+
+
+def test_a_new_description_changes_only_its_entry():
+    before, after = ProfileSections(make_profile()), ProfileSections(make_profile(description="Built ads."))
+    assert after.work_keys[0] != before.work_keys[0]
+    assert after.work_keys[1:] == before.work_keys[1:]
+    assert after.project_keys == before.project_keys
+    # The summary is written from the outline only, so it is not redone.
+    assert after.summary_key == before.summary_key
+
+
+def test_a_new_job_title_also_changes_the_summary():
+    before, after = ProfileSections(make_profile()), ProfileSections(make_profile(title="Staff Engineer"))
+    assert after.summary_key != before.summary_key
+    assert after.work_keys[0] != before.work_keys[0]
+
+
+def test_keys_follow_content_not_position():
+    profile = make_profile()
+    reordered = profile.model_copy(update={"work_experience": profile.work_experience[::-1]})
+    assert ProfileSections(reordered).work_keys == ProfileSections(profile).work_keys[::-1]
+
+
+def test_changed_input_holds_only_sections_without_a_result():
+    sections = ProfileSections(make_profile())
+    assert set(sections.changed_input({})) == {"summary_inputs", "work_experience", "projects"}
+
+    enhanced = {sections.summary_key: "Done.", sections.work_keys[0]: {}, sections.project_keys[0]: {}}
+    payload = sections.changed_input(enhanced)
+    assert payload == {"work_experience": [
+        {"id": "w1", "job_title": "Intern", "company_name": "Spotify", "description": None}]}
+    assert sections.changed_input(dict.fromkeys(sections.keys(), {})) == {}
+
+
+def test_record_and_assemble():
+    sections = ProfileSections(make_profile())
+    enhanced = {}
+    recorded = sections.record(EnhancementDelta(
+        summary="Refined.",
+        work_experience=[DeltaWorkExperience(id="w0", job_title="Engineer", company_name="Google",
+                                             description="Led search."),
+                         DeltaWorkExperience(id="w9", job_title="Unknown", company_name="?")],
+        projects=[DeltaProject(id="x0", project_name="bad id")],
+    ), enhanced)
+    assert [field for field, _ in recorded] == ["summary", "work_experience"]
+    assert enhanced[sections.work_keys[0]]["source"] == "CV"
+
+    profile = sections.assemble(enhanced)
+    assert profile.summary == "Refined."
+    assert profile.work_experience[0].description == "Led search."
+    assert profile.work_experience[1] == make_profile().work_experience[1]
+    assert profile.source_data == {"cv": {"full_text": "raw CV text"}}
+
+
+def test_invalid_stored_result_falls_back_to_the_input():
+    sections = ProfileSections(make_profile())
+    profile = sections.assemble({sections.work_keys[0]: {"job_title": None}, sections.summary_key: 42})
+    assert profile.work_experience[0] == make_profile().work_experience[0]
+    assert profile.summary == "Backend engineer."
+
+
+def test_split_payload():
+    payload = {
+        "summary_inputs": {"current_summary": None},
+        "work_experience": [{"id": "w0"}, {"id": "w1"}],
+        "projects": [{"id": f"p{i}"} for i in range(5)],
+    }
+    pieces = split_payload(payload, projects_per_piece=2)
+    assert pieces == [
+        {"summary_inputs": {"current_summary": None}},
+        {"work_experience": [{"id": "w0"}]},
+        {"work_experience": [{"id": "w1"}]},
+        {"projects": [{"id": "p0"}, {"id": "p1"}]},
+        {"projects": [{"id": "p2"}, {"id": "p3"}]},
+        {"projects": [{"id": "p4"}]},
+    ]
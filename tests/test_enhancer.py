@@ -0,0 +1,74 @@
+# tests/test_enhancer.py
+import asyncio
+import json
+
+from enhancement_service.delta import ProfileSections
+from enhancement_service.enhancer import ProfileEnhancer
+from unification_service.models import UnifiedContactInfo, UnifiedProfile, UnifiedWorkExperience
+from unification_service.source_store import SourceStore
+
+
+class BadRequestError(Exception):
+    """Stands in for a non-retryable backend error, e.g. openai.BadRequestError."""
+
+
+class PieceClient:
+    """Refines each work experience it is sent, except `failing_id`, whose request is rejected."""
+
+    def __init__(self, failing_id=None, delay_id=None):
+        self.failing_id = failing_id
+        self.delay_id = delay_id
+        self.cancelled = []
+
+    async def complete_json(self, model, messages, response_model, **kwargs):
+        payload = json.loads(messages[-1]["content"].split("---")[1])
+        ids = [exp["id"] for exp in payload.get("work_experience", [])]
+        if self.failing_id in ids:
+            raise BadRequestError(f"rejected {self.failing_id}")
+        if self.delay_id in ids:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                self.cancelled.append(self.delay_id)
+                raise
+        return json.dumps({"work_experience": [
+            {**exp, "description": f"Refined {exp['id']}."} for exp in payload.get("work_experience", [])]})
+
+
+def make_profile():
+    return UnifiedProfile(profile_id="p1", contact_info=UnifiedContactInfo(), work_experience=[
+        UnifiedWorkExperience(job_title=f"Engineer {i}", company_name="Acme", description="Did things.")
+        for i in range(3)])
+
+
+def fanout_enhancer(client, store=None):
+    enhancer = ProfileEnhancer(store=store, mode="fanout")
+    enhancer.client = client
+    return enhancer
+
+
+def test_a_rejected_piece_keeps_its_unified_text(tmp_path):
+    store = SourceStore(str(tmp_path / "profiles.db"))
+    profile = make_profile()
+    enhanced = fanout_enhancer(PieceClient(failing_id="w1"), store).enhance(profile)
+    assert [exp.description for exp in enhanced.work_experience] == ["Refined w0.", "Did things.", "Refined w2."]
+    # Only the refined sections are stored, so the failed one is retried next time.
+    stored = store.get_enhanced_sections("p1")
+    sections = ProfileSections(profile)
+    assert [key in stored for key in sections.work_keys] == [True, False, True]
+
+
+def test_pending_pieces_are_cancelled_when_the_stream_is_closed():
+    client = PieceClient(delay_id="w2")
+    enhancer = fanout_enhancer(client)
+
+    async def first_event_only():
+        stream = enhancer._iter_sections(make_profile())
+        event = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0)
+        return event
+
+    field, _ = asyncio.run(first_event_only())
+    assert field == "work_experience"
+    assert client.cancelled == ["w2"]
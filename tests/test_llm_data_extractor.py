@@ -0,0 +1,74 @@
+# tests/test_llm_data_extractor.py
+from cv_extractor.extractors import llm_data_extractor
+from cv_extractor.extractors.llm_data_extractor import LlmDataExtractor, merge_partial_results, parse_llm_output
+from cv_extractor.llm.prompts import count_tokens
+from cv_extractor.models.common import Evidence
+from cv_extractor.models.cv_models import Skill
+
+
+def test_merge_keeps_the_first_summary_and_unique_skills():
+    merged = merge_partial_results([
+        {"summary": None, "skills": [{"name": "Python"}]},
+        {"summary": "Backend engineer.", "skills": [{"name": " python "}, {"name": "Go"}, {"name": None}]},
+        {"summary": "Ignored.", "skills": []},
+    ])
+    assert merged["summary"] == "Backend engineer."
+    assert [skill["name"] for skill in merged["skills"]] == ["Python", "Go"]
+
+
+def test_merge_folds_an_entry_split_across_chunks():
+    merged = merge_partial_results([
+        {"work_experience": [{"job_title": "Engineer", "company": "Acme", "description": "Part one.",
+                              "inferred_skills": ["SQL"]}]},
+        {"work_experience": [{"job_title": "engineer ", "company": "ACME", "description": "Part two.",
+                              "inferred_skills": ["SQL", "Kafka"]},
+                             {"job_title": "Intern", "company": "Acme"}],
+         "projects": [{"project_name": "cv-tools"}]},
+        {"projects": [{"project_name": "CV-Tools", "description": "A parser."}]},
+    ])
+    first = merged["work_experience"][0]
+    assert len(merged["work_experience"]) == 2
+    assert first["description"] == "Part one.\nPart two."
+    assert first["inferred_skills"] == ["SQL", "Kafka"]
+    assert merged["projects"] == [{"project_name": "cv-tools", "description": "A parser.", "inferred_skills": []}]
+
+
+def test_merge_of_nothing_is_empty():
+    assert merge_partial_results([]) == {"summary": None, "skills": [], "work_experience": [], "projects": []}
+
+
+def test_parse_llm_output():
+    assert parse_llm_output('{"summary": "ok"}') == {"summary": "ok"}
+    assert parse_llm_output("not json") == {}
+    assert parse_llm_output(None) == {}
+
+
+def test_long_cvs_are_split_into_one_request_per_chunk(monkeypatch):
+    monkeypatch.setattr(llm_data_extractor, "LLM_CHUNK_THRESHOLD_TOKENS", 50)
+    monkeypatch.setattr(llm_data_extractor, "LLM_CHUNK_TOKENS", 40)
+    sections = [f"Section {i}\n" + "Built and ran services in Python and Go. " * 3 + "\n" for i in range(4)]
+    python = Skill(name="python", evidence=[Evidence(text_snippet="Python")])
+    extractor = LlmDataExtractor()
+    assert len(extractor.request_messages("Short CV using Python.", [python])) == 1
+    requests = extractor.request_messages("".join(sections), [python], sections)
+    prompts = ["".join(message["content"] for message in messages) for messages in requests]
+    assert len(prompts) > 1
+    # Sections are packed whole, each into exactly one request.
+    assert [sum(section in prompt for prompt in prompts) for section in sections] == [1] * len(sections)
+
+
+def test_the_cv_budget_bounds_every_chunk_together(monkeypatch):
+    monkeypatch.setattr(llm_data_extractor, "LLM_MAX_CV_TOKENS", 400)
+    monkeypatch.setattr(llm_data_extractor, "LLM_CHUNK_THRESHOLD_TOKENS", 150)
+    monkeypatch.setattr(llm_data_extractor, "LLM_CHUNK_TOKENS", 100)
+    sections = [f"Role {i}: built service number {i} in Python.\n" * 20 for i in range(50)]
+    cv_text = "".join(sections)
+    assert count_tokens(cv_text) > 20 * 400
+
+    extractor = LlmDataExtractor()
+    empty_prompt_tokens = sum(count_tokens(message["content"]) for message in extractor._messages("", []))
+    requests = extractor.request_messages(cv_text, [], sections)
+    assert 1 < len(requests) <= 5
+    cv_tokens = [sum(count_tokens(message["content"]) for message in messages) - empty_prompt_tokens
+                 for messages in requests]
+    assert sum(cv_tokens) <= 400 + 10 * len(requests)
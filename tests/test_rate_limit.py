@@ -0,0 +1,116 @@
+# tests/test_rate_limit.py
+import asyncio
+import email.utils
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from cv_extractor.llm import rate_limit
+from cv_extractor.llm.rate_limit import RateLimiter, TokenBucket, backoff_delay, retry_after_seconds
+
+
+class FakeClock:
+    """Stands in for time.monotonic and asyncio.sleep: sleeping just moves the clock forward."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", SimpleNamespace(monotonic=clock.monotonic, time=time.time))
+    monkeypatch.setattr(rate_limit, "asyncio", SimpleNamespace(Lock=asyncio.Lock, sleep=clock.sleep))
+    return clock
+
+
+def test_bucket_starts_full_and_refills_continuously(clock):
+    bucket = TokenBucket(rate_per_minute=60)
+    assert bucket.wait_time(60) == 0
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+    clock.now += 30
+    assert bucket.wait_time(30) == 0
+    assert bucket.wait_time(31) == pytest.approx(1.0)
+
+
+def test_bucket_holds_at_most_one_minute(clock):
+    bucket = TokenBucket(rate_per_minute=60)
+    clock.now += 600
+    bucket.take(60)
+    assert bucket.wait_time(1) == pytest.approx(1.0)
+
+
+def test_oversized_request_waits_for_a_full_bucket_only(clock):
+    bucket = TokenBucket(rate_per_minute=60)
+    bucket.take(10)
+    assert bucket.wait_time(1000) == pytest.approx(10.0)
+
+
+def test_limiter_spaces_requests_by_the_request_quota(clock):
+    limiter = RateLimiter(requests_per_minute=3, tokens_per_minute=1e9)
+
+    async def admit(count):
+        for _ in range(count):
+            await limiter.acquire(10)
+
+    asyncio.run(admit(4))
+    assert clock.slept == [pytest.approx(20.0)]
+
+
+def test_limiter_waits_for_the_token_quota(clock):
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=600)
+
+    async def admit():
+        await limiter.acquire(500)
+        await limiter.acquire(200)
+
+    asyncio.run(admit())
+    assert sum(clock.slept) == pytest.approx(10.0)
+
+
+def test_pause_holds_back_every_caller(clock):
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=1e9)
+    limiter.pause(5)
+    limiter.pause(2)  # a shorter pause does not cut the longer one short
+
+    async def admit_all():
+        await asyncio.gather(*(limiter.acquire(1) for _ in range(3)))
+
+    asyncio.run(admit_all())
+    assert sum(clock.slept) == pytest.approx(5.0)
+
+
+def test_backoff_delay_is_capped():
+    assert all(0 <= backoff_delay(attempt, base=1, maximum=8) <= min(8, 2 ** attempt) for attempt in range(10))
+
+
+def error_with(headers):
+    return Exception() if headers is None else SimpleNamespace(response=SimpleNamespace(headers=headers))
+
+
+@pytest.mark.parametrize("headers, expected", [
+    ({"retry-after-ms": "1500"}, 1.5),
+    ({"retry-after": "7"}, 7.0),
+    ({"retry-after-ms": "soon", "retry-after": "3"}, 3.0),
+    ({"x-other": "1"}, None),
+    ({"retry-after": "next tuesday"}, None),
+    ({"retry-after": "Wed, 32 Foo 2024 25:61:00 GMT"}, None),
+    (None, None),
+])
+def test_retry_after_seconds(headers, expected):
+    assert retry_after_seconds(error_with(headers)) == expected
+
+
+def test_retry_after_http_date():
+    date = email.utils.formatdate(time.time() + 30, usegmt=True)
+    assert 25 <= retry_after_seconds(error_with({"retry-after": date})) <= 30
@@ -0,0 +1,100 @@
+# tests/test_rule_based_extractor.py
+import pytest
+
+from cv_extractor.config import EXTRACTION_TIERS
+from cv_extractor.extractors.hybrid_manager import HybridManager
+from cv_extractor.extractors.rule_based_extractor import CONFIDENCE_WEIGHTS, MIN_SKILLS, RuleBasedExtractor
+from cv_extractor.extractors.section_segmenter import SectionSegmenter
+from cv_extractor.models.cv_models import Skill
+
+SKILLS = [Skill(name=name, evidence=[]) for name in
+          ("python", "go", "sql", "docker", "kubernetes", "aws", "kafka", "terraform")]
+
+STRUCTURED_CV = """Summary
+Backend engineer who builds data platforms.
+Experience
+Senior Engineer at Acme Corp, Jan 2021 - Present
+Built the billing platform.
+Engineer | Globex, 2018 - 2020
+Ran the data pipeline.
+Projects
+cv-tools
+A parser for CVs.
+Skills
+Python, Go, SQL
+"""
+
+
+def extract(text, skills=SKILLS):
+    return RuleBasedExtractor().extract(text, SectionSegmenter().segment(text), skills)
+
+
+def test_structured_cv_is_read_with_full_confidence():
+    output, confidence = extract(STRUCTURED_CV)
+    assert confidence == pytest.approx(sum(CONFIDENCE_WEIGHTS.values()))
+    assert output["summary"] == "Backend engineer who builds data platforms."
+    assert [(job["job_title"], job["company"]) for job in output["work_experience"]] == [
+        ("Senior Engineer", "Acme Corp"), ("Engineer", "Globex")]
+    assert output["work_experience"][0]["description"] == "Built the billing platform."
+    assert output["projects"] == [{"project_name": "cv-tools", "description": "A parser for CVs."}]
+    assert [skill["name"] for skill in output["skills"]] == [skill.name for skill in SKILLS]
+
+
+def test_stacked_header_lines_give_title_and_company():
+    text = "Experience\nInitech\nParis\nData Engineer\n2019 - 2022\nBuilt reports.\n"
+    output, confidence = extract(text)
+    assert [(job["job_title"], job["company"]) for job in output["work_experience"]] == [("Data Engineer", "Initech")]
+    assert confidence > 0
+
+
+def test_no_jobs_means_no_confidence():
+    text = "Summary\nBackend engineer.\nProjects\ncv-tools\nA parser for CVs.\nSkills\nPython\n"
+    assert extract(text)[1] == 0.0
+
+
+def test_jobs_without_a_company_mean_no_confidence():
+    text = ("Summary\nBackend engineer.\nExperience\nFreelancing, 2019 - 2022\n"
+            "Built web shops for small clients across Europe.\n")
+    output, confidence = extract(text)
+    assert output["work_experience"][0]["company"] == ""
+    assert confidence == 0.0
+
+
+@pytest.mark.parametrize("skill_count", [0, MIN_SKILLS - 1])
+def test_too_few_skills_mean_no_confidence(skill_count):
+    assert extract(STRUCTURED_CV, SKILLS[:skill_count])[1] == 0.0
+
+
+def test_missing_projects_section_scores_nothing_for_projects():
+    without_projects = STRUCTURED_CV.replace("Projects\ncv-tools\nA parser for CVs.\n", "")
+    assert extract(without_projects)[1] == pytest.approx(extract(STRUCTURED_CV)[1] - CONFIDENCE_WEIGHTS["projects"])
+
+
+def test_few_skills_are_partly_trusted():
+    full, partial = extract(STRUCTURED_CV)[1], extract(STRUCTURED_CV, SKILLS[:4])[1]
+    assert partial == pytest.approx(full - CONFIDENCE_WEIGHTS["skills"] / 2)
+
+
+@pytest.mark.parametrize("tier, skips_llm", [("fast", True), ("balanced", True), ("thorough", False)])
+def test_tiers_gate_the_llm(tier, skips_llm):
+    manager = HybridManager.__new__(HybridManager)
+    manager.rule_extractor = RuleBasedExtractor()
+    text = STRUCTURED_CV
+    rule_output = manager._rule_output(text, SKILLS, SectionSegmenter().segment(text), tier)
+    assert (rule_output is not None) == skips_llm
+
+
+def test_cv_without_skills_never_skips_the_llm():
+    manager = HybridManager.__new__(HybridManager)
+    manager.rule_extractor = RuleBasedExtractor()
+    sections = SectionSegmenter().segment(STRUCTURED_CV)
+    for tier in EXTRACTION_TIERS:
+        assert manager._rule_output(STRUCTURED_CV, [], sections, tier) is None
+
+
+def test_weak_cv_goes_to_the_llm_on_every_tier():
+    manager = HybridManager.__new__(HybridManager)
+    manager.rule_extractor = RuleBasedExtractor()
+    text = "Jane Doe\nI have done many things in many places.\n"
+    for tier in EXTRACTION_TIERS:
+        assert manager._rule_output(text, SKILLS, SectionSegmenter().segment(text), tier) is None
@@ -0,0 +1,109 @@
+# tests/test_section_segmenter.py
+import threading
+
+import pytest
+
+from cv_extractor.extractors.section_segmenter import SectionSegmenter, merge_sections, slice_sections
+from cv_extractor.parsers.base_parser import BaseParser, normalize_heading
+
+CV_TEXT = """Jane Doe
+jane@example.com
+Summary
+Backend engineer with eight years of experience.
+WORK EXPERIENCE
+Software Engineer, Acme (2019 - 2024)
+Languages: Python, Go
+Education
+MSc Computer Science
+Languages
+Python, Go, French
+"""
+
+
+def labels(sections):
+    return [section.label for section in sections]
+
+
+def test_sections_cover_the_text_end_to_end():
+    sections = SectionSegmenter().segment(CV_TEXT)
+    assert labels(sections) == ["header", "summary", "experience", "education", "languages"]
+    assert sections[0].start == 0 and sections[-1].end == len(CV_TEXT)
+    assert all(a.end == b.start for a, b in zip(sections, sections[1:]))
+    assert CV_TEXT[sections[2].start:sections[2].end].startswith("WORK EXPERIENCE\n")
+
+
+def test_inline_label_is_not_a_heading():
+    sections = SectionSegmenter().segment(CV_TEXT)
+    experience = CV_TEXT[sections[2].start:sections[2].end]
+    assert "Languages: Python, Go" in experience
+
+
+def test_heading_hints_mark_unknown_headings():
+    text = "Jane Doe\nOpen Source Work\nMaintainer of cv-tools.\n"
+    assert labels(SectionSegmenter().segment(text)) == ["header"]
+    hints = {normalize_heading("Open Source Work")}
+    assert labels(SectionSegmenter(hints).segment(text)) == ["header", "other"]
+
+
+def test_hints_added_while_segmenting_are_seen():
+    hints = set()
+    segmenter = SectionSegmenter(hints)
+    hints.add("open source work")
+    assert labels(segmenter.segment("Open Source Work\nMaintainer.\n")) == ["other"]
+
+
+@pytest.mark.parametrize("line, label", [
+    ("EDUCATION FIRST", "other"),
+    ("SKILLS AND TOOLS", "skills"),
+    ("EXPERIENCE & LEADERSHIP", "experience"),
+    ("PROJECTS: 2020-2024", "projects"),
+])
+def test_all_caps_headings_keep_a_known_label_only_before_a_connector(line, label):
+    assert labels(SectionSegmenter().segment(f"Jane Doe\n{line}\nSome text.\n")) == ["header", label]
+
+
+class HintingParser(BaseParser):
+    """Yields (text, hint) pages, adding each hint just before its page."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.done = threading.Event()
+
+    def iter_pages(self, source, heading_hints=None):
+        for text, hint in self.pages:
+            if heading_hints is not None:
+                heading_hints.add(hint)
+            yield text
+        self.done.set()
+
+
+def test_streamed_pages_see_only_hints_up_to_their_own_page():
+    parser = HintingParser([("Page one\n", "one"), ("Page two\n", "two"), ("Page three\n", "three")])
+    hints, seen = set(), []
+    for _ in parser.stream_pages(None, heading_hints=hints):
+        # Let the decoding thread read the whole document before looking.
+        assert parser.done.wait(timeout=5)
+        seen.append(set(hints))
+    assert seen == [{"one"}, {"one", "two"}, {"one", "two", "three"}]
+
+
+def test_pages_segmented_separately_merge_back():
+    page_one, page_two = "Experience\nEngineer, Acme\n", "Built the billing system.\nSkills\nPython\n"
+    segmenter = SectionSegmenter()
+    first = segmenter.segment(page_one)
+    second = segmenter.segment(page_two, initial_label=first[-1].label, offset=len(page_one))
+    merged = merge_sections(first + second)
+    assert labels(merged) == ["experience", "skills"]
+    assert (merged[0].start, merged[0].end) == (0, len(page_one) + len("Built the billing system.\n"))
+
+
+def test_slice_sections_drops_irrelevant_sections_only():
+    sections = SectionSegmenter().segment(CV_TEXT)
+    sliced = slice_sections(CV_TEXT, sections)
+    assert "MSc Computer Science" not in sliced
+    assert "Python, Go, French" in sliced
+    assert sliced.startswith("Jane Doe\n")
+
+
+def test_normalize_heading():
+    assert normalize_heading("  ● Work   Experience: ") == "work experience"
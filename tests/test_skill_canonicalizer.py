@@ -0,0 +1,106 @@
+# tests/test_skill_canonicalizer.py
+import json
+
+import pytest
+
+from unification_service import skill_canonicalizer
+from unification_service.skill_canonicalizer import (
+    CANON_INDEX_FORMAT_VERSION, SkillCanonicalizer, build_canon_index, skill_key,
+)
+
+SKILL_DB = {
+    "KS1": {"skill_name": "JavaScript (Programming Language)",
+            "high_surfce_forms": {"full": "javascript", "abv": "js"}, "low_surface_forms": ["java script"]},
+    "KS2": {"skill_name": "Node.js", "high_surfce_forms": {"full": "node.js"}, "low_surface_forms": ["node"]},
+    "KS3": {"skill_name": "C++ (Programming Language)", "high_surfce_forms": {"full": "c++"}},
+    "KS4": {"skill_name": "C (Programming Language)", "high_surfce_forms": {"full": "c"}},
+    # A low-surface form never takes a form another skill already has.
+    "KS5": {"skill_name": "Java Scripting", "low_surface_forms": ["javascript"]},
+}
+ALIASES = {"Kubernetes": ["k8s", "kube"], "Node.js": ["nodejs"]}
+
+
+@pytest.fixture
+def canonicalizer():
+    return SkillCanonicalizer(build_canon_index(SKILL_DB, ALIASES))
+
+
+@pytest.mark.parametrize("name, canonical", [
+    ("js", "JavaScript"),
+    ("Java Script", "JavaScript"),
+    ("JAVASCRIPT", "JavaScript"),
+    ("node", "Node.js"),
+    ("NodeJS", "Node.js"),
+    ("node-js", "Node.js"),
+    ("k8s", "Kubernetes"),
+    ("c++", "C++"),
+    ("C", "C"),
+    ("  Some   Unknown  Skill ", "Some Unknown Skill"),
+])
+def test_canonical(canonicalizer, name, canonical):
+    assert canonicalizer.canonical(name) == canonical
+
+
+def test_skill_key_keeps_plus_and_hash():
+    assert skill_key("Node.js") == skill_key("node js") == "nodejs"
+    assert len({skill_key("C"), skill_key("C++"), skill_key("C#")}) == 3
+
+
+def test_aliases_alone_without_skill_db():
+    assert SkillCanonicalizer(build_canon_index(None, ALIASES)).canonical("kube") == "Kubernetes"
+
+
+@pytest.fixture
+def aliases_path(tmp_path):
+    path = tmp_path / "aliases.json"
+    path.write_text(json.dumps(ALIASES), encoding="utf-8")
+    return str(path)
+
+
+def offline_build(path, aliases_path):
+    with open(aliases_path, encoding="utf-8") as f:
+        aliases = json.load(f)
+    index = {"version": CANON_INDEX_FORMAT_VERSION, "aliases_digest": skill_canonicalizer._aliases_digest(aliases_path),
+             "forms": build_canon_index(SKILL_DB, aliases)}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(index, f)
+
+
+def test_load_builds_the_index_once(monkeypatch, tmp_path, aliases_path):
+    builds = []
+
+    def build(path, aliases_path):
+        builds.append(path)
+        offline_build(path, aliases_path)
+
+    monkeypatch.setattr(skill_canonicalizer, "build_skill_canon_index", build)
+    index_path = str(tmp_path / "index.json")
+    assert SkillCanonicalizer.load(index_path, aliases_path).canonical("js") == "JavaScript"
+    assert SkillCanonicalizer.load(index_path, aliases_path).canonical("js") == "JavaScript"
+    assert len(builds) == 1
+
+    # Editing the alias file invalidates the index.
+    with open(aliases_path, "w", encoding="utf-8") as f:
+        json.dump({**ALIASES, "PostgreSQL": ["postgres"]}, f)
+    assert SkillCanonicalizer.load(index_path, aliases_path).canonical("postgres") == "PostgreSQL"
+    assert len(builds) == 2
+
+
+def test_load_falls_back_to_aliases_when_skill_db_is_unavailable(monkeypatch, tmp_path, aliases_path):
+    def build(path, aliases_path):
+        raise OSError("offline")
+
+    monkeypatch.setattr(skill_canonicalizer, "build_skill_canon_index", build)
+    index_path = tmp_path / "index.json"
+    canonicalizer = SkillCanonicalizer.load(str(index_path), aliases_path)
+    assert canonicalizer.canonical("k8s") == "Kubernetes"
+    assert canonicalizer.canonical("js") == "js"
+    assert not index_path.exists()
+
+
+def test_bundled_alias_file_is_valid():
+    with open(skill_canonicalizer.SKILL_ALIASES_PATH, encoding="utf-8") as f:
+        aliases = json.load(f)
+    assert all(isinstance(forms, list) for forms in aliases.values())
+    canonicalizer = SkillCanonicalizer(build_canon_index(None, aliases))
+    assert all(canonicalizer.canonical(name) == name for name in aliases)
@@ -0,0 +1,98 @@
+# tests/test_streaming.py
+import asyncio
+import json
+from typing import List, Optional
+
+import pytest
+from pydantic import BaseModel
+
+from cv_extractor.llm.streaming import IncrementalJsonParser, stream_partial_objects
+
+DOCUMENT = json.dumps({
+    "summary": 'Says "hi" {not a brace} \\ done',
+    "years": 12,
+    "remote": True,
+    "manager": None,
+    "work_experience": [{"job_title": "Engineer", "company": "Acme", "tags": ["a", "b"]}, {"job_title": "Intern"}],
+    "projects": [],
+})
+
+
+def feed_in_pieces(parser, text, size):
+    events = []
+    for start in range(0, len(text), size):
+        events.extend(parser.feed(text[start:start + size]))
+    return events
+
+
+def test_values_are_reported_as_they_close():
+    events = IncrementalJsonParser().feed(DOCUMENT)
+    document = json.loads(DOCUMENT)
+    assert events == [
+        (("summary",), document["summary"]),
+        (("years",), 12),
+        (("remote",), True),
+        (("manager",), None),
+        (("work_experience", 0), document["work_experience"][0]),
+        (("work_experience", 1), document["work_experience"][1]),
+        (("work_experience",), document["work_experience"]),
+        (("projects",), []),
+    ]
+
+
+@pytest.mark.parametrize("size", [1, 2, 7, 64])
+def test_piece_boundaries_do_not_matter(size):
+    assert feed_in_pieces(IncrementalJsonParser(), DOCUMENT, size) == IncrementalJsonParser().feed(DOCUMENT)
+
+
+def test_nothing_is_reported_before_it_closes():
+    parser = IncrementalJsonParser()
+    assert parser.feed('{"summary": "Back') == []
+    assert parser.feed('end", "years": 1') == [(("summary",), "Backend")]
+    assert parser.feed("2}") == [(("years",), 12)]
+
+
+def test_max_depth_limits_the_reported_paths():
+    events = IncrementalJsonParser(max_depth=1).feed(DOCUMENT)
+    assert [path for path, _ in events] == [
+        ("summary",), ("years",), ("remote",), ("manager",), ("work_experience",), ("projects",)]
+
+
+def test_unbalanced_input_is_rejected():
+    with pytest.raises(ValueError):
+        IncrementalJsonParser().feed('{"a": 1}}')
+
+
+class Job(BaseModel):
+    job_title: str
+    company: Optional[str] = None
+
+
+class Response(BaseModel):
+    summary: Optional[str] = None
+    work_experience: List[Job] = []
+
+
+async def pieces_of(text, size=5):
+    for start in range(0, len(text), size):
+        yield text[start:start + size]
+
+
+def collect(text):
+    async def run():
+        return [event async for event in stream_partial_objects(pieces_of(text), Response)]
+    return asyncio.run(run())
+
+
+def test_partial_objects_are_validated_field_by_field():
+    text = json.dumps({"summary": "Hi.", "work_experience": [{"job_title": "Engineer"}, {"company": "No title"}],
+                       "unknown": 1})
+    events = collect(text)
+    assert events[:2] == [("summary", "Hi."), ("work_experience", Job(job_title="Engineer"))]
+    # The invalid job and the unknown field are skipped; the final pair is the whole response.
+    assert events[2:] == [(None, json.loads(text))]
+
+
+def test_malformed_completion_ends_with_an_empty_result():
+    assert collect('{"summary": "Hi."}}')[-1] == (None, {})
+    assert collect('{"summary": "Hi.", "work_exp')[-1] == (None, {})
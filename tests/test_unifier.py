@@ -0,0 +1,76 @@
+# tests/test_unifier.py
+import pytest
+
+from cv_extractor.models.cv_models import ExtractedCV, Skill, WorkExperience
+from linkedin_extractor.models import LinkedInPosition, LinkedInProfile, LinkedInSkill
+from unification_service.skill_canonicalizer import SkillCanonicalizer, build_canon_index
+from unification_service import source_store
+from unification_service.source_store import SourceStore
+from unification_service.unifier import ProfileUnifier
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SourceStore(str(tmp_path / "profiles.db"))
+
+
+@pytest.fixture
+def unifier(store):
+    return ProfileUnifier(store=store, canonicalizer=SkillCanonicalizer(build_canon_index(None, {})))
+
+
+def cv(*jobs, text="Jane Doe, software engineer."):
+    return ExtractedCV(full_text=text, skills=[Skill(name="python", evidence=[])],
+                       work_experience=[WorkExperience(job_title=title, company=company) for title, company in jobs])
+
+
+def linkedin(*positions):
+    return LinkedInProfile(
+        fullName="Jane Doe", skills=[LinkedInSkill(name="Python")], raw_data={"html": "<p>...</p>"},
+        positions=[LinkedInPosition(title=title, companyName=company) for title, company in positions])
+
+
+def test_add_source_merges_with_earlier_sources(unifier):
+    unifier.add_source("p1", cv(("Software Engineer", "Google")))
+    profile = unifier.add_source("p1", linkedin(("SWE", "Google LLC"), ("Intern", "Spotify")))
+    assert profile.full_name == "Jane Doe"
+    assert profile.skills == ["python"]
+    assert [(exp.job_title, exp.source) for exp in profile.work_experience] == [
+        ("SWE", "LinkedIn"), ("Intern", "LinkedIn")]
+    assert set(profile.source_data) == {"cv", "linkedin"}
+
+
+def test_raw_records_are_stored_once(unifier, store):
+    unifier.add_source("p1", cv(("Software Engineer", "Google")))
+    profile = unifier.add_source("p1", linkedin(("SWE", "Google LLC")))
+    assert "source_data" not in store.get_unified("p1")
+    assert profile.source_data["cv"]["full_text"] == "Jane Doe, software engineer."
+    assert profile.source_data["linkedin"]["raw_data"] == {"html": "<p>...</p>"}
+
+
+def test_replacing_a_source_drops_its_old_entries(unifier):
+    unifier.add_source("p1", cv(("Data Analyst", "Bank")))
+    unifier.add_source("p1", linkedin(("SWE", "Google")))
+    profile = unifier.add_source("p1", cv(("Software Engineer", "Google")))
+    assert [exp.company_name for exp in profile.work_experience] == ["Google"]
+
+
+def test_incremental_profile_matches_unify(unifier):
+    sources = [cv(("Software Engineer", "Google")), linkedin(("SWE", "Google LLC"), ("Intern", "Spotify"))]
+    for source in sources:
+        incremental = unifier.add_source("p1", source)
+    unified = unifier.unify("p1", *sources)
+    assert incremental.model_dump(exclude={"source_data"}) == unified.model_dump(exclude={"source_data"})
+
+
+def test_each_process_opens_its_own_store(monkeypatch, tmp_path):
+    monkeypatch.setattr(source_store, "_store", None)
+    monkeypatch.setattr(source_store.SourceStore.__init__, "__defaults__", (str(tmp_path / "profiles.db"),))
+    parent = source_store.get_source_store()
+    assert source_store.get_source_store() is parent
+
+    # As seen from a worker forked after the parent opened its store.
+    monkeypatch.setattr(source_store.os, "getpid", lambda: -1)
+    child = source_store.get_source_store()
+    assert child is not parent
+    assert source_store.get_source_store() is child
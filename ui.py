@@ -57,7 +57,12 @@ def api_create_profile():
 
 
 def api_add_source(profile_id, source_type, url=None, file=None):
-    endpoint = f"{FLASK_BACKEND_URL}/api/profiles/{profile_id}/add_source"
+    """
+    Adds a source through the streaming endpoint, rendering partial results
+    (extracted CV fields, then refined profile sections) as they arrive.
+    Returns (the final response body, None) or (None, an error message).
+    """
+    endpoint = f"{FLASK_BACKEND_URL}/api/profiles/{profile_id}/add_source/stream"
 
     data = {'source_type': source_type}
     files = None
@@ -69,20 +74,53 @@ def api_add_source(profile_id, source_type, url=None, file=None):
     else:
         return None, "Missing URL or File"
 
+    live = st.empty()
+    partial = {"extract": {}, "enhance": {}}
     with st.spinner(f"Processing {source_type}... This may take a moment."):
-        response = st.session_state.api_session.post(endpoint, data=data, files=files)
-
-    if response.status_code == 200:
-        return response.json(), None
-    else:
-        try:
-            error_message = response.json().get("error", "An unknown error occurred.")
-        except requests.exceptions.JSONDecodeError:
-            error_message = f"An unexpected server error occurred (Status: {response.status_code})."
-        return None, error_message
+        response = st.session_state.api_session.post(endpoint, data=data, files=files, stream=True)
+        if response.status_code != 200:
+            try:
+                error_message = response.json().get("error", "An unknown error occurred.")
+            except requests.exceptions.JSONDecodeError:
+                error_message = f"An unexpected server error occurred (Status: {response.status_code})."
+            return None, error_message
+
+        # One JSON event per line; see add_source_to_profile_stream in app.py.
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            if event["stage"] == "done":
+                live.empty()
+                return event, None
+            if event["stage"] == "error":
+                live.empty()
+                return None, event["error"]
+            fields = partial[event["stage"]]
+            if event["field"] == "summary":
+                fields["summary"] = event["value"]
+            else:
+                fields.setdefault(event["field"], []).append(event["value"])
+            render_partial_results(live, event["stage"], fields)
+
+    live.empty()
+    return None, "The server closed the connection before the profile was ready."
 
 
 # --- UI Rendering Functions ---
+def render_partial_results(placeholder, stage, fields):
+    """Shows the partial results of one stage ("extract" or "enhance") in `placeholder`."""
+    with placeholder.container():
+        st.caption("Extracting your CV..." if stage == "extract" else "Polishing your profile...")
+        if fields.get("summary"):
+            st.markdown(f"**Summary:** {fields['summary']}")
+        for job in fields.get("work_experience", []):
+            company = job.get("company") or job.get("company_name") or ""
+            st.markdown(f"- **{job.get('job_title', '')}** {('at ' + company) if company else ''}")
+        for project in fields.get("projects", []):
+            st.markdown(f"- Project: **{project.get('project_name', '')}**")
+
+
 def render_auth_page():
     st.title("Welcome to Profile Fusion ✨")
     st.markdown("Unify your professional identity from across the web.")
@@ -0,0 +1,174 @@
+# unification_service/dedup.py
+import re
+from typing import Callable, List, Sequence, TypeVar
+
+import numpy as np  # installed with spaCy
+
+from .models import UnifiedProject, UnifiedWorkExperience
+
+Entry = TypeVar("Entry", UnifiedWorkExperience, UnifiedProject)
+
+NGRAM_SIZE = 3
+
+# Token separators: anything but letters and digits of any script, "+" and "#" ("C", "C++" and "C#" differ).
+_SEPARATORS = re.compile(r"(?:[^\w+#]|_)+")
+_NUMBER = re.compile(r"\d+")
+_CAMEL_CASE = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+_ROMAN_NUMERAL = re.compile(r"(?:i{1,3}|iv|vi{0,3}|ix|x)")
+# Title tokens that set a role's level apart: "Senior Software Engineer" is not "Software Engineer".
+_SENIORITY = frozenset({
+    "apprentice", "associate", "chief", "distinguished", "head", "intern", "junior", "lead", "principal",
+    "senior", "staff", "trainee",
+})
+# Tokens that do not tell two employers apart: "Google LLC" is "Google".
+_COMPANY_SUFFIXES = frozenset({
+    "ag", "bv", "co", "company", "corp", "corporation", "gmbh", "inc", "incorporated", "limited",
+    "llc", "llp", "ltd", "plc", "pvt", "sa", "sarl", "sas", "srl", "the",
+})
+# Common job title abbreviations: "SWE" is "Software Engineer".
+_TITLE_ABBREVIATIONS = {
+    "swe": "software engineer", "sde": "software development engineer", "sre": "site reliability engineer",
+    "sr": "senior", "jr": "junior", "eng": "engineer", "engr": "engineer", "dev": "developer",
+    "mgr": "manager", "sw": "software", "ml": "machine learning", "qa": "quality assurance",
+}
+
+
+def _tokens(text: str) -> List[str]:
+    return _SEPARATORS.sub(" ", text.casefold()).split()
+
+
+def normalize_company(name: str) -> str:
+    return " ".join(token for token in _tokens(name) if token not in _COMPANY_SUFFIXES)
+
+
+def normalize_title(title: str) -> str:
+    return " ".join(_TITLE_ABBREVIATIONS.get(token, token) for token in _tokens(title))
+
+
+def normalize_project(name: str) -> str:
+    """Repository and project names: "cv-extractor", "CvExtractor" and "CV Extractor" are all "cv extractor"."""
+    return " ".join(_tokens(_CAMEL_CASE.sub(" ", name)))
+
+
+def ngram_vectors(texts: Sequence[str]) -> np.ndarray:
+    """
+    One unit-length row per text over the character n-grams of the batch
+    (plus the whole text, so equal texts always score 1), so a single
+    matrix product gives the cosine similarity of every pair.
+    """
+    vocabulary, rows, columns = {}, [], []
+    for row, text in enumerate(texts):
+        padded = f" {text} "
+        features = {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+        features.add("=" + text)
+        for feature in features:
+            rows.append(row)
+            columns.append(vocabulary.setdefault(feature, len(vocabulary)))
+    vectors = np.zeros((len(texts), len(vocabulary)), dtype=np.float32)
+    vectors[rows, columns] = 1.0
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def number_signature(text: str) -> tuple:
+    return tuple(_NUMBER.findall(text))
+
+
+def level_signature(title: str) -> tuple:
+    """The numbers, roman numerals and seniority words of a normalized job title."""
+    return tuple(token for token in title.split()
+                 if _NUMBER.search(token) or _ROMAN_NUMERAL.fullmatch(token) or token in _SENIORITY)
+
+
+def same_signature(texts: Sequence[str], new_count: int, signature: Callable[[str], tuple]) -> np.ndarray:
+    """
+    Whether each of the last `new_count` texts has the same signature as each
+    text, new_count x len(texts): "aoc-2021" and "aoc-2022", or "Engineer" and
+    "Engineer II", differ by a character or two only, but are not the same.
+    """
+    signatures = {}
+    ids = np.array([signatures.setdefault(signature(text), len(signatures)) for text in texts])
+    return ids[len(texts) - new_count:, None] == ids[None, :]
+
+
+class FuzzyDeduplicator:
+    """
+    Folds new work experience and project entries into a profile's already
+    de-duplicated lists. Every new entry is scored against all kept entries
+    and the new ones before it in one matrix product per field, and merged
+    into the most similar one that reaches the thresholds. Of two
+    duplicates, the entry from the source earlier in `source_priority`
+    survives (the later one on a tie) at the position of the first, and
+    keeps the other's description if it has none.
+    """
+
+    def __init__(self, company_threshold: float, title_threshold: float, project_threshold: float,
+                 source_priority: Sequence[str]):
+        self.company_threshold = company_threshold
+        self.title_threshold = title_threshold
+        self.project_threshold = project_threshold
+        self.source_priority = list(source_priority)
+
+    def work_experience(self, kept: List[UnifiedWorkExperience],
+                        new: List[UnifiedWorkExperience]) -> List[UnifiedWorkExperience]:
+        def scores(entries):
+            companies = self._similarity([normalize_company(exp.company_name) for exp in entries], len(new))
+            title_texts = [normalize_title(exp.job_title) for exp in entries]
+            titles = self._similarity(title_texts, len(new))
+            matches = ((companies >= self.company_threshold) & (titles >= self.title_threshold)
+                       & same_signature(title_texts, len(new), level_signature))
+            return np.where(matches, companies + titles, -1.0)
+
+        return self._fold(kept, new, scores)
+
+    def projects(self, kept: List[UnifiedProject], new: List[UnifiedProject]) -> List[UnifiedProject]:
+        def scores(entries):
+            name_texts = [normalize_project(proj.project_name) for proj in entries]
+            names = self._similarity(name_texts, len(new))
+            matches = (names >= self.project_threshold) & same_signature(name_texts, len(new), number_signature)
+            return np.where(matches, names, -1.0)
+
+        return self._fold(kept, new, scores)
+
+    @staticmethod
+    def _similarity(texts: List[str], new_count: int) -> np.ndarray:
+        """
+        Cosine similarity of each of the last `new_count` texts to every text:
+        new_count x len(texts). A text that normalized to nothing is similar
+        to no other, not even another empty one.
+        """
+        vectors = ngram_vectors(texts)
+        similarity = vectors[len(texts) - new_count:] @ vectors.T
+        empty = np.array([not text for text in texts])
+        similarity[:, empty] = 0.0
+        similarity[empty[len(texts) - new_count:]] = 0.0
+        return similarity
+
+    def _fold(self, kept: List[Entry], new: List[Entry], scores: Callable[[List[Entry]], np.ndarray]) -> List[Entry]:
+        if not new:
+            return list(kept)
+        result = list(kept)
+        # scores[i, j]: how well new entry i matches entry j of kept + new, or -1 if it is no duplicate.
+        matrix = scores(result + new)
+        # Position in `result` of each column that is still a candidate: kept entries, then new ones once added.
+        positions = np.full(matrix.shape[1], -1)
+        positions[:len(kept)] = np.arange(len(kept))
+        for i, entry in enumerate(new):
+            row = np.where(positions >= 0, matrix[i], -1.0)
+            best = int(np.argmax(row))
+            if row[best] >= 0:
+                result[positions[best]] = self._survivor(result[positions[best]], entry)
+            else:
+                positions[len(kept) + i] = len(result)
+                result.append(entry)
+        return result
+
+    def _survivor(self, first: Entry, second: Entry) -> Entry:
+        winner, loser = (first, second) if self._rank(first) < self._rank(second) else (second, first)
+        if winner.description or not loser.description:
+            return winner
+        return winner.model_copy(update={"description": loser.description})
+
+    def _rank(self, entry: Entry) -> int:
+        if entry.source in self.source_priority:
+            return self.source_priority.index(entry.source)
+        return len(self.source_priority)
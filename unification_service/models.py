@@ -14,6 +14,7 @@ class UnifiedWorkExperience(BaseModel):
     job_title: str
     company_name: str
     description: Optional[str] = None
+    source: Optional[str] = None  # e.g., "CV", "LinkedIn"
     # Add other fields like dates later if needed
 
 
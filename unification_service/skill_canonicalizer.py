@@ -0,0 +1,132 @@
+# unification_service/skill_canonicalizer.py
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+from cv_extractor.config import SKILL_ALIASES_PATH, SKILL_CANON_INDEX_PATH  # Re-use the existing config
+
+CANON_INDEX_FORMAT_VERSION = 1
+
+# Characters that never tell two skills apart: "java script", "node.js" and "Node-JS" share a key.
+# "+" and "#" do ("C", "C++", "C#"), so they are kept.
+_SEPARATORS = re.compile(r"[\s\-_.]+")
+# SKILL_DB names carry a qualifier, e.g. "Python (Programming Language)".
+_QUALIFIER = re.compile(r"\s*\([^)]*\)\s*$")
+
+
+def skill_key(name: str) -> str:
+    """The lookup key of a skill name: lowercase, without spaces, dashes, underscores or dots."""
+    return _SEPARATORS.sub("", name.lower())
+
+
+def _aliases_digest(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def build_canon_index(skill_db: Optional[dict], aliases: Dict[str, list]) -> Dict[str, str]:
+    """
+    Maps the key of every known surface form to its canonical name. SKILL_DB
+    contributes each skill's name, full and abbreviated forms first, then its
+    low-surface forms where they are not taken yet; the curated aliases
+    override both.
+    """
+    forms = {}
+    if skill_db:
+        for skill in skill_db.values():
+            canonical = _QUALIFIER.sub("", skill.get("skill_name", "")).strip()
+            if not canonical:
+                continue
+            high_forms = skill.get("high_surfce_forms", {})
+            for form in (skill["skill_name"], canonical, high_forms.get("full"), high_forms.get("abv")):
+                if form:
+                    forms.setdefault(skill_key(form), canonical)
+        for skill in skill_db.values():
+            canonical = _QUALIFIER.sub("", skill.get("skill_name", "")).strip()
+            for form in skill.get("low_surface_forms", []) if canonical else ():
+                forms.setdefault(skill_key(form), canonical)
+    for canonical, alias_list in aliases.items():
+        for form in (canonical, *alias_list):
+            forms[skill_key(form)] = canonical
+    forms.pop("", None)
+    return forms
+
+
+def build_skill_canon_index(path: str = SKILL_CANON_INDEX_PATH, aliases_path: str = SKILL_ALIASES_PATH):
+    """The build step: compiles SKILL_DB and the curated alias file into the JSON index at `path`."""
+    from skillNer.general_params import SKILL_DB
+    with open(aliases_path, encoding="utf-8") as f:
+        aliases = json.load(f)
+    index = {
+        "version": CANON_INDEX_FORMAT_VERSION,
+        "aliases_digest": _aliases_digest(aliases_path),
+        "forms": build_canon_index(SKILL_DB, aliases),
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temp_path, path)
+
+
+class SkillCanonicalizer:
+    """
+    Normalizes skill names with a precompiled index of surface forms, so
+    "js", "javascript" and "Java Script" all become "JavaScript" with one
+    dict lookup each, the same way for every profile and without an LLM.
+    Names the index does not know keep their spelling (whitespace collapsed).
+    """
+
+    def __init__(self, forms: Dict[str, str]):
+        self.forms = forms
+
+    @classmethod
+    def load(cls, path: str = SKILL_CANON_INDEX_PATH, aliases_path: str = SKILL_ALIASES_PATH) -> "SkillCanonicalizer":
+        """
+        Loads the index, building it first if it does not exist yet or was
+        built from another version of the alias file. If SKILL_DB cannot be
+        loaded, the alias file alone is used and nothing is written.
+        """
+        digest = _aliases_digest(aliases_path)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == CANON_INDEX_FORMAT_VERSION and index.get("aliases_digest") == digest:
+                return cls(index["forms"])
+        print("Building skill canonicalization index from SKILL_DB (first run only)...")
+        try:
+            build_skill_canon_index(path, aliases_path)
+        except Exception as e:
+            print(f"SKILL_DB unavailable, canonicalizing skills with the alias file only: {e}")
+            with open(aliases_path, encoding="utf-8") as f:
+                return cls(build_canon_index(None, json.load(f)))
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["forms"])
+
+    def canonical(self, name: str) -> str:
+        """The canonical spelling of a skill name."""
+        name = " ".join(name.split())
+        return self.forms.get(skill_key(name), name)
+
+
+_canonicalizer: Optional[SkillCanonicalizer] = None
+_canonicalizer_lock = threading.Lock()
+
+
+def get_skill_canonicalizer() -> SkillCanonicalizer:
+    """Returns the process-wide canonicalizer, loading the index on first use."""
+    global _canonicalizer
+    if _canonicalizer is None:
+        with _canonicalizer_lock:
+            if _canonicalizer is None:
+                _canonicalizer = SkillCanonicalizer.load()
+    return _canonicalizer
+
+
+if __name__ == "__main__":
+    # python -m unification_service.skill_canonicalizer
+    build_skill_canon_index()
+    print(f"Skill canonicalization index written to {SKILL_CANON_INDEX_PATH}")
@@ -0,0 +1,145 @@
+# unification_service/source_store.py
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from cv_extractor.config import PROFILE_STORE_PATH  # Re-use the existing config
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profile_sources (
+    profile_id TEXT NOT NULL,
+    source_type TEXT NOT NULL,
+    record TEXT NOT NULL,
+    added_at REAL NOT NULL,
+    PRIMARY KEY (profile_id, source_type)
+);
+CREATE TABLE IF NOT EXISTS unified_profiles (
+    profile_id TEXT PRIMARY KEY,
+    profile TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS enhanced_sections (
+    profile_id TEXT PRIMARY KEY,
+    sections TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+
+class SourceStore:
+    """
+    Keeps, per profile, the extracted record of each source ("cv",
+    "linkedin", "github"; a newer record of the same type replaces the
+    older one) and the unified profile built from them, without their raw
+    `source_data`, in a local SQLite file. Nothing has to be extracted again when another source is added.
+    It also keeps the sections of the last enhanced profile, so the
+    enhancer only refines what changed since.
+
+    The file is opened in WAL mode, so several worker processes can share it.
+    """
+
+    def __init__(self, path: str = PROFILE_STORE_PATH):
+        self.path = path
+        # Re-entrant, so reads and writes can run inside `transaction()`.
+        self._lock = threading.RLock()
+        self._in_transaction = False
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        """Runs the enclosed reads and writes atomically, holding off other writers until it ends."""
+        with self._lock:
+            if self._in_transaction:
+                # Nested: part of the enclosing transaction.
+                yield
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._in_transaction = True
+            try:
+                yield
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._in_transaction = False
+
+    def get_unified(self, profile_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT profile FROM unified_profiles WHERE profile_id = ?", (profile_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def source_types(self, profile_id: str) -> List[str]:
+        """The types of the sources stored for a profile, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source_type FROM profile_sources WHERE profile_id = ? ORDER BY added_at",
+                (profile_id,)).fetchall()
+        return [row[0] for row in rows]
+
+    def get_sources(self, profile_id: str) -> List[Tuple[str, dict]]:
+        """(source type, record) for every source stored for a profile, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT source_type, record FROM profile_sources WHERE profile_id = ? ORDER BY added_at",
+                (profile_id,)).fetchall()
+        return [(source_type, json.loads(record)) for source_type, record in rows]
+
+    def save(self, profile_id: str, source_type: str, record: dict, unified: dict):
+        """
+        Stores a source's record together with the unified profile that now
+        includes it. `unified` should leave out `source_data`: the records are
+        already stored here.
+        """
+        now = time.time()
+        with self.transaction():
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profile_sources VALUES (?, ?, ?, ?)",
+                (profile_id, source_type, json.dumps(record), now),
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO unified_profiles VALUES (?, ?, ?)",
+                (profile_id, json.dumps(unified), now),
+            )
+
+    def get_enhanced_sections(self, profile_id: str) -> Dict[str, object]:
+        """The enhanced sections of a profile's last enhancement, keyed by the hash of their input."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT sections FROM enhanced_sections WHERE profile_id = ?", (profile_id,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    def save_enhanced_sections(self, profile_id: str, sections: Dict[str, object]):
+        """Replaces a profile's enhanced sections, dropping those of entries no longer in the profile."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO enhanced_sections VALUES (?, ?, ?)",
+                (profile_id, json.dumps(sections), time.time()),
+            )
+
+
+_store: Optional[SourceStore] = None
+_store_pid: Optional[int] = None
+_store_lock = threading.Lock()
+
+
+def get_source_store() -> SourceStore:
+    """
+    Returns this process's source store, opened on first use. A SQLite
+    connection must not be used across fork(), so a worker forked from a
+    preloaded app opens its own instead of inheriting the parent's.
+    """
+    global _store, _store_pid
+    if _store is None or _store_pid != os.getpid():
+        with _store_lock:
+            if _store is None or _store_pid != os.getpid():
+                _store = SourceStore()
+                _store_pid = os.getpid()
+    return _store
@@ -1,9 +1,27 @@
 # unification_service/unifier.py
+from .dedup import FuzzyDeduplicator
 from .models import UnifiedProfile, UnifiedWorkExperience, UnifiedProject, UnifiedContactInfo
+from .skill_canonicalizer import SkillCanonicalizer, get_skill_canonicalizer, skill_key
+from .source_store import SourceStore, get_source_store
 from cv_extractor.models.cv_models import ExtractedCV
 from linkedin_extractor.models import LinkedInProfile
 from github_extractor.models import GitHubProfile
-from typing import Union, List
+from cv_extractor.config import (  # Re-use the existing config
+    UNIFY_COMPANY_THRESHOLD, UNIFY_PROJECT_THRESHOLD, UNIFY_SOURCE_PRIORITY, UNIFY_TITLE_THRESHOLD,
+)
+from typing import Optional, Union, List
+
+Source = Union[ExtractedCV, LinkedInProfile, GitHubProfile]
+
+# The key each source type is stored under, in `source_data` and in the SourceStore.
+SOURCE_MODELS = {"cv": ExtractedCV, "linkedin": LinkedInProfile, "github": GitHubProfile}
+
+
+def source_type_of(source: Source) -> str:
+    for source_type, model in SOURCE_MODELS.items():
+        if isinstance(source, model):
+            return source_type
+    raise TypeError(f"Unsupported source: {type(source).__name__}")
 
 
 class ProfileUnifier:
@@ -11,91 +29,150 @@ class ProfileUnifier:
     A service to merge data from various sources into a single, unified profile.
     """
 
-    def unify(self, profile_id: str,
-              *sources: List[Union[ExtractedCV, LinkedInProfile, GitHubProfile]]) -> UnifiedProfile:
+    def __init__(self, store: Optional[SourceStore] = None, canonicalizer: Optional[SkillCanonicalizer] = None,
+                 deduplicator: Optional[FuzzyDeduplicator] = None):
+        self.store = store
+        self.canonicalizer = canonicalizer
+        self.deduplicator = deduplicator or FuzzyDeduplicator(
+            UNIFY_COMPANY_THRESHOLD, UNIFY_TITLE_THRESHOLD, UNIFY_PROJECT_THRESHOLD, UNIFY_SOURCE_PRIORITY)
+
+    def unify(self, profile_id: str, *sources: List[Source]) -> UnifiedProfile:
         """
         Takes multiple data source objects and merges them into a UnifiedProfile.
         """
-        all_skills = set()
-        all_work_experience = []
-        all_projects = []
-        source_data = {}
+        unified_profile = UnifiedProfile(profile_id=profile_id, contact_info=UnifiedContactInfo())
+        for source in sources:
+            unified_profile = self.merge(unified_profile, source)
+        return unified_profile
+
+    def add_source(self, profile_id: str, source: Source) -> UnifiedProfile:
+        """
+        Stores `source` for the profile and returns the unified profile with
+        it merged in. Sources added earlier are read back from the store,
+        never extracted again.
+
+        A source of a new type is merged into the stored unified profile. A
+        source that replaces a stored one of the same type (e.g. a new CV)
+        rebuilds the profile from the stored records instead, since the old
+        record's entries cannot be picked out of the merged lists.
+
+        Each raw record is stored once: the stored unified profile leaves out
+        `source_data`, so merging into it only loads the merged fields, and
+        the returned profile's `source_data` is read back from the records.
+        """
+        store = self.store or get_source_store()
+        source_type = source_type_of(source)
+        with store.transaction():
+            stored = store.get_unified(profile_id)
+            if stored is not None and source_type not in store.source_types(profile_id):
+                unified_profile = self.merge(UnifiedProfile.model_validate(stored), source)
+            else:
+                earlier = [SOURCE_MODELS[stored_type].model_validate(record)
+                           for stored_type, record in store.get_sources(profile_id) if stored_type != source_type]
+                unified_profile = self.unify(profile_id, *earlier, source)
+            store.save(profile_id, source_type, source.model_dump(mode="json"),
+                       unified_profile.model_dump(mode="json", exclude={"source_data"}))
+            unified_profile.source_data = dict(store.get_sources(profile_id))
+        return unified_profile
+
+    def merge(self, profile: UnifiedProfile, source: Source) -> UnifiedProfile:
+        """
+        Merges one more source into a unified profile and returns the result;
+        `profile` itself is left unchanged. Only the new source's entries are
+        de-duplicated, against the profile's and each other; the profile's
+        skills are re-canonicalized, and its lists copied. Merging sources
+        one at a time gives the same profile as passing them all to `unify`
+        in that order.
+        """
+        source_type = source_type_of(source)
+        contact_info = profile.contact_info.model_dump()
+        source_data = dict(profile.source_data)
+        source_data[source_type] = source.model_dump()
+        canonicalizer = self.canonicalizer or get_skill_canonicalizer()
+        # Canonical skill name by lookup key; earlier names are re-canonicalized in case the index grew.
+        all_skills = {}
+
+        def add_skill(name):
+            canonical = canonicalizer.canonical(name)
+            all_skills.setdefault(skill_key(canonical), canonical)
+
+        for skill in profile.skills:
+            add_skill(skill)
+        # This source's entries; they are de-duplicated against the profile's below.
+        new_work_experience = []
+        new_projects = []
+
+        def add_work_experience(company_name, job_title, description, source):
+            new_work_experience.append(UnifiedWorkExperience(
+                company_name=company_name, job_title=job_title, description=description, source=source))
 
         # --- Prioritized fields ---
         # We prioritize sources for single-value fields (e.g., name from LinkedIn > CV)
-        full_name, summary, location = None, None, None
-        contact_info = {"email": None, "linkedin_url": None, "github_url": None, "website": None}
+        full_name, summary, location = profile.full_name, profile.summary, profile.location
 
-        for source in sources:
-            if isinstance(source, LinkedInProfile):
-                source_data['linkedin'] = source.model_dump()
-                full_name = source.fullName or full_name
-                summary = source.summary or summary
-                location = source.location or location
-                contact_info['linkedin_url'] = source.profileUrl
-
-                for skill in source.skills:
-                    if skill.name: all_skills.add(skill.name.lower())
-                for pos in source.positions:
-                    all_work_experience.append(
-                        {"company_name": pos.companyName, "job_title": pos.title, "description": pos.description})
-                for proj in source.projects:
-                    all_projects.append(
-                        {"project_name": proj.title, "description": proj.description, "source": "LinkedIn"})
-
-            elif isinstance(source, ExtractedCV):
-                source_data['cv'] = source.model_dump()
-                summary = summary or source.summary  # Use CV summary if LinkedIn's is missing
-                for skill in source.skills:
-                    all_skills.add(skill.name.lower())
-                for exp in source.work_experience:
-                    all_work_experience.append(
-                        {"company_name": exp.company, "job_title": exp.job_title, "description": exp.description})
-                for proj in source.projects:
-                    all_projects.append(
-                        {"project_name": proj.project_name, "description": proj.description, "source": "CV"})
-
-            elif isinstance(source, GitHubProfile):
-                source_data['github'] = source.model_dump()
-                full_name = full_name or source.name
-                # Prioritize the LLM-generated summary from the README
-                summary = summary or (source.parsed_readme.summary if source.parsed_readme else None) or source.bio
-                location = location or source.location
-                contact_info['github_url'] = f"https://github.com/{source.username}"
-                contact_info['website'] = source.website
-                contact_info['email'] = source.email
-                for repo in source.repos:
-                    all_projects.append(
-                        {"project_name": repo.repo_name, "description": repo.repo_description, "source": "GitHub"})
-                if source.parsed_readme:
-                    # Add skills from the README's tech stack
-                    for skill in source.parsed_readme.tech_stack:
-                        all_skills.add(skill.lower())
-                    # Add detailed projects from the README
-                    for project in source.parsed_readme.projects:
-                        all_projects.append({
-                            "project_name": project.project_name,
-                            "description": project.description,
-                            "source": "GitHub README"
-                        })
-
-
-
-        # --- De-duplication Logic (Simple version for PoC) ---
-        unique_work_experience = {(exp['company_name'], exp['job_title']): exp for exp in all_work_experience}.values()
+        if isinstance(source, LinkedInProfile):
+            full_name = source.fullName or full_name
+            summary = source.summary or summary
+            location = source.location or location
+            contact_info['linkedin_url'] = source.profileUrl
+
+            for skill in source.skills:
+                if skill.name: add_skill(skill.name)
+            for pos in source.positions:
+                add_work_experience(pos.companyName, pos.title, pos.description, "LinkedIn")
+            for proj in source.projects:
+                new_projects.append(
+                    UnifiedProject(project_name=proj.title, description=proj.description, source="LinkedIn"))
+
+        elif isinstance(source, ExtractedCV):
+            summary = summary or source.summary  # Use CV summary if LinkedIn's is missing
+            for skill in source.skills:
+                add_skill(skill.name)
+            for exp in source.work_experience:
+                add_work_experience(exp.company, exp.job_title, exp.description, "CV")
+            for proj in source.projects:
+                new_projects.append(
+                    UnifiedProject(project_name=proj.project_name, description=proj.description, source="CV"))
 
+        elif isinstance(source, GitHubProfile):
+            full_name = full_name or source.name
+            # Prioritize the LLM-generated summary from the README
+            summary = summary or (source.parsed_readme.summary if source.parsed_readme else None) or source.bio
+            location = location or source.location
+            contact_info['github_url'] = f"https://github.com/{source.username}"
+            contact_info['website'] = source.website
+            contact_info['email'] = source.email
+            for repo in source.repos:
+                new_projects.append(
+                    UnifiedProject(project_name=repo.repo_name, description=repo.repo_description, source="GitHub"))
+            if source.parsed_readme:
+                # Add skills from the README's tech stack
+                for skill in source.parsed_readme.tech_stack:
+                    add_skill(skill)
+                # Add detailed projects from the README
+                for project in source.parsed_readme.projects:
+                    new_projects.append(UnifiedProject(
+                        project_name=project.project_name,
+                        description=project.description,
+                        source="GitHub README"
+                    ))
 
+        # --- De-duplication Logic ---
+        # Near-duplicates ("Google LLC / SWE" and "Google / Software Engineer", a repo listed by
+        # both GitHub and its README) are merged; see FuzzyDeduplicator.
+        all_work_experience = self.deduplicator.work_experience(profile.work_experience, new_work_experience)
+        all_projects = self.deduplicator.projects(profile.projects, new_projects)
 
         # --- Assemble the UnifiedProfile ---
         unified_profile = UnifiedProfile(
-            profile_id=profile_id,
+            profile_id=profile.profile_id,
             full_name=full_name,
             summary=summary,
             location=location,
             contact_info=UnifiedContactInfo(**contact_info),
-            skills=sorted(list(all_skills)),
-            work_experience=[UnifiedWorkExperience(**exp) for exp in unique_work_experience],
-            projects=[UnifiedProject(**proj) for proj in all_projects],
+            skills=sorted(all_skills.values(), key=str.lower),
+            work_experience=all_work_experience,
+            projects=all_projects,
             source_data=source_data
         )
-        return unified_profile
\ No newline at end of file
+        return unified_profile